@@ -1,14 +1,15 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # Analyzer.py, created: 2020.11.10
-# last modified: 2021.01.18
+# last modified: 2021.03.22
 #
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Tuple, Union
 import matplotlib.pyplot as plt
-from jmetal.core.solution import BinarySolution
 from src.Indicator import Indicator
+from src.IndicatorCache import IndicatorCache
 from src.Config import Config
+from src.PackedSolution import PackedSolution
 from src.Result import Result
 
 
@@ -30,6 +31,22 @@ class Analyzer:
         # prepare store scores
         self.scores: Dict[Tuple[str, str], Dict[str, Any]] = {}
 
+    def indicator_cache(self, project: str,
+                        method: str) -> Union[IndicatorCache, None]:
+        """indicator_cache [summary] scores cache of a method front,
+        None if not configured
+
+        Args:
+            project (str): [description]
+            method (str): [description]
+
+        Returns:
+            Union[IndicatorCache, None]: [description] scores cache
+        """
+        if not Config().use_indicator_cache:
+            return None
+        return IndicatorCache(self.result.sf(project, method))
+
     @staticmethod
     def prefix_list(raw_list: List[str],
                     prefix: List[str]) -> List[str]:
@@ -63,7 +80,8 @@ class Analyzer:
             for m in ms:
                 method_front = self.result.method_fronts[(p, m)]
                 self.scores[(p, m)] = \
-                    Indicator.compute(indicators, method_front, true_front)
+                    Indicator.compute(indicators, method_front, true_front,
+                                      cache=self.indicator_cache(p, m))
         # end nest for
 
     @staticmethod
@@ -108,7 +126,8 @@ class Analyzer:
                 scores = \
                     Indicator.compute(indicators,
                                       self.result.method_fronts[key],
-                                      self.result.project_fronts[project])
+                                      self.result.project_fronts[project],
+                                      cache=self.indicator_cache(*key))
                 # method, time, solutions found, solutions on front, score1, ..
                 method_front = self.result.method_fronts[key].solution_list
                 method_line = [method] \
@@ -166,7 +185,8 @@ class Analyzer:
                     Indicator.compute(indicators,
                                       self.result.method_fronts[key],
                                       self.result.project_fronts[project],
-                                      reference_point)
+                                      reference_point,
+                                      self.indicator_cache(*key))
                 # method, solutions on front, time, score1, ..
                 method_front = self.result.method_fronts[key].solution_list
                 method_line = [str(len(method_front))] \
@@ -184,13 +204,13 @@ class Analyzer:
         return sheet
 
     @staticmethod
-    def get_objectives(solutions: List[BinarySolution]
+    def get_objectives(solutions: List[PackedSolution]
                        ) -> List[List[float]]:
         """get_objectives [summary] convert list of solutions
         to objectives lists
 
         Args:
-            solutions (List[BinarySolution]): [description]
+            solutions (List[PackedSolution]): [description]
 
         Returns:
             Tuple[List[float], List[float]]: [description] objectives lists
@@ -0,0 +1,231 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# Archive.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+from bisect import bisect_right
+from typing import List, Tuple, Any, Iterable, Union
+import numpy
+from jmetal.core.solution import Solution
+from jmetal.util.archive import Archive, NonDominatedSolutionsArchive
+
+
+class NonDominatedArchive(Archive):
+    # points checked together against the front, see non_dominated
+    block_size = 64
+
+    def __init__(self) -> None:
+        """__init__ [summary] non-dominated archive, all objectives are
+        minimized, the same as jmetal NonDominatedSolutionsArchive: a
+        solution equal to one in archive is not added, and solution_list
+        is in the order of adding. Two objectives are kept as a sorted
+        front, more objectives are checked with numpy
+        """
+        # objectives tuples in lexicographic order, and aligned members
+        self.keys: List[Tuple[Any, ...]] = []
+        self.solutions: List[Solution] = []
+        self.orders: List[int] = []
+        # adding counter
+        self.counter = 0
+        # objectives matrix of keys, except for 2 objectives
+        self.matrix: Union[numpy.ndarray, None] = None
+        # solutions in the order of adding, built lazily
+        self.ordered: Union[List[Solution], None] = None
+        Archive.__init__(self)
+
+    @property
+    def solution_list(self) -> List[Solution]:
+        """solution_list [summary] solutions in the order of adding
+
+        Returns:
+            List[Solution]: [description] non-dominated solutions
+        """
+        if self.ordered is None:
+            pairs = sorted(zip(self.orders, self.solutions),
+                           key=lambda pair: pair[0])
+            self.ordered = [solution for _, solution in pairs]
+        return self.ordered
+
+    @solution_list.setter
+    def solution_list(self, solutions: List[Solution]) -> None:
+        """solution_list [summary] reset archive with solutions
+
+        Args:
+            solutions (List[Solution]): [description] solutions
+        """
+        self.keys, self.solutions, self.orders = [], [], []
+        self.matrix = None
+        self.changed()
+        self.extend(solutions)
+
+    def size(self) -> int:
+        return len(self.keys)
+
+    def changed(self) -> None:
+        """changed [summary] drop lazily built members
+        """
+        self.ordered = None
+
+    def add(self, solution: Solution) -> bool:
+        """add [summary] add one solution
+
+        Args:
+            solution (Solution): [description] solution
+
+        Returns:
+            bool: [description] True if it's added
+        """
+        key = tuple(solution.objectives)
+        index = bisect_right(self.keys, key)
+        if len(key) == 2:
+            # the one before has less or equal first objective
+            if index > 0 and self.keys[index - 1][1] <= key[1]:
+                return False
+            # dominated ones are right after it, second objective
+            # is strictly decreasing in the front
+            end = index
+            while end < len(self.keys) and self.keys[end][1] >= key[1]:
+                end += 1
+        else:
+            if self.matrix is None:
+                self.matrix = numpy.zeros((0, len(key)))
+            point = numpy.array(key, dtype=float)
+            if (self.matrix <= point).all(axis=1).any():
+                return False
+            dominated = (self.matrix >= point).all(axis=1)
+            if dominated.any():
+                keep = numpy.flatnonzero(~dominated).tolist()
+                self.keys = [self.keys[i] for i in keep]
+                self.solutions = [self.solutions[i] for i in keep]
+                self.orders = [self.orders[i] for i in keep]
+                self.matrix = self.matrix[~dominated]
+                index = bisect_right(self.keys, key)
+            end = index
+            self.matrix = numpy.insert(self.matrix, index, point, axis=0)
+        # replace dominated ones
+        self.keys[index:end] = [key]
+        self.solutions[index:end] = [solution]
+        self.orders[index:end] = [self.counter]
+        self.counter += 1
+        self.changed()
+        return True
+
+    @staticmethod
+    def non_dominated(points: numpy.ndarray) -> numpy.ndarray:
+        """non_dominated [summary] find non-dominated points, for equal
+        points the first one is kept
+
+        Args:
+            points (numpy.ndarray): [description] points in rows
+
+        Returns:
+            numpy.ndarray: [description] indices of non-dominated points,
+            in ascending order
+        """
+        num, dimension = points.shape
+        if num == 0:
+            return numpy.zeros(0, dtype=int)
+        # lexicographic order, index for ties, only points before
+        # could dominate a point
+        sort_keys = [numpy.arange(num)] + \
+            [points[:, dim] for dim in range(dimension - 1, -1, -1)]
+        order = numpy.lexsort(sort_keys)
+        sorted_points = points[order]
+        if dimension == 1:
+            return numpy.sort(order[:1])
+        if dimension == 2:
+            # keep strictly less on second objective than all before
+            second = sorted_points[:, 1]
+            keep = numpy.ones(num, dtype=bool)
+            keep[1:] = second[1:] < numpy.minimum.accumulate(second)[:-1]
+            return numpy.sort(order[keep])
+        # drop equal points, then check blocks against the front so far,
+        # and points in a block against each other
+        distinct = numpy.flatnonzero(numpy.concatenate((
+            [True], (sorted_points[1:] != sorted_points[:-1]).any(axis=1))))
+        front = numpy.zeros((len(distinct), dimension))
+        front_num = 0
+        kept: List[int] = []
+        block_size = NonDominatedArchive.block_size
+        for start in range(0, len(distinct), block_size):
+            block = distinct[start:start + block_size]
+            block_points = sorted_points[block]
+            dominated = (front[None, :front_num] <=
+                         block_points[:, None]).all(axis=2).any(axis=1)
+            block_start = front_num
+            for index, point in zip(block[~dominated],
+                                    block_points[~dominated]):
+                block_front = front[block_start:front_num]
+                if (block_front <= point).all(axis=1).any():
+                    continue
+                front[front_num] = point
+                front_num += 1
+                kept.append(index)
+        return numpy.sort(order[kept])
+
+    def extend(self, solutions: Iterable[Solution]) -> None:
+        """extend [summary] add solutions in bulk, the same result as
+        adding them one by one
+
+        Args:
+            solutions (Iterable[Solution]): [description] solutions
+        """
+        solutions = list(solutions)
+        if not solutions:
+            return
+        keys = [tuple(solution.objectives) for solution in solutions]
+        all_keys = self.keys + keys
+        all_solutions = self.solutions + solutions
+        all_orders = self.orders + \
+            list(range(self.counter, self.counter + len(solutions)))
+        self.counter += len(solutions)
+        # earlier added ones win on equal points
+        order = numpy.argsort(all_orders, kind='stable')
+        points = numpy.array([all_keys[i] for i in order], dtype=float) \
+            .reshape(len(all_keys), len(keys[0]))
+        kept = order[NonDominatedArchive.non_dominated(points)]
+        members = sorted([(all_keys[i], all_orders[i], all_solutions[i])
+                          for i in kept], key=lambda member: member[:2])
+        self.keys = [member[0] for member in members]
+        self.orders = [member[1] for member in members]
+        self.solutions = [member[2] for member in members]
+        self.matrix = None
+        if len(keys[0]) != 2:
+            self.matrix = numpy.array(self.keys, dtype=float) \
+                .reshape(len(self.keys), len(keys[0]))
+        self.changed()
+
+    def objectives(self) -> numpy.ndarray:
+        """objectives [summary] objectives of solution_list in rows
+
+        Returns:
+            numpy.ndarray: [description] objectives matrix
+        """
+        return numpy.array([solution.objectives
+                            for solution in self.solution_list])
+
+    @staticmethod
+    def from_jmetal(archive: Archive) -> 'NonDominatedArchive':
+        """from_jmetal [summary] make an archive from a jmetal one
+
+        Args:
+            archive (Archive): [description] jmetal archive
+
+        Returns:
+            NonDominatedArchive: [description] archive
+        """
+        result = NonDominatedArchive()
+        result.extend(archive.solution_list)
+        return result
+
+    def to_jmetal(self) -> NonDominatedSolutionsArchive:
+        """to_jmetal [summary] make a jmetal archive with the same
+        solutions, in the same order
+
+        Returns:
+            NonDominatedSolutionsArchive: [description] jmetal archive
+        """
+        archive = NonDominatedSolutionsArchive()
+        archive.solution_list = list(self.solution_list)
+        return archive
@@ -1,11 +1,11 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # Config.py, created: 2020.10.31
-# last modified: 2021.03.13
+# last modified: 2021.03.22
 #
 
 from typing import Dict, List
-from os import path
+from os import path, listdir
 
 
 class Config:
@@ -34,6 +34,11 @@ class Config:
         make_index_string = 'make_{}_index'
         for name in self.keywords:
             getattr(self, make_index_string.format(name))()
+        # synthetic instances, see Generator
+        self.synthetic_path = path.join(self.dataset_path, 'synthetic/')
+        self.make_synthetic_index()
+        # urgency of xuan instances, used by triurgency and bincst form
+        self.urgency_path = path.join(self.dataset_path, 'xuan/urgency/')
 
         # model form
         self.modelling = \
@@ -41,11 +46,12 @@ class Config:
              'trisk', 'triurgency']
         # solving methods
         self.method = \
-            ['single', 'epsilon', 'imprec', 'cwmoip', 'normal',
-             'NSGAII', 'IBEA']
-        # moip methods
+            ['single', 'epsilon', 'imprec', 'cwmoip', 'normal', 'pepsilon',
+             'augmecon', 'dp', 'npnsgaii', 'npibea', 'NSGAII', 'IBEA']
+        # moip methods, npnsgaii and npibea are the in-process moea
         self.moip_method = \
-            ['single', 'epsilon', 'imprec', 'cwmoip', 'normal']
+            ['single', 'epsilon', 'imprec', 'cwmoip', 'normal', 'pepsilon',
+             'augmecon', 'dp', 'npnsgaii', 'npibea']
         # dump methods(for jar algorithm)
         self.dump_method = \
             ['NSGAII', 'IBEA']
@@ -54,6 +60,9 @@ class Config:
 
         # result root path
         self.result_root_path = './results/'
+        # format of moip solutions and variables files, 'txt' or 'npy',
+        # npy ones are smaller and faster to load, see Result
+        self.result_format = 'txt'
         # dump path
         self.dump_path = './dump/'
         # default task path
@@ -62,12 +71,45 @@ class Config:
         # java path
         # self.java_exe = 'C:\\Program Files\\Java\\jdk-11.0.8\\bin\\java.exe'
         self.java_exe = 'java'
+        # run jar algorithms in one long-lived worker, see JarSolver
+        self.jar_worker = True
+        # command of the worker, empty for java with Worker.jar
+        self.jar_worker_command: List[str] = []
 
         # cplex threads num, 0 for auto
         self.threads = 1
+        # processes for iterations of a moip task, each has its own seed
+        self.iteration_workers = 1
         # cplex working memory
         self.work_memory = 1024
 
+        # build compact (sparse matrix) form when modelling
+        self.compact_model = True
+
+        # modelled problem cache, keyed by dataset, modelling and option
+        self.cache_path = './cache/'
+        self.use_model_cache = True
+        # indicator scores cache next to .front, keyed by fronts content
+        self.use_indicator_cache = True
+
+        # presolve modelled problem before solving
+        self.presolve = True
+
+        # keep one cplex model across rhs updates in BinSolver
+        self.persistent_model = True
+
+        # warm start each cplex solving with a found solution
+        self.mip_start = True
+
+        # prune infeasible and repeated rhs in epsilon-constraint sweep
+        self.sweep_pruning = True
+
+        # objective ranges from payoff table, computed once per problem
+        self.payoff_table = True
+
+        # step epsilon rhs over attainable objective values only
+        self.value_lattice = True
+
         # seed path
         self.seeds_path = './datasets/seeds/'
 
@@ -114,6 +156,50 @@ class Config:
         self.dataset['Baan'] = \
             path.join(self.dataset_path, 'Baan/Baan_core.csv')
 
+    def make_synthetic_index(self) -> None:
+        """make_synthetic_index [summary] make synthetic datasets index,
+        instances are named with a keyword as prefix, xuan ones are
+        *.txt files, rp ones are folders and Baan ones are *.csv files
+        """
+        if not path.isdir(self.synthetic_path):
+            return
+        for file_name in sorted(listdir(self.synthetic_path)):
+            name = path.splitext(file_name)[0]
+            if name in self.dataset:
+                continue
+            if not any([name.startswith(k) for k in self.keywords]):
+                continue
+            self.dataset[name] = path.join(self.synthetic_path, file_name)
+
+    def is_synthetic(self, name: str) -> bool:
+        """is_synthetic [summary] check if an indexed instance is a
+        synthetic one
+
+        Args:
+            name (str): [description] instance name
+
+        Returns:
+            bool: [description] True if it's from synthetic path
+        """
+        if name not in self.dataset:
+            return False
+        synthetic_path = path.join(path.abspath(self.synthetic_path), '')
+        return path.abspath(self.dataset[name]).startswith(synthetic_path)
+
+    def urgency_file(self, name: str) -> str:
+        """urgency_file [summary] urgency file of a xuan instance,
+        synthetic ones are under urgency/ of synthetic path
+
+        Args:
+            name (str): [description] instance name
+
+        Returns:
+            str: [description] *.json urgency file
+        """
+        if self.is_synthetic(name):
+            return path.join(self.synthetic_path, 'urgency', name + '.json')
+        return path.join(self.urgency_path, name + '.json')
+
     def get_index_dict(self, keywords: List[str]) -> Dict[str, str]:
         """get_index_dict [summary] get given keywords dataset subset
 
@@ -1,23 +1,40 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # Controller.py, created: 2020.11.02
-# last modified: 2021.01.14
+# last modified: 2021.03.22
 #
 
+import os
+import sys
 import json
 import gc
-from time import clock
+import traceback
+import numpy
+from time import clock, perf_counter
 from copy import deepcopy
+import random
+from random import SystemRandom
+from multiprocessing import Pool, Process, cpu_count
+from multiprocessing.connection import wait
 from typing import Dict, Any, List, Union, Tuple, Set
 from os import makedirs
-from os.path import isdir, join, abspath
+from os.path import isdir, isfile, join, abspath, dirname
 from src.Config import Config
-from src.NRP import NextReleaseProblem
+from src.NRP import NextReleaseProblem, NRPProblem
+from src.ModelCache import ModelCache
+from src.NpyWriter import NpyWriter
+from src.Result import Result
 from src.Solver import Solver
+from src.Solvers.JarSolver import JarSolver, JarWorker
 
 # type
 Entry = Tuple[str, Dict[str, Any]]
 
+# the problem in each iteration worker, see Controller.run_moip_task
+iteration_problem: NRPProblem
+# tasks running at the same time, they share workers_budget
+task_workers = 1
+
 
 class Task:
     def __init__(self,
@@ -49,6 +66,9 @@ class Task:
 
 
 class Controller:
+    # rows written at once into .npy files
+    chunk = 4096
+
     def __init__(self) -> None:
         """__init__ [summary] define members
         """
@@ -304,12 +324,19 @@ class Controller:
 
     @staticmethod
     def dump_moip_solutions(file_name: str, parato_set: List[Any]) -> None:
-        """dump_moip_solutions [summary] dump moip solutions
+        """dump_moip_solutions [summary] dump moip solutions, into
+        a float64 matrix if file_name ends with .npy, as text otherwise
 
         Args:
             file_name (str): [description] file for dumpping
             parato_set (List[Any]): [description] the solutions
         """
+        if file_name.endswith('.npy'):
+            columns = len(parato_set[0]) if parato_set else 0
+            with NpyWriter(file_name, numpy.float64, columns) as writer:
+                for start in range(0, len(parato_set), Controller.chunk):
+                    writer.write(parato_set[start:start + Controller.chunk])
+            return
         with open(file_name, 'w+') as file_out:
             for solution in parato_set:
                 file_out.write(str(solution)+'\n')
@@ -317,12 +344,22 @@ class Controller:
 
     @staticmethod
     def dump_moip_variables(file_name: str, variables: List[Any]) -> None:
-        """dump_moip_variables [summary] dump moip variables
+        """dump_moip_variables [summary] dump moip variables, into
+        a matrix of packed bits if file_name ends with .npy, as text
+        otherwise
 
         Args:
             file_name (str): [description] file for dumpping
             variables (List[Any]): [description] the variables
         """
+        if file_name.endswith('.npy'):
+            columns = (len(variables[0]) + 7) // 8 if variables else 0
+            with NpyWriter(file_name, numpy.uint8, columns) as writer:
+                for start in range(0, len(variables), Controller.chunk):
+                    rows = numpy.array(
+                        variables[start:start + Controller.chunk], dtype=bool)
+                    writer.write(numpy.packbits(rows, axis=1))
+            return
         with open(file_name, 'w+') as file_out:
             for solution in variables:
                 var_list = []
@@ -352,17 +389,17 @@ class Controller:
         # check task folder
         task_root = join(config.result_root_path, task.root_folder)
         if not isdir(task_root):
-            makedirs(task_root, exist_ok=False)
+            makedirs(task_root, exist_ok=True)
         # check project folder
         project_name = Controller.project_name(task.problem, *task.modelling)
         project_folder = join(task_root, project_name)
         if not isdir(project_folder):
-            makedirs(project_folder, exist_ok=False)
+            makedirs(project_folder, exist_ok=True)
         # check method folder
         method_name = Controller.method_name(*task.method)
         method_folder = join(project_folder, method_name)
         if not isdir(method_folder):
-            makedirs(method_folder, exist_ok=False)
+            makedirs(method_folder, exist_ok=True)
         # check if need dump problem
         return task.method[0] in config.dump_method
 
@@ -371,20 +408,23 @@ class Controller:
         # check dump folder
         config = Config()
         if not isdir(config.dump_path):
-            makedirs(config.dump_path, exist_ok=False)
+            makedirs(config.dump_path, exist_ok=True)
         # prepare folders
         project_name = Controller.project_name(task.problem, *task.modelling)
         method_name = Controller.method_name(*task.method)
         method_folder = join(config.result_root_path, task.root_folder,
                              project_name, method_name)
-        # prepare problem
-        nrp_problem = NextReleaseProblem(task.problem)
-        nrp_problem.premodel(task.modelling[1])
-        # dump problem
-        problem_file = abspath(join(config.dump_path, project_name + '.json'))
+        # dump problem, into a file of this task, tasks on the same project
+        # may run at the same time
+        dump_name = '{}-{}-{}'.format(project_name, task.method[0],
+                                      os.getpid())
+        problem_file = abspath(join(config.dump_path, dump_name + '.json'))
         # xuan_binary dump for itself
         sub_option: Dict[str, Any] = {}
         if config.parse_dataset_keyword(task.problem) == 'xuan':
+            # prepare problem
+            nrp_problem = NextReleaseProblem(task.problem)
+            nrp_problem.premodel(task.modelling[1])
             # TODO: could be better
             NextReleaseProblem.dump_xuan(problem_file, task.problem,
                                          nrp_problem.nrp)
@@ -395,19 +435,35 @@ class Controller:
             elif task.modelling[0] == 'triurgency':
                 sub_option['xuan'] = -10.0
         else:
-            problem = nrp_problem.model(task.modelling[0], task.modelling[1])
+            # prepare problem, from model cache if possible
+            problem = ModelCache().fetch(task.problem, *task.modelling)
             NextReleaseProblem.dump_nrp(problem_file, problem)
         option = task.method[1]
         if 'iteration' not in option:
             option['iteration'] = 1
-        option['problem_name'] = project_name
+        option['problem_name'] = dump_name
         option['dump_path'] = abspath(config.dump_path)
         option['result_path'] = abspath(method_folder)
         option.update(sub_option)
         # employ a solver
         solver = Solver(task.method[0], option, problem_file)
-        solver.prepare()
-        solver.execute()
+        try:
+            solver.prepare()
+            solver.execute()
+        finally:
+            # dumped files are of this run only
+            for file_name in [problem_file,
+                              join(config.dump_path,
+                                   'config-' + dump_name + '.json')]:
+                if isfile(file_name):
+                    os.remove(file_name)
+        # results replied by the jar worker, see JarSolver
+        for itr, result in enumerate(solver.solver.results):
+            solutions = [tuple(row) for row in result['solutions']]
+            variables = [tuple(row) for row in result['variables']]
+            info = {'elapsed time': result['elapsed time']}
+            Controller.dump_iteration(method_folder, itr, solutions,
+                                      variables, info, 0)
 
     @staticmethod
     def run_moip_task(task: Task) -> None:
@@ -417,39 +473,127 @@ class Controller:
         method_name = Controller.method_name(*task.method)
         method_folder = join(config.result_root_path, task.root_folder,
                              project_name, method_name)
-        # prepare problem
-        nrp_problem = NextReleaseProblem(task.problem)
-        nrp_problem.premodel(task.modelling[1])
-        nrp = nrp_problem.model(*task.modelling)
+        # prepare problem, from model cache if possible
+        nrp = ModelCache().fetch(task.problem, *task.modelling)
         # get iteration num
         if 'iteration' in task.method[1]:
             iteration = task.method[1]['iteration']
         else:
             iteration = 1
-        # run iteration_num times
-        for itr in range(iteration):
-            # employ a solver
-            solver = Solver(*task.method, nrp)
-            # solve
-            start_time = clock()
-            solver.prepare()
-            solver.execute()
-            elapsed_time = clock() - start_time
-            solutions = solver.solutions()
-            # dump solutions
-            solutions_file = join(method_folder, 's_' + str(itr) + '.txt')
-            Controller.dump_moip_solutions(solutions_file, solutions)
-            # dump variables
-            variables = solver.variables()
-            variables_file = join(method_folder, 'v_' + str(itr) + '.txt')
-            Controller.dump_moip_variables(variables_file, variables)
-            # dump other info
-            info_file = join(method_folder, 'i_' + str(itr) + '.json')
-            info: Dict[str, Any] = {}
-            info['elapsed time'] = round(elapsed_time, 2)
-            info['solutions found'] = len(solutions)
-            Controller.dump_dict(info_file, info)
-        # end for
+        # seed of each iteration, from 'seed' in method option if given
+        base_seed = task.method[1].get('seed')
+        if base_seed is None:
+            base_seed = SystemRandom().randrange(1 << 31)
+        seeds = [(base_seed + itr) % (1 << 32) for itr in range(iteration)]
+        # iterations in worker processes, pepsilon has its own pool
+        workers = min(iteration,
+                      Controller.workers_budget(config.iteration_workers,
+                                                task_workers))
+        if workers <= 1 or task.method[0] == 'pepsilon':
+            for itr in range(iteration):
+                Controller.run_iteration(task, nrp, method_folder,
+                                         itr, seeds[itr])
+            # end for
+            return
+        with Pool(workers, initializer=Controller.init_iteration_worker,
+                  initargs=(nrp,)) as pool:
+            arguments = [(task, method_folder, itr, seeds[itr])
+                         for itr in range(iteration)]
+            for _ in pool.imap_unordered(Controller.iteration_worker,
+                                         arguments):
+                pass
+            pool.close()
+            pool.join()
+
+    @staticmethod
+    def init_iteration_worker(nrp: NRPProblem) -> None:
+        """init_iteration_worker [summary] keep the problem in worker,
+        so that it is sent once for all iterations
+
+        Args:
+            nrp (NRPProblem): [description] modelled problem
+        """
+        global iteration_problem
+        iteration_problem = nrp
+
+    @staticmethod
+    def iteration_worker(arguments: Tuple[Task, str, int, int]) -> None:
+        """iteration_worker [summary] run one iteration in worker,
+        see run_iteration
+
+        Args:
+            arguments (Tuple[Task, str, int, int]): [description] task,
+            method folder, iteration and seed
+        """
+        task, method_folder, itr, seed = arguments
+        Controller.run_iteration(task, iteration_problem, method_folder,
+                                 itr, seed)
+
+    @staticmethod
+    def run_iteration(task: Task, nrp: NRPProblem, method_folder: str,
+                      itr: int, seed: int) -> None:
+        """run_iteration [summary] solve once and dump s_, v_ and i_
+        files of this iteration
+
+        Args:
+            task (Task): [description] task
+            nrp (NRPProblem): [description] modelled problem
+            method_folder (str): [description] result folder
+            itr (int): [description] iteration
+            seed (int): [description] seed of random and numpy.random
+        """
+        config = Config()
+        random.seed(seed)
+        numpy.random.seed(seed)
+        # employ a solver
+        solver = Solver(*task.method, nrp)
+        # solve, in wall clock time for solvers with worker processes
+        timer = clock
+        if getattr(solver.solver, 'wall_clock', False):
+            timer = perf_counter
+        start_time = timer()
+        solver.prepare()
+        solver.execute()
+        elapsed_time = timer() - start_time
+        info: Dict[str, Any] = {}
+        info['elapsed time'] = round(elapsed_time, 2)
+        info['seed'] = seed
+        Controller.dump_iteration(method_folder, itr, solver.solutions(),
+                                  solver.variables(), info,
+                                  len(nrp.variables))
+
+    @staticmethod
+    def dump_iteration(method_folder: str, itr: int,
+                       solutions: List[Any], variables: List[Any],
+                       info: Dict[str, Any], variables_num: int) -> None:
+        """dump_iteration [summary] dump s_, v_ and i_ files of an
+        iteration
+
+        Args:
+            method_folder (str): [description] result folder
+            itr (int): [description] iteration
+            solutions (List[Any]): [description] objectives of solutions
+            variables (List[Any]): [description] variables of solutions
+            info (Dict[str, Any]): [description] other info
+            variables_num (int): [description] variables number
+        """
+        config = Config()
+        # dump solutions
+        extension = '.' + config.result_format
+        solutions_file = join(method_folder, 's_' + str(itr) + extension)
+        Controller.dump_moip_solutions(solutions_file, solutions)
+        # dump variables
+        variables_file = join(method_folder, 'v_' + str(itr) + extension)
+        Controller.dump_moip_variables(variables_file, variables)
+        # dump other info
+        info_file = join(method_folder, 'i_' + str(itr) + '.json')
+        info['solutions found'] = len(solutions)
+        if config.result_format == 'npy':
+            # needed to unpack variables, see Result.load_solutions
+            info['format version'] = Result.format_version
+            info['variables num'] = \
+                len(variables[0]) if variables else variables_num
+        Controller.dump_dict(info_file, info)
 
     @staticmethod
     def run_task(task: Task) -> None:
@@ -463,18 +607,158 @@ class Controller:
             Controller.run_moip_task(task)
 
     @staticmethod
-    def run(task_file: str) -> None:
-        """run [summary] run for a task file
+    def workers_budget(workers: int, shares: int = 1) -> int:
+        """workers_budget [summary] limit workers by cpu cores, each
+        worker runs cplex with Config.threads threads
+
+        Args:
+            workers (int): [description] workers required
+            shares (int): [description] the cores are shared by these
+            many pools, e.g. iteration workers of each running task
+
+        Returns:
+            int: [description] workers to run
+        """
+        threads = Config().threads
+        if threads <= 0:
+            # cplex takes all cores
+            threads = cpu_count()
+        return max(1, min(workers, cpu_count() // threads // shares))
+
+    @staticmethod
+    def log_file(task: Task, index: int) -> str:
+        """log_file [summary] log file of a task, under .logs of the
+        task root folder, which is ignored by Result
+
+        Args:
+            task (Task): [description] task
+            index (int): [description] index in task list
+
+        Returns:
+            str: [description] log file name
+        """
+        config = Config()
+        project_name = Controller.project_name(task.problem, *task.modelling)
+        method_name = Controller.method_name(*task.method)
+        return join(config.result_root_path, task.root_folder, '.logs',
+                    '{}-{}-{}.log'.format(index, project_name, method_name))
+
+    @staticmethod
+    def run_logged(task: Task, log_file: str) -> None:
+        """run_logged [summary] run a task in a worker process, with
+        stdout and stderr (of cplex and java as well) written into
+        log file, exit with 1 if it fails
+
+        Args:
+            task (Task): [description] task
+            log_file (str): [description] log file
+        """
+        makedirs(dirname(log_file), exist_ok=True)
+        with open(log_file, 'w') as log:
+            # redirect on file descriptors, for child processes
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(log.fileno(), 1)
+            os.dup2(log.fileno(), 2)
+            print(task, flush=True)
+            try:
+                try:
+                    Controller.run_task(task)
+                finally:
+                    # jar workers started by this process stop with the
+                    # task, os._exit and exiting Process skip atexit
+                    # handlers, a lent one is left for the batch
+                    JarWorker.shutdown()
+            except Exception:
+                traceback.print_exc()
+                sys.stderr.flush()
+                os._exit(1)
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+    @staticmethod
+    def run(task_file: str, workers: int = 1) -> List[Task]:
+        """run [summary] run for a task file, tasks are independent,
+        with workers > 1, each task runs in its own process, logged into
+        its log file, see log_file. A failed task does not stop others
 
         Args:
             task_file (str): [description] task file
+            workers (int): [description] tasks run at the same time,
+            limited by workers_budget
+
+        Returns:
+            List[Task]: [description] failed tasks, with workers > 1
         """
         # load config
         config = Config()
         file_name = join(config.task_path, task_file)
         task_list = Controller.parse_tasks(Controller.load_json(file_name))
-        for task in task_list:
-            gc.collect()
-            print(task)
-            Controller.run_task(task)
-        # end for
+        workers = Controller.workers_budget(workers)
+        # iteration workers of each task take a share of the budget
+        global task_workers
+        task_workers = max(1, min(workers, len(task_list)))
+        if workers <= 1:
+            try:
+                for task in task_list:
+                    gc.collect()
+                    print(task)
+                    Controller.run_task(task)
+                # end for
+            finally:
+                # jar worker is reused by tasks, stop it with the batch
+                JarWorker.shutdown()
+            return []
+        # one shared jar worker for each running jar task, see JarWorker
+        jar_tasks = [task for task in task_list
+                     if task.method[0] in config.dump_method]
+        command = JarSolver.worker_command() if jar_tasks else []
+        idle: List[JarWorker] = []
+        if command:
+            idle = JarWorker.pool(command, min(workers, len(jar_tasks)))
+        pool = list(idle)
+        lent: Dict[int, JarWorker] = {}
+        # index of tasks not started, and running processes
+        pending = list(range(len(task_list)))
+        pending.reverse()
+        running: Dict[int, Process] = {}
+        failed: List[Task] = []
+        try:
+            while pending or running:
+                # start tasks until workers are busy
+                while pending and len(running) < workers:
+                    index = pending.pop()
+                    task = task_list[index]
+                    worker = None
+                    if idle and task.method[0] in config.dump_method:
+                        worker = idle.pop()
+                        lent[index] = worker
+                    JarWorker.lend(worker)
+                    process = Process(
+                        target=Controller.run_logged,
+                        args=(task, Controller.log_file(task, index)))
+                    process.start()
+                    running[index] = process
+                JarWorker.lend(None)
+                # wait for any task to finish
+                wait([process.sentinel for process in running.values()])
+                for index, process in list(running.items()):
+                    if process.is_alive():
+                        continue
+                    process.join()
+                    del running[index]
+                    if index in lent:
+                        idle.append(lent.pop(index))
+                    task = task_list[index]
+                    if process.exitcode == 0:
+                        print('done', index, task.problem, task.method[0])
+                    else:
+                        failed.append(task)
+                        print('failed', index, task.problem, task.method[0],
+                              'see', Controller.log_file(task, index))
+            # end while
+        finally:
+            for worker in pool:
+                worker.close()
+            task_workers = 1
+        return failed
@@ -0,0 +1,279 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# Generator.py, created: 2021.03.17
+# last modified: 2021.03.22
+#
+
+import os
+import json
+from random import Random
+from os.path import join
+from typing import List, Tuple
+from src.Config import Config
+
+
+class Generator:
+    def __init__(self, seed: int = None,
+                 path: str = None, urgency_path: str = None) -> None:
+        """__init__ [summary] Generator makes synthetic instances in xuan,
+        rp (MSWord/ReleasePlanner) and Baan formats, so that they could
+        be loaded by Loader and indexed by Config
+
+        Args:
+            seed (int): [description] random seed
+            path (str): [description] output folder, config by default
+            urgency_path (str): [description] xuan urgency folder,
+            urgency/ under output folder by default
+        """
+        self.random = Random(seed)
+        if path is None:
+            path = Config().synthetic_path
+        self.path = path
+        # see Config.urgency_file
+        if urgency_path is None:
+            urgency_path = join(path, 'urgency/')
+        self.urgency_path = urgency_path
+
+    @staticmethod
+    def check_name(name: str, dataset: str) -> None:
+        """check_name [summary] synthetic names should start with
+        a keyword of the dataset, see Config.make_synthetic_index,
+        synthetic instances could be regenerated but others not
+
+        Args:
+            name (str): [description] instance name
+            dataset (str): [description] dataset name
+        """
+        config = Config()
+        keywords = [k for k, v in config.keywords.items() if v == dataset]
+        if not any([name.startswith(k) for k in keywords]):
+            raise ValueError('{} instance name {} should start with one of {}'
+                             .format(dataset, name, keywords))
+        if name in config.dataset and not config.is_synthetic(name):
+            raise ValueError('{} is not a synthetic instance, '
+                             'it could not be overwritten'.format(name))
+
+    def levels(self, requirements_num: int, depth: int) -> List[List[int]]:
+        """levels [summary] split requirements 0 .. n-1 into levels,
+        every level has at least one requirement
+
+        Args:
+            requirements_num (int): [description] number of requirements
+            depth (int): [description] number of levels
+
+        Returns:
+            List[List[int]]: [description] requirements in each level
+        """
+        assert 1 <= depth <= requirements_num
+        cuts = sorted(self.random.sample(range(1, requirements_num),
+                                         depth - 1))
+        bounds = [0] + cuts + [requirements_num]
+        return [list(range(bounds[i], bounds[i + 1])) for i in range(depth)]
+
+    def dependencies(self, levels: List[List[int]],
+                     density: float) -> List[Tuple[int, int]]:
+        """dependencies [summary] make dependencies from lower levels to
+        higher levels, so that they are always a DAG
+
+        Args:
+            levels (List[List[int]]): [description] requirements in levels
+            density (float): [description] average precursors of
+            requirements out of the first level
+
+        Returns:
+            List[Tuple[int, int]]: [description] (x_i, x_j), x_i precedes x_j
+        """
+        dependencies: List[Tuple[int, int]] = []
+        lower: List[int] = []
+        for level in levels:
+            for req in level:
+                if not lower:
+                    break
+                num = int(density)
+                if self.random.random() < density - num:
+                    num += 1
+                for pre in self.random.sample(lower, min(num, len(lower))):
+                    dependencies.append((pre, req))
+            lower += level
+        return dependencies
+
+    def xuan(self, name: str,
+             requirements_num: int,
+             customers_num: int,
+             depth: int = None,
+             density: float = None,
+             max_requests: int = 5,
+             max_cost: int = 10,
+             max_profit: int = 50) -> str:
+        """xuan [summary] generate a xuan (classic/realistic) instance,
+        and its urgency values used by triurgency and bincst form.
+        Realistic ones should have no dependencies (depth 1 or density 0),
+        by default depth is 3 and density is 0.5 for classic ones and
+        depth is 1 and density is 0 for realistic ones
+
+        Args:
+            name (str): [description] instance name, start with keyword
+            requirements_num (int): [description] number of requirements
+            customers_num (int): [description] number of customers
+            depth (int): [description] levels of requirements
+            density (float): [description] average precursors
+            max_requests (int): [description] max requests of customers
+            max_cost (int): [description] max cost of requirements
+            max_profit (int): [description] max profit of customers
+
+        Returns:
+            str: [description] file name
+        """
+        self.check_name(name, 'xuan')
+        classic = name.startswith('classic')
+        if depth is None:
+            depth = 3 if classic else 1
+        if density is None:
+            density = 0.5 if classic else 0.0
+        if not classic and depth > 1 and density > 0:
+            raise ValueError('realistic instance {} should have no '
+                             'dependencies, pass depth=1 or density=0'
+                             .format(name))
+        levels = self.levels(requirements_num, depth)
+        dependencies = self.dependencies(levels, density)
+        lines: List[str] = [str(len(levels))]
+        # costs of each level, requirements are encoded from 1
+        for level in levels:
+            lines.append(str(len(level)))
+            lines.append(' '.join([str(self.random.randint(1, max_cost))
+                                   for _ in level]))
+        # dependencies
+        lines.append(str(len(dependencies)))
+        for pre, post in dependencies:
+            lines.append('{} {}'.format(pre + 1, post + 1))
+        # customers, profit, requests num and requests
+        lines.append(str(customers_num))
+        for _ in range(customers_num):
+            requests_num = \
+                self.random.randint(1, min(max_requests, requirements_num))
+            requests = self.random.sample(range(1, requirements_num + 1),
+                                          requests_num)
+            lines.append(' '.join([str(self.random.randint(1, max_profit)),
+                                   str(requests_num)]
+                                  + [str(x) for x in requests]))
+        # dump instance
+        os.makedirs(self.path, exist_ok=True)
+        file_name = join(self.path, name + '.txt')
+        with open(file_name, 'w') as fout:
+            fout.write('\n'.join(lines) + '\n')
+            fout.close()
+        # dump urgency
+        os.makedirs(self.urgency_path, exist_ok=True)
+        urgency = [self.random.randint(1, 9) for _ in range(requirements_num)]
+        with open(join(self.urgency_path, name + '.json'), 'w') as fout:
+            json.dump(urgency, fout)
+            fout.close()
+        return file_name
+
+    def rp(self, name: str,
+           requirements_num: int,
+           stakeholders_num: int,
+           depth: int = 3,
+           density: float = 0.5,
+           couplings_num: int = 0,
+           max_cost: int = 100) -> str:
+        """rp [summary] generate a MSWord/ReleasePlanner format instance,
+        a folder with requirements, stakeholders, value and urgency csv
+
+        Args:
+            name (str): [description] instance name, start with keyword
+            requirements_num (int): [description] number of requirements
+            stakeholders_num (int): [description] number of stakeholders
+            depth (int): [description] levels of requirements
+            density (float): [description] average precursors
+            couplings_num (int): [description] number of couplings
+            max_cost (int): [description] max cost of requirements
+
+        Returns:
+            str: [description] folder name
+        """
+        self.check_name(name, 'rp')
+        levels = self.levels(requirements_num, depth)
+        dependencies = self.dependencies(levels, density)
+        # couplings are disjoint pairs inside a level, keep dependencies DAG
+        couplings: List[Tuple[int, int]] = []
+        for level in self.random.sample(levels, len(levels)):
+            pool = self.random.sample(level, len(level))
+            while len(pool) > 1 and len(couplings) < couplings_num:
+                couplings.append((pool.pop(), pool.pop()))
+        assert len(couplings) == couplings_num
+        coupled: List[List[str]] = [[] for _ in range(requirements_num)]
+        for left, right in couplings:
+            coupled[left].append('R-{}'.format(right))
+        precedes: List[List[str]] = [[] for _ in range(requirements_num)]
+        for pre, post in dependencies:
+            precedes[pre].append('R-{}'.format(post))
+        folder = join(self.path, name)
+        os.makedirs(folder, exist_ok=True)
+        # requirements: name|cost|couplings|precedes
+        with open(join(folder, 'requirements.csv'), 'w') as fout:
+            for req in range(requirements_num):
+                fout.write('R-{}|{}|{}|{}\n'.format(
+                    req, self.random.randint(1, max_cost),
+                    ','.join(coupled[req]), ','.join(precedes[req])))
+            fout.close()
+        # stakeholders: weight
+        with open(join(folder, 'stakeholders.csv'), 'w') as fout:
+            for _ in range(stakeholders_num):
+                fout.write('{}\n'.format(self.random.randint(1, 9)))
+            fout.close()
+        # value and urgency: name|value of each stakeholder
+        for file_name in ['value.csv', 'urgency.csv']:
+            with open(join(folder, file_name), 'w') as fout:
+                for req in range(requirements_num):
+                    values = [str(self.random.randint(1, 9))
+                              for _ in range(stakeholders_num)]
+                    fout.write('|'.join(['R-{}'.format(req)] + values) + '\n')
+                fout.close()
+        return folder
+
+    def baan(self, name: str,
+             requirements_num: int,
+             teams_num: int,
+             max_teams: int = 3,
+             max_workload: int = 20,
+             max_profit: int = 50,
+             capacity: float = 0.3) -> str:
+        """baan [summary] generate a Baan format instance,
+        each row is team workloads, cost, profit and urgency,
+        the last row is team capacities
+
+        Args:
+            name (str): [description] instance name, start with keyword
+            requirements_num (int): [description] number of requirements
+            teams_num (int): [description] number of teams
+            max_teams (int): [description] max teams of a requirement
+            max_workload (int): [description] max workload of a team
+            max_profit (int): [description] max profit of requirements
+            capacity (float): [description] capacity / workload of teams
+
+        Returns:
+            str: [description] file name
+        """
+        self.check_name(name, 'baan')
+        rows: List[List[int]] = []
+        workload = [0] * teams_num
+        for _ in range(requirements_num):
+            row = [0] * teams_num
+            teams_in = self.random.randint(1, min(max_teams, teams_num))
+            for team in self.random.sample(range(teams_num), teams_in):
+                row[team] = self.random.randint(1, max_workload)
+                workload[team] += row[team]
+            rows.append(row + [sum(row),
+                               self.random.randint(1, max_profit),
+                               self.random.randint(1, 9)])
+        # capacities should be positive, see Loader.load_Baan
+        team = [max(1, int(w * capacity)) for w in workload]
+        rows.append(team + [0, 0, 0])
+        os.makedirs(self.path, exist_ok=True)
+        file_name = join(self.path, name + '.csv')
+        with open(file_name, 'w') as fout:
+            for row in rows:
+                fout.write(','.join([str(x) for x in row]) + '\n')
+            fout.close()
+        return file_name
@@ -1,18 +1,18 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # Indicator.py, created: 2020.11.10
-# last modified: 2021.01.19
+# last modified: 2021.03.22
 #
 
 from typing import Dict, List, Any
 import numpy
-from jmetal.core.solution import BinarySolution
 from jmetal.util.archive import NonDominatedSolutionsArchive
-from jmetal.core.quality_indicator import InvertedGenerationalDistance, \
-                                          HyperVolume
 from pygmo import hypervolume
-from src.util.evenness_indicator import EvennessIndicator
+from src.IndicatorCache import IndicatorCache
+from src.PackedSolution import PackedSolution
 from src.util.ComprehensivenessIndicator import MeanIndicator, MedianIndicator
+from src.util.HypervolumeIndicator import HypervolumeIndicator
+from src.util.NeighbourIndicator import NeighbourEvenness, NeighbourIGD
 
 
 class Indicator:
@@ -20,11 +20,11 @@ class Indicator:
         print('Indicator should not be instanced.')
 
     @staticmethod
-    def numpy_array(solutions: List[BinarySolution]) -> numpy.array:
-        """numpy_array [summary] convert BinarySolutions into numpy.array
+    def numpy_array(solutions: List[PackedSolution]) -> numpy.array:
+        """numpy_array [summary] convert PackedSolutions into numpy.array
 
         Args:
-            solutions (List[BinarySolution]): [description]
+            solutions (List[PackedSolution]): [description]
 
         Returns:
             numpy.array: [description]
@@ -33,30 +33,25 @@ class Indicator:
                             for i in range(len(solutions))])
 
     @staticmethod
-    def find_reference_point(solutions: List[BinarySolution]) -> List[float]:
+    def find_reference_point(solutions: List[PackedSolution]) -> List[float]:
         """find_reference_point [summary] find the reference point
 
         Args:
-            solutions (List[BinarySolution]): [description]
+            solutions (List[PackedSolution]): [description]
 
         Returns:
             List[float]: [description] reference point
         """
-        # get solution widths
-        width = len(solutions[0].objectives)
-        # prepare result list
-        reference_point = []
-        for ite in range(width):
-            reference_point.append(max([solutions[i].objectives[ite]
-                                   for i in range(len(solutions))]) + 1.0)
-        # return it
-        return reference_point
+        # the worst on each objective, plus 1
+        objectives = Indicator.numpy_array(solutions)
+        return (objectives.max(axis=0) + 1.0).tolist()
 
     @staticmethod
     def compute(indicators: List[str],
                 solution_archive: NonDominatedSolutionsArchive,
                 true_front: NonDominatedSolutionsArchive = None,
-                reference_point: List[Any] = None
+                reference_point: List[Any] = None,
+                cache: IndicatorCache = None
                 ) -> Dict[str, Any]:
         """compute [summary] compute a indicator score for all in
         result dict
@@ -67,14 +62,38 @@ class Indicator:
             true_front (NonDominatedSolutionsArchive): [description]
             the whole pareto front
             reference_point (List[Any]): [description] specific reference point
+            cache (IndicatorCache): [description] scores cache of this front,
+            only missing scores are computed
         """
+        # objectives and reference point, once for all indicators
+        solutions = Indicator.numpy_array(solution_archive.solution_list)
+        if reference_point:
+            print('use reference point: ' + str(reference_point))
+        elif true_front is not None and true_front.solution_list:
+            reference_point = \
+                Indicator.find_reference_point(true_front.solution_list)
+        key = ''
+        if cache is not None:
+            # no true front hashes as an empty one
+            pareto_array = numpy.zeros((0, 0))
+            if true_front is not None:
+                pareto_array = Indicator.numpy_array(true_front.solution_list)
+            key = IndicatorCache.key(solutions, pareto_array, reference_point)
         scores: Dict[str, Any] = {}
         for indicator in indicators:
-            solutions = Indicator.numpy_array(solution_archive.solution_list)
+            if cache is not None:
+                score = cache.get(key, indicator)
+                if score is not None:
+                    scores[indicator] = score
+                    continue
             scores[indicator] = \
                 getattr(Indicator, 'compute_{}'.format(indicator))(
                     solutions, true_front, reference_point
                 )
+            if cache is not None:
+                cache.put(key, indicator, scores[indicator])
+        if cache is not None:
+            cache.save()
         return scores
 
     def compute_igd(solutions: numpy.array,
@@ -83,7 +102,7 @@ class Indicator:
         if len(solutions) < 1:
             return -1.0
         pareto_array = Indicator.numpy_array(true_front.solution_list)
-        return InvertedGenerationalDistance(pareto_array).compute(solutions)
+        return NeighbourIGD(pareto_array).compute(solutions)
 
     def compute_hv(solutions: numpy.array,
                    true_front: NonDominatedSolutionsArchive,
@@ -91,10 +110,9 @@ class Indicator:
         if not reference_point:
             reference_point = \
                 Indicator.find_reference_point(true_front.solution_list)
-        else:
-            print('use reference point: ' + str(reference_point))
         # mod = numpy.prod(reference_point)
-        return HyperVolume(reference_point).compute(solutions)
+        # sweep for up to 3 objectives, jmetal HyperVolume for more
+        return HypervolumeIndicator(reference_point).compute(solutions)
 
     def compute_pghv(solutions: numpy.array,
                      true_front: NonDominatedSolutionsArchive,
@@ -102,16 +120,12 @@ class Indicator:
         if not reference_point:
             reference_point = \
                 Indicator.find_reference_point(true_front.solution_list)
-        else:
-            print('use reference point: ' + str(reference_point))
         return hypervolume(solutions).compute(reference_point)
 
     def compute_evenness(solutions: numpy.array,
                          true_front: NonDominatedSolutionsArchive,
                          reference_point: List[Any]) -> float:
-        reference_point = \
-            Indicator.find_reference_point(true_front.solution_list)
-        return EvennessIndicator(reference_point).compute(solutions)
+        return NeighbourEvenness().compute(solutions)
 
     def compute_mean(solutions: numpy.array,
                      true_front: NonDominatedSolutionsArchive,
@@ -0,0 +1,119 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# IndicatorCache.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import os
+import json
+import hashlib
+from os.path import isfile
+from typing import Dict, Any, List, Union
+import numpy
+
+
+class IndicatorCache:
+    # bump it when an indicator or the cache layout changes
+    version = 1
+
+    def __init__(self, file_name: str) -> None:
+        """__init__ [summary] IndicatorCache stores indicator scores of a
+        method front on disk as a json file (e.g. next to its .front file),
+        keyed by the content hash of the method front, the true front and
+        the reference point, so scores of unchanged fronts are reused
+
+        Args:
+            file_name (str): [description] *.json cache file
+        """
+        self.file_name = file_name
+        # key -> indicator -> score
+        self.scores: Dict[str, Dict[str, Any]] = {}
+        self.changed = False
+        if isfile(file_name):
+            with open(file_name, 'r') as fin:
+                content = json.load(fin)
+                fin.close()
+            if content.get('version') == IndicatorCache.version:
+                self.scores = content['scores']
+
+    @staticmethod
+    def front_hash(front: numpy.ndarray) -> str:
+        """front_hash [summary] content hash of a front, independent of
+        the order of points
+
+        Args:
+            front (numpy.ndarray): [description] objectives in rows
+
+        Returns:
+            str: [description] hex digest
+        """
+        front = numpy.asarray(front, dtype=numpy.float64)
+        if front.ndim == 2 and len(front):
+            front = front[numpy.lexsort(front.T[::-1])]
+        sha = hashlib.sha256()
+        sha.update('shape:{}\n'.format(front.shape).encode())
+        sha.update(numpy.ascontiguousarray(front).tobytes())
+        return sha.hexdigest()
+
+    @staticmethod
+    def key(front: numpy.ndarray, true_front: numpy.ndarray,
+            reference_point: Union[List[Any], None]) -> str:
+        """key [summary] make the cache key
+
+        Args:
+            front (numpy.ndarray): [description] method front
+            true_front (numpy.ndarray): [description] true front
+            reference_point (Union[List[Any], None]): [description]
+            reference point
+
+        Returns:
+            str: [description] hex digest
+        """
+        sha = hashlib.sha256()
+        sha.update('version:{}\n'.format(IndicatorCache.version).encode())
+        sha.update('front:{}\n'.format(
+            IndicatorCache.front_hash(front)).encode())
+        sha.update('true front:{}\n'.format(
+            IndicatorCache.front_hash(true_front)).encode())
+        reference_str = json.dumps(
+            None if reference_point is None
+            else [float(value) for value in reference_point])
+        sha.update('reference point:{}\n'.format(reference_str).encode())
+        return sha.hexdigest()
+
+    def get(self, key: str, indicator: str) -> Any:
+        """get [summary] cached score
+
+        Args:
+            key (str): [description] see key
+            indicator (str): [description] indicator name
+
+        Returns:
+            Any: [description] score, None if not cached
+        """
+        return self.scores.get(key, {}).get(indicator)
+
+    def put(self, key: str, indicator: str, score: Any) -> None:
+        """put [summary] cache a score
+
+        Args:
+            key (str): [description] see key
+            indicator (str): [description] indicator name
+            score (Any): [description] score
+        """
+        self.scores.setdefault(key, {})[indicator] = float(score)
+        self.changed = True
+
+    def save(self) -> None:
+        """save [summary] write into cache file if changed
+        """
+        if not self.changed:
+            return
+        # write into a temp file first, other reports may read it
+        tmp_file = '{}.{}.tmp'.format(self.file_name, os.getpid())
+        with open(tmp_file, 'w') as fout:
+            json.dump({'version': IndicatorCache.version,
+                       'scores': self.scores}, fout, indent=2)
+            fout.close()
+        os.replace(tmp_file, self.file_name)
+        self.changed = False
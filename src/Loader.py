@@ -316,11 +316,13 @@ class Loader:
     @staticmethod
     def load_Baan(name: str) -> ProblemType:
         problem = BaanProblem()
-        team_num = 17
-        req_num = 100
         with open(name, 'r') as fin:
             csv = reader(fin, delimiter=',', skipinitialspace=True)
-            lines = list(csv)
+            lines = [line for line in csv if line]
+            # team workloads, cost, profit and urgency in each row,
+            # and team capacities in the last row
+            team_num = len(lines[0]) - 3
+            req_num = len(lines) - 1
             for line_num, str_line in enumerate(lines):
                 if line_num >= req_num:
                     break
@@ -0,0 +1,232 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ModelCache.py, created: 2021.03.15
+# last modified: 2021.03.22
+#
+
+import os
+import json
+import hashlib
+from os.path import join, isfile, isdir
+from typing import Dict, Any, List, Tuple
+import numpy
+from src.Config import Config
+from src.NRP import NextReleaseProblem, NRPProblem
+
+
+class ModelCache:
+    # bump it when the modelling or the cache layout changes
+    version = 2
+
+    def __init__(self, cache_path: str = None) -> None:
+        """__init__ [summary] ModelCache stores modelled NRPProblem
+        on disk as .npz files, keyed by the hash of dataset files,
+        the modelling name and the modelling option
+
+        Args:
+            cache_path (str): [description] cache folder, config by default
+        """
+        config = Config()
+        if cache_path is None:
+            cache_path = config.cache_path
+        self.cache_path = cache_path
+
+    @staticmethod
+    def dataset_files(problem: str) -> List[str]:
+        """dataset_files [summary] find all files a problem is loaded from
+
+        Args:
+            problem (str): [description] problem name
+
+        Returns:
+            List[str]: [description] file names
+        """
+        config = Config()
+        dataset = config.dataset[problem]
+        files: List[str] = []
+        if isdir(dataset):
+            for root, _, names in os.walk(dataset):
+                files += [join(root, name) for name in names]
+        else:
+            files.append(dataset)
+        # xuan urgency is loaded when modelling, see NRP
+        urgency_file = config.urgency_file(problem)
+        if isfile(urgency_file):
+            files.append(urgency_file)
+        return sorted(files)
+
+    @staticmethod
+    def key(problem: str, modelling: str, option: Dict[str, Any]) -> str:
+        """key [summary] make the cache key, content hash of dataset files,
+        modelling name and canonicalised option
+
+        Args:
+            problem (str): [description] problem name
+            modelling (str): [description] modelling name
+            option (Dict[str, Any]): [description] modelling option
+
+        Returns:
+            str: [description] hex digest
+        """
+        sha = hashlib.sha256()
+        sha.update('version:{}\n'.format(ModelCache.version).encode())
+        sha.update('modelling:{}\n'.format(modelling).encode())
+        option_str = json.dumps(option, sort_keys=True, default=str)
+        sha.update('option:{}\n'.format(option_str).encode())
+        for file_name in ModelCache.dataset_files(problem):
+            sha.update('file:{}\n'.format(
+                os.path.basename(file_name)).encode())
+            with open(file_name, 'rb') as fin:
+                sha.update(fin.read())
+                fin.close()
+        return sha.hexdigest()
+
+    def file_name(self, problem: str, modelling: str,
+                  option: Dict[str, Any]) -> str:
+        """file_name [summary] cache file of a modelled problem
+
+        Args:
+            problem (str): [description] problem name
+            modelling (str): [description] modelling name
+            option (Dict[str, Any]): [description] modelling option
+
+        Returns:
+            str: [description] *.npz file name
+        """
+        digest = ModelCache.key(problem, modelling, option)
+        return join(self.cache_path,
+                    '{}-{}-{}.npz'.format(problem, modelling, digest[:24]))
+
+    @staticmethod
+    def flatten(maps: List[Dict[int, Any]]
+                ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray,
+                           numpy.ndarray]:
+        """flatten [summary] flatten list of dicts into keys, values,
+        offsets and integer flags of values, dict order kept
+
+        Args:
+            maps (List[Dict[int, Any]]): [description] objectives/inequations
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray,
+            numpy.ndarray]: [description] keys, values, offsets, integers
+        """
+        keys: List[int] = []
+        values: List[Any] = []
+        offsets: List[int] = [0]
+        for one_map in maps:
+            keys += list(one_map.keys())
+            values += list(one_map.values())
+            offsets.append(len(keys))
+        # values are stored as floats, ints are cast back when loading
+        integers = [isinstance(value, (int, numpy.integer))
+                    for value in values]
+        return numpy.array(keys, dtype=numpy.int64), \
+            numpy.array(values, dtype=numpy.float64), \
+            numpy.array(offsets, dtype=numpy.int64), \
+            numpy.array(integers, dtype=bool)
+
+    @staticmethod
+    def unflatten(keys: numpy.ndarray, values: numpy.ndarray,
+                  offsets: numpy.ndarray,
+                  integers: numpy.ndarray) -> List[Dict[int, Any]]:
+        """unflatten [summary] rebuild list of dicts, reverse of flatten
+
+        Returns:
+            List[Dict[int, Any]]: [description] objectives/inequations
+        """
+        keys_list = keys.tolist()
+        values_list = [int(value) if integer else value for value, integer
+                       in zip(values.tolist(), integers.tolist())]
+        maps: List[Dict[int, Any]] = []
+        for index in range(len(offsets) - 1):
+            start, end = int(offsets[index]), int(offsets[index + 1])
+            maps.append(dict(zip(keys_list[start:end],
+                                 values_list[start:end])))
+        return maps
+
+    def save(self, file_name: str, nrp: NRPProblem) -> None:
+        """save [summary] dump a modelled problem into cache
+
+        Args:
+            file_name (str): [description] *.npz file name
+            nrp (NRPProblem): [description] modelled problem
+        """
+        if not isdir(self.cache_path):
+            os.makedirs(self.cache_path, exist_ok=True)
+        obj_keys, obj_values, obj_offsets, obj_integers = \
+            self.flatten(nrp.objectives)
+        cst_keys, cst_values, cst_offsets, cst_integers = \
+            self.flatten(nrp.inequations)
+        # write into a temp file first, other tasks may read it
+        tmp_file = '{}.{}.tmp'.format(file_name, os.getpid())
+        with open(tmp_file, 'wb') as fout:
+            numpy.savez(fout,
+                        version=numpy.array(ModelCache.version),
+                        variables=numpy.array(nrp.variables,
+                                              dtype=numpy.int64),
+                        objectives_keys=obj_keys,
+                        objectives_values=obj_values,
+                        objectives_offsets=obj_offsets,
+                        objectives_integers=obj_integers,
+                        inequations_keys=cst_keys,
+                        inequations_values=cst_values,
+                        inequations_offsets=cst_offsets,
+                        inequations_integers=cst_integers)
+            fout.close()
+        os.replace(tmp_file, file_name)
+
+    def load(self, file_name: str) -> NRPProblem:
+        """load [summary] load a modelled problem from cache
+
+        Args:
+            file_name (str): [description] *.npz file name
+
+        Returns:
+            NRPProblem: [description] modelled problem
+        """
+        nrp = NRPProblem()
+        with numpy.load(file_name) as data:
+            assert int(data['version']) == ModelCache.version
+            nrp.variables = data['variables'].tolist()
+            nrp.objectives = self.unflatten(data['objectives_keys'],
+                                            data['objectives_values'],
+                                            data['objectives_offsets'],
+                                            data['objectives_integers'])
+            nrp.inequations = self.unflatten(data['inequations_keys'],
+                                             data['inequations_values'],
+                                             data['inequations_offsets'],
+                                             data['inequations_integers'])
+        # build compact form as modelling does
+        config = Config()
+        if config.compact_model:
+            nrp.compact()
+        return nrp
+
+    def fetch(self, problem: str, modelling: str,
+              option: Dict[str, Any]) -> NRPProblem:
+        """fetch [summary] get the modelled problem, load from cache
+        if possible, or premodel and model it and store into cache
+
+        Args:
+            problem (str): [description] problem name
+            modelling (str): [description] modelling name
+            option (Dict[str, Any]): [description] modelling option
+
+        Returns:
+            NRPProblem: [description] modelled problem
+        """
+        config = Config()
+        if not config.use_model_cache:
+            nrp_problem = NextReleaseProblem(problem)
+            nrp_problem.premodel(option)
+            return nrp_problem.model(modelling, option)
+        file_name = self.file_name(problem, modelling, option)
+        if isfile(file_name):
+            return self.load(file_name)
+        # not cached yet
+        nrp_problem = NextReleaseProblem(problem)
+        nrp_problem.premodel(option)
+        nrp = nrp_problem.model(modelling, option)
+        self.save(file_name, nrp)
+        return nrp
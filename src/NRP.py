@@ -1,17 +1,17 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # NRP.py, created: 2020.10.31
-# last modified: 2021.03.12
+# last modified: 2021.03.22
 #
 
 import os
 import json
 from copy import deepcopy
-from functools import reduce
-from os.path import join
 # from statistics import median
 # from math import ceil, floor
-from typing import Dict, Tuple, List, Union, Set, Any
+from typing import Dict, Tuple, List, Union, Set, Any, Optional
+import numpy
+from scipy.sparse import csr_matrix
 from src.Loader import Loader, XuanProblem, ReleasePlannerProblem
 from src.Config import Config
 from src.util.moipProb import MOIPProblem
@@ -68,12 +68,87 @@ class NRPProblem:
         # inequations, lhs <= rhs
         self.inequations: List[Dict[int, int]] = []
 
+        # compact form, optional, built by compact()
+        # sorted variables, column j in matrices denotes columns[j]
+        self.columns: List[int] = []
+        # objective matrix, objectives x columns
+        self.objective_matrix: Optional[numpy.ndarray] = None
+        # constraint matrix, inequations x columns, lhs <= rhs
+        self.constraint_matrix: Optional[csr_matrix] = None
+        # rhs of inequations
+        self.rhs: Optional[numpy.ndarray] = None
+
+    def is_compact(self) -> bool:
+        """is_compact [summary] if compact form is available
+
+        Returns:
+            bool: [description]
+        """
+        return self.objective_matrix is not None
+
+    def compact(self) -> None:
+        """compact [summary] build the compact form, a dense objective
+        matrix, a CSR constraint matrix and a separate rhs vector,
+        from objectives and inequations
+        """
+        # column index of each variable
+        self.columns = sorted(self.variables)
+        index = {var: col for col, var in enumerate(self.columns)}
+        # the constant is encoded as len(variables), see to_*_form
+        constant_id = len(self.variables)
+        # objectives, note that there's no constant in objective (see MOIP)
+        self.objective_matrix = \
+            numpy.zeros((len(self.objectives), len(self.columns)))
+        for row, objective in enumerate(self.objectives):
+            for key, value in objective.items():
+                assert key in index
+                self.objective_matrix[row, index[key]] = value
+        # inequations, constant moves to rhs
+        data: List[Any] = []
+        indices: List[int] = []
+        indptr: List[int] = [0]
+        rhs: List[Any] = []
+        for inequation in self.inequations:
+            constant = 0
+            for key, value in inequation.items():
+                if key == constant_id and key not in index:
+                    constant = value
+                else:
+                    indices.append(index[key])
+                    data.append(value)
+            indptr.append(len(indices))
+            rhs.append(constant)
+        self.constraint_matrix = \
+            csr_matrix((numpy.array(data, dtype=float),
+                        numpy.array(indices, dtype=int),
+                        numpy.array(indptr, dtype=int)),
+                       shape=(len(self.inequations), len(self.columns)))
+        self.rhs = numpy.array(rhs, dtype=float)
+
+    def constraint_rows(self) -> List[List[List[Any]]]:
+        """constraint_rows [summary] rows of constraint matrix as
+        [[column indices], [coefficients]], ready for a linear solver
+
+        Returns:
+            List[List[List[Any]]]: [description] rows
+        """
+        assert self.is_compact()
+        matrix = self.constraint_matrix
+        rows: List[List[List[Any]]] = []
+        for row in range(matrix.shape[0]):
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            rows.append([matrix.indices[start:end].tolist(),
+                         matrix.data[start:end].tolist()])
+        return rows
+
     def attributes(self) -> List[List[int]]:
         """attributes [summary] convert objectives into attributes matrix
 
         Returns:
             List[int]: [description] the attributes
         """
+        if self.is_compact():
+            return self.objective_matrix.tolist()
         zeros = [0] * len(self.variables)
         attributes = []
         for i in range(len(self.objectives)):
@@ -149,28 +224,59 @@ class NextReleaseProblem:
         # return
         return nrp
 
-    def __precursors(self, req_id: int) -> Set[int]:
-        """__precursors [summary] find one requirement all precursors
+    @staticmethod
+    def precursors_closure(dependencies: List[Tuple[int, int]]
+                           ) -> Dict[int, List[int]]:
+        """precursors_closure [summary] find all precursors of every
+        requirement at once. Requirements are visited in topological order,
+        so each closure is computed only once from its direct precursors,
+        closures are stored as bitsets (int) over the requirements.
 
         Args:
-            req_id (int): [description] required requirement id
+            dependencies (List[Tuple[int, int]]): [description]
+            (x_i, x_j) denotes x_i is precursor of x_j
 
         Returns:
-            Set[int]: [description] precurosrs
+            Dict[int, List[int]]: [description] requirement -> precursors
         """
-        # find all depdency with right value as requst id input
-        last_level = set([x[0] for x in self.nrp.dependencies
-                          if x[1] == req_id])
-        # check result
-        if len(last_level) == 0:
-            return last_level
-        else:
-            # find their dependecies each and merge their result
-            # then convert then into set for dupicate elimination
-            return last_level.union(
-                set(reduce(lambda x, y: list(x) + list(y),
-                           map(self.__precursors, last_level)))
-            )
+        # index the requirements for bitsets
+        nodes = sorted(set([x[0] for x in dependencies]
+                           + [x[1] for x in dependencies]))
+        position = {node: index for index, node in enumerate(nodes)}
+        # direct precursors, successors and in-degree
+        direct: Dict[int, Set[int]] = {node: set() for node in nodes}
+        successors: Dict[int, List[int]] = {node: [] for node in nodes}
+        for pre, post in dependencies:
+            if pre not in direct[post]:
+                direct[post].add(pre)
+                successors[pre].append(post)
+        degree = {node: len(direct[node]) for node in nodes}
+        # topological order, Kahn's algorithm
+        order = [node for node in nodes if degree[node] == 0]
+        for node in order:
+            for post in successors[node]:
+                degree[post] -= 1
+                if degree[post] == 0:
+                    order.append(post)
+        # dependencies should be a DAG
+        assert len(order) == len(nodes)
+        # closure of each requirement from its direct precursors
+        closure: Dict[int, int] = {}
+        for node in order:
+            bits = 0
+            for pre in direct[node]:
+                bits |= closure[pre] | (1 << position[pre])
+            closure[node] = bits
+        # convert bitsets into requirements
+        precursors: Dict[int, List[int]] = {}
+        for node, bits in closure.items():
+            members: List[int] = []
+            while bits:
+                lowest = bits & -bits
+                members.append(nodes[lowest.bit_length() - 1])
+                bits ^= lowest
+            precursors[node] = members
+        return precursors
 
     def flatten_xuan(self) -> None:
         """flatten_xuan [summary] flatten dependencies,
@@ -178,15 +284,17 @@ class NextReleaseProblem:
         """
         # of course depdencies should not be empty
         assert self.nrp.dependencies
+        # find all precursors of each requirement once
+        precursors = self.precursors_closure(self.nrp.dependencies)
         # copy a new requests from self.requests
-        neo_requests = deepcopy(self.nrp.requests)
+        neo_requests = list(self.nrp.requests)
+        requested = set(neo_requests)
         # traverse requests
         for req in self.nrp.requests:
-            # find all real requests
-            dependencies = list(self.__precursors(req[1]))
-            # add into new requests
-            for dep in dependencies:
-                if (req[0], dep) not in neo_requests:
+            # add all real requests into new requests
+            for dep in precursors.get(req[1], []):
+                if (req[0], dep) not in requested:
+                    requested.add((req[0], dep))
                     neo_requests.append((req[0], dep))
         # change requests and clear dependencies
         self.nrp.requests = neo_requests
@@ -398,37 +506,50 @@ class NextReleaseProblem:
 
     @staticmethod
     def dump_nrp(file_name: str, nrp: NRPProblem) -> None:
-        # sort variables
-        vrs = sorted(nrp.variables)
-        index = {k: i for i, k in enumerate(vrs)}
-        # reorder objectives
-        objs = []
-        for obj in nrp.objectives:
-            tmp_obj = []
-            for var in vrs:
-                if var not in obj:
-                    tmp_obj.append(0.0)
-                else:
-                    tmp_obj.append(float(obj[var]))
-            objs.append(tmp_obj)
-        # remap inequations
-        csts = []
-        if nrp.inequations:
-            constant = len(vrs)
-            for var in nrp.inequations[0]:
-                if var not in vrs:
-                    index[var] = constant
-                    break
-            for ineq in nrp.inequations:
-                csts.append({index[k]: float(v) for k, v in ineq.items()})
+        if nrp.is_compact():
+            # compact form is already ordered by sorted variables
+            objs = nrp.objective_matrix.tolist()
+            constant = len(nrp.columns)
+            csts = []
+            for (ind, val), rhs in zip(nrp.constraint_rows(), nrp.rhs):
+                cst = dict(zip(ind, val))
+                cst[constant] = float(rhs)
+                csts.append(cst)
+        else:
+            # sort variables
+            vrs = sorted(nrp.variables)
+            index = {k: i for i, k in enumerate(vrs)}
+            # reorder objectives
+            objs = []
+            for obj in nrp.objectives:
+                tmp_obj = []
+                for var in vrs:
+                    if var not in obj:
+                        tmp_obj.append(0.0)
+                    else:
+                        tmp_obj.append(float(obj[var]))
+                objs.append(tmp_obj)
+            # remap inequations
+            csts = []
+            if nrp.inequations:
+                constant = len(vrs)
+                for var in nrp.inequations[0]:
+                    if var not in vrs:
+                        index[var] = constant
+                        break
+                for ineq in nrp.inequations:
+                    csts.append({index[k]: float(v) for k, v in ineq.items()})
         # prepare a dict for dumpping
         dumpping = {
             'objectives': objs,
             'inequations': csts
         }
-        with open(file_name, 'w') as fout:
+        # write into a temp file first, other tasks may read it
+        tmp_file = '{}.{}.tmp'.format(file_name, os.getpid())
+        with open(tmp_file, 'w') as fout:
             json.dump(dumpping, fout, indent=4)
             fout.close()
+        os.replace(tmp_file, file_name)
 
     @staticmethod
     def dump_xuan(file_name: str, project_name: str, nrp: XuanNRP) -> None:
@@ -457,13 +578,16 @@ class NextReleaseProblem:
         result['request'] = neo_requests
         # see if folder exists
         if not os.path.exists(config.dump_path):
-            os.makedirs(config.dump_path)
-        with open(file_name, 'w+') as out_file:
+            os.makedirs(config.dump_path, exist_ok=True)
+        # write into a temp file first, other tasks may read it
+        tmp_file = '{}.{}.tmp'.format(file_name, os.getpid())
+        with open(tmp_file, 'w+') as out_file:
             # dump
             json_object = json.dumps(result, indent=4)
             out_file.write(json_object)
             # close the file
             out_file.close()
+        os.replace(tmp_file, file_name)
 
     def model(self, form: str, option: Dict[str, Any]) -> NRPProblem:
         """model [summary] modelling to NRPProblem
@@ -473,7 +597,12 @@ class NextReleaseProblem:
             option (Dict[str, Any]): [description]
         """
         # modelling with certain form
-        return getattr(self, 'to_{}_form'.format(form))(option)
+        mnrp = getattr(self, 'to_{}_form'.format(form))(option)
+        # build compact form if required
+        config = Config()
+        if config.compact_model:
+            mnrp.compact()
+        return mnrp
 
     def to_single_form(self, option: Dict[str, Any]) -> NRPProblem:
         """to_single_form [summary] only for classic nrps,
@@ -820,9 +949,7 @@ class NextReleaseProblem:
         """
         mnrp = self.to_basic_binary_form(option)
         # load urgency
-        # TODO: maybe config in Config
-        path = './datasets/xuan/urgency/'
-        urgency_file = join(path, self.__project + '.json')
+        urgency_file = Config().urgency_file(self.__project)
         max_urgency: Dict[int, int] = {}
         with open(urgency_file, 'r') as fin:
             urgency_value = json.load(fin)
@@ -857,9 +984,7 @@ class NextReleaseProblem:
         # load urgency value for xuan dataset
         # TODO: move it into problem loading
         # load urgency
-        # TODO: maybe config in Config
-        path = './datasets/xuan/urgency/'
-        urgency_file = join(path, project + '.json')
+        urgency_file = Config().urgency_file(project)
         max_urgency: Dict[int, int] = {}
         with open(urgency_file, 'r') as fin:
             urgency_value = json.load(fin)
@@ -922,14 +1047,9 @@ class NextReleaseProblem:
     @staticmethod
     def MOIP(nrp: NRPProblem) -> MOIPProblem:
         # use objectives make attribute matrix
-        attribute_matrix = []
-        for objective in nrp.objectives:
-            line = [0] * (len(nrp.variables))
-            for key, value in objective.items():
-                line[key] = value
-            # there was a constant_id = max_id + 1, then api do not work
-            # so I assume there's no constant in objective
-            attribute_matrix.append(line)
+        # there was a constant_id = max_id + 1, then api do not work
+        # so I assume there's no constant in objective
+        attribute_matrix = nrp.attributes()
         # load into the MOIP
         # construct MOIP
         MOIP = MOIPProblem(len(nrp.objectives), len(nrp.variables), 0)
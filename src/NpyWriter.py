@@ -0,0 +1,71 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# NpyWriter.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+from typing import Any
+import numpy
+
+
+class NpyWriter:
+    # magic string and version 1.0 of .npy format
+    magic = b'\x93NUMPY\x01\x00'
+    # header length, including magic string, reserved for any shape
+    header_size = 128
+
+    def __init__(self, file_name: str, dtype: Any, columns: int) -> None:
+        """__init__ [summary] write a 2d .npy file by rows, the header is
+        reserved at first and written with the final shape on close, so
+        rows are never kept in memory. The file can be read by numpy.load,
+        with mmap_mode as well
+
+        Args:
+            file_name (str): [description] .npy file name
+            dtype (Any): [description] element type
+            columns (int): [description] columns number
+        """
+        self.dtype = numpy.dtype(dtype)
+        self.columns = columns
+        self.rows = 0
+        self.file = open(file_name, 'wb')
+        self.file.write(self.header())
+
+    def header(self) -> bytes:
+        """header [summary] header with current shape, padded with spaces
+
+        Returns:
+            bytes: [description] header
+        """
+        description = "{{'descr': {!r}, 'fortran_order': False, " \
+            "'shape': ({}, {}), }}".format(self.dtype.str, self.rows,
+                                            self.columns)
+        length = self.header_size - len(self.magic) - 2
+        assert len(description) < length
+        text = description.ljust(length - 1) + '\n'
+        return self.magic + length.to_bytes(2, 'little') + \
+            text.encode('latin1')
+
+    def write(self, rows: Any) -> None:
+        """write [summary] append rows
+
+        Args:
+            rows (Any): [description] rows, in a 2d array or list
+        """
+        rows = numpy.asarray(rows, dtype=self.dtype) \
+            .reshape(len(rows), self.columns)
+        self.file.write(numpy.ascontiguousarray(rows).tobytes())
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """close [summary] write the final shape into header and close
+        """
+        self.file.seek(0)
+        self.file.write(self.header())
+        self.file.close()
+
+    def __enter__(self) -> 'NpyWriter':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
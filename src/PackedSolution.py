@@ -0,0 +1,120 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# PackedSolution.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+from typing import List, Any, Sequence, Union
+import numpy
+from jmetal.core.solution import BinarySolution
+
+
+class PackedSolution:
+    __slots__ = ('objectives', 'bits', 'size', 'constraints')
+
+    def __init__(self, objectives: List[float], bits: bytes, size: int,
+                 constraints: List[float] = None) -> None:
+        """__init__ [summary] binary solution with variables packed into
+        bits, it has objectives and constraints as jmetal solutions do,
+        so that it works with archives and comparators of jmetal
+
+        Args:
+            objectives (List[float]): [description] objectives
+            bits (bytes): [description] variables by numpy.packbits,
+            in the order of variable index
+            size (int): [description] variables number
+            constraints (List[float]): [description] constraints
+        """
+        self.objectives = objectives
+        self.bits = bits
+        self.size = size
+        if constraints is None:
+            constraints = []
+        self.constraints = constraints
+
+    @staticmethod
+    def pack(values: Union[numpy.ndarray, Sequence[Any]],
+             objectives: List[float]) -> 'PackedSolution':
+        """pack [summary] make a solution from variables
+
+        Args:
+            values (Union[numpy.ndarray, Sequence[Any]]): [description]
+            0/1 or bool values, in the order of variable index
+            objectives (List[float]): [description] objectives
+
+        Returns:
+            PackedSolution: [description] solution
+        """
+        chosen = numpy.asarray(values) > 0.5
+        return PackedSolution(objectives, numpy.packbits(chosen).tobytes(),
+                              len(chosen))
+
+    @property
+    def key(self) -> bytes:
+        """key [summary] hashable key of variables
+
+        Returns:
+            bytes: [description] packed bits
+        """
+        return self.bits
+
+    def values(self) -> numpy.ndarray:
+        """values [summary] unpack variables
+
+        Returns:
+            numpy.ndarray: [description] bool values
+        """
+        return numpy.unpackbits(numpy.frombuffer(self.bits, dtype=numpy.uint8),
+                                count=self.size).astype(bool)
+
+    @staticmethod
+    def unpack(solutions: Sequence['PackedSolution']) -> numpy.ndarray:
+        """unpack [summary] unpack variables of solutions of one problem
+        into a matrix at once
+
+        Args:
+            solutions (Sequence[PackedSolution]): [description] solutions
+
+        Returns:
+            numpy.ndarray: [description] bool values, solutions in rows
+        """
+        if not solutions:
+            return numpy.zeros((0, 0), dtype=bool)
+        size = solutions[0].size
+        packed = numpy.frombuffer(
+            b''.join([solution.bits for solution in solutions]),
+            dtype=numpy.uint8).reshape(len(solutions), -1)
+        return numpy.unpackbits(packed, axis=1, count=size).astype(bool)
+
+    def to_jmetal(self) -> BinarySolution:
+        """to_jmetal [summary] make a jmetal solution, variables are
+        in a list as the only bits of it
+
+        Returns:
+            BinarySolution: [description] jmetal solution
+        """
+        solution = BinarySolution(self.size, len(self.objectives),
+                                  len(self.constraints))
+        solution.variables = [self.values().tolist()]
+        solution.objectives = list(self.objectives)
+        solution.constraints = list(self.constraints)
+        return solution
+
+    @staticmethod
+    def from_jmetal(solution: BinarySolution) -> 'PackedSolution':
+        """from_jmetal [summary] make a solution from a jmetal one, its
+        variables are either a bits list in a list, or a flat list
+
+        Args:
+            solution (BinarySolution): [description] jmetal solution
+
+        Returns:
+            PackedSolution: [description] solution
+        """
+        variables = solution.variables
+        if variables and isinstance(variables[0], list):
+            variables = variables[0]
+        packed = PackedSolution.pack(
+            numpy.array(variables, dtype=bool), list(solution.objectives))
+        packed.constraints = list(solution.constraints)
+        return packed
@@ -0,0 +1,281 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# Presolver.py, created: 2021.03.16
+# last modified: 2021.03.16
+#
+
+from typing import Dict, Any, List, Set, Tuple, Sequence
+from src.NRP import NRPProblem, NextReleaseProblem
+
+# type, a row is (coefficients, rhs), which means sum coef * x <= rhs
+Row = Tuple[Dict[int, Any], Any]
+
+
+class Presolver:
+    def __init__(self, problem: NRPProblem) -> None:
+        """__init__ [summary] Presolver shrinks a modelled problem before
+        solving, variables could only be fixed to 0 (so that objectives keep
+        no constant), and it keeps a postsolve map to the full variables
+
+        Args:
+            problem (NRPProblem): [description] modelled problem
+        """
+        # store the problem
+        self.problem = problem
+        # original variables, in column order
+        self.origin: List[int] = sorted(problem.variables)
+        # variables fixed to 0
+        self.fixed: Set[int] = set()
+        # new variable id -> original variable
+        self.mapping: List[int] = list(self.origin)
+
+    def parse_rows(self) -> List[Row]:
+        """parse_rows [summary] split inequations into coefficients and rhs,
+        the constant is encoded as len(variables), see NRPProblem.compact
+
+        Returns:
+            List[Row]: [description] rows
+        """
+        constant_id = len(self.problem.variables)
+        variables = set(self.problem.variables)
+        rows: List[Row] = []
+        for inequation in self.problem.inequations:
+            coefs: Dict[int, Any] = {}
+            rhs = 0
+            for key, value in inequation.items():
+                if key == constant_id and key not in variables:
+                    rhs = value
+                elif value != 0:
+                    coefs[key] = value
+            rows.append((coefs, rhs))
+        return rows
+
+    @staticmethod
+    def implication(row: Row) -> Tuple[int, int]:
+        """implication [summary] check if row is c x_i - c x_j <= r,
+        0 <= r < c, which means x_i implies x_j (x_i <= x_j)
+
+        Args:
+            row (Row): [description] row
+
+        Returns:
+            Tuple[int, int]: [description] (x_i, x_j), or None
+        """
+        coefs, rhs = row
+        if len(coefs) != 2:
+            return None
+        (left, left_coef), (right, right_coef) = coefs.items()
+        if left_coef < 0:
+            left, left_coef, right, right_coef = \
+                right, right_coef, left, left_coef
+        if left_coef > 0 and right_coef == -left_coef \
+                and 0 <= rhs < left_coef:
+            return (left, right)
+        return None
+
+    @staticmethod
+    def acyclic(edges: List[Tuple[int, int]]) -> bool:
+        """acyclic [summary] check if a directed graph is a DAG
+
+        Args:
+            edges (List[Tuple[int, int]]): [description] edges
+
+        Returns:
+            bool: [description] True if no cycle
+        """
+        successors: Dict[int, List[int]] = {}
+        degree: Dict[int, int] = {}
+        for pre, post in set(edges):
+            successors.setdefault(pre, []).append(post)
+            successors.setdefault(post, [])
+            degree[post] = degree.get(post, 0) + 1
+            degree.setdefault(pre, 0)
+        order = [node for node in degree if degree[node] == 0]
+        for node in order:
+            for post in successors[node]:
+                degree[post] -= 1
+                if degree[post] == 0:
+                    order.append(post)
+        return len(order) == len(degree)
+
+    @staticmethod
+    def requirements(edges: List[Tuple[int, int]]) -> Dict[int, List[int]]:
+        """requirements [summary] everything implied by each variable,
+        empty if implications are not a DAG
+
+        Args:
+            edges (List[Tuple[int, int]]): [description] (x_i, x_j),
+            x_i implies x_j
+
+        Returns:
+            Dict[int, List[int]]: [description] variable -> implied variables
+        """
+        if not edges or not Presolver.acyclic(edges):
+            return {}
+        # x_j is precursor of x_i as dependencies
+        return NextReleaseProblem.precursors_closure(
+            [(post, pre) for pre, post in edges])
+
+    def fix(self, rows: List[Row]) -> None:
+        """fix [summary] fix variables to 0 until nothing changes, x is fixed
+        if x = 1 violates a row together with everything x implies, or if x
+        has no negative coefficient in both objectives and rows (x = 0
+        dominates x = 1)
+
+        Args:
+            rows (List[Row]): [description] rows
+        """
+        # implication closures, including variable itself
+        edges = [edge for edge in map(self.implication, rows) if edge]
+        implied = self.requirements(edges)
+        closure: Dict[int, Set[int]] = \
+            {var: set(implied.get(var, [])) | {var} for var in self.origin}
+        implicants: Dict[int, Set[int]] = {var: {var} for var in self.origin}
+        for var, members in implied.items():
+            for member in members:
+                implicants[member].add(var)
+        # rows and objectives related to each variable
+        related: Dict[int, List[int]] = {var: [] for var in self.origin}
+        for index, (coefs, _) in enumerate(rows):
+            for var in coefs:
+                related[var].append(index)
+        negative: Set[int] = set()
+        for objective in self.problem.objectives:
+            for var, value in objective.items():
+                if value < 0:
+                    negative.add(var)
+        # fix until nothing changes
+        changed = True
+        while changed:
+            changed = False
+            # rows always satisfied
+            satisfied: Set[int] = set()
+            # x = 1 (and its closure) violates a row
+            for row_index, (coefs, rhs) in enumerate(rows):
+                free = {k: v for k, v in coefs.items() if k not in self.fixed}
+                if sum([v for v in free.values() if v > 0]) <= rhs:
+                    satisfied.add(row_index)
+                    continue
+                min_activity = sum([v for v in free.values() if v < 0])
+                candidates: Set[int] = set()
+                for var, value in free.items():
+                    if value > 0:
+                        candidates |= implicants[var]
+                for var in candidates:
+                    if var in self.fixed:
+                        continue
+                    activity = min_activity
+                    for member in closure[var]:
+                        if free.get(member, 0) > 0:
+                            activity += free[member]
+                    if activity > rhs:
+                        self.fixed.add(var)
+                        changed = True
+            # x = 0 dominates x = 1
+            for var in self.origin:
+                if var in self.fixed or var in negative:
+                    continue
+                if all([rows[index][0][var] >= 0 or index in satisfied
+                        for index in related[var]]):
+                    self.fixed.add(var)
+                    changed = True
+
+    def reduce(self, rows: List[Row]) -> List[Row]:
+        """reduce [summary] remove fixed variables from rows, drop redundant
+        rows, implications implied by others and duplicated rows
+
+        Args:
+            rows (List[Row]): [description] rows
+
+        Returns:
+            List[Row]: [description] reduced rows
+        """
+        # substitute the fixed variables, drop always satisfied rows
+        free_rows: List[Row] = []
+        for coefs, rhs in rows:
+            free = {k: v for k, v in coefs.items() if k not in self.fixed}
+            if sum([v for v in free.values() if v > 0]) <= rhs:
+                continue
+            free_rows.append((free, rhs))
+        # transitive reduction of implications
+        edges = [edge for edge in map(self.implication, free_rows) if edge]
+        implied = self.requirements(edges)
+        direct: Dict[int, Set[int]] = {}
+        for pre, post in edges:
+            direct.setdefault(pre, set()).add(post)
+        redundant: Set[Tuple[int, int]] = set()
+        if implied:
+            for pre, posts in direct.items():
+                for mid in posts:
+                    for post in implied.get(mid, []):
+                        if post in posts:
+                            redundant.add((pre, post))
+        # collapse duplicated rows, keep the tightest rhs
+        tightest: Dict[Tuple[Tuple[int, Any], ...], int] = {}
+        reduced: List[Row] = []
+        for coefs, rhs in free_rows:
+            if self.implication((coefs, rhs)) in redundant:
+                continue
+            key = tuple(sorted(coefs.items()))
+            if key in tightest:
+                index = tightest[key]
+                if rhs < reduced[index][1]:
+                    reduced[index] = (coefs, rhs)
+            else:
+                tightest[key] = len(reduced)
+                reduced.append((coefs, rhs))
+        return reduced
+
+    def presolve(self) -> NRPProblem:
+        """presolve [summary] fix variables, reduce rows and renumber
+        variables as 0 .. n'-1
+
+        Returns:
+            NRPProblem: [description] presolved problem
+        """
+        rows = self.parse_rows()
+        self.fix(rows)
+        reduced = self.reduce(rows)
+        kept = [var for var in self.origin if var not in self.fixed]
+        # nothing left, keep the problem as it is
+        if not kept:
+            self.fixed = set()
+            self.mapping = list(self.origin)
+            return self.problem
+        self.mapping = kept
+        index = {var: new_id for new_id, var in enumerate(kept)}
+        # renumber objectives and inequations
+        constant_id = len(self.problem.variables)
+        pnrp = NRPProblem()
+        pnrp.variables = list(range(len(kept)))
+        for objective in self.problem.objectives:
+            new_objective: Dict[int, Any] = {}
+            for var, value in objective.items():
+                if var in index:
+                    new_objective[index[var]] = value
+                elif var == constant_id and var not in self.origin:
+                    new_objective[len(kept)] = value
+            pnrp.objectives.append(new_objective)
+        for coefs, rhs in reduced:
+            inequation = {index[var]: value for var, value in coefs.items()}
+            inequation[len(kept)] = rhs
+            pnrp.inequations.append(inequation)
+        # keep the same form as modelled
+        if self.problem.is_compact():
+            pnrp.compact()
+        return pnrp
+
+    def postsolve(self, values: Sequence[Any]) -> Tuple[Any, ...]:
+        """postsolve [summary] map variables of presolved problem back
+        to the original variables, in column order
+
+        Args:
+            values (Sequence[Any]): [description] presolved variables
+
+        Returns:
+            Tuple[Any, ...]: [description] original variables
+        """
+        assert len(values) == len(self.mapping)
+        full = {var: values[new_id]
+                for new_id, var in enumerate(self.mapping)}
+        return tuple([full.get(var, False) for var in self.origin])
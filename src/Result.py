@@ -1,20 +1,26 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # Result.py, created: 2020.11.10
-# last modified: 2021.01.19
+# last modified: 2021.03.22
 #
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Union
 import json
+import numpy
 from copy import deepcopy
 from os.path import join, isfile
 from os import listdir
-from jmetal.core.solution import BinarySolution
-from jmetal.util.archive import NonDominatedSolutionsArchive
+from src.Archive import NonDominatedArchive
 from src.Config import Config
+from src.PackedSolution import PackedSolution
 
 
 class Result:
+    # version of binary result files, see Controller.dump_moip_solutions
+    format_version = 1
+    # rows read from memory mapped .npy files at a time
+    chunk = 4096
+
     def __init__(self, result_folder: str,
                  use_cached_front: bool = True) -> None:
         """__init__ [summary] handle the result folders and files
@@ -33,11 +39,17 @@ class Result:
         self.info_template = join(self.root, '{}/{}/i_{}.json')
         self.vari_template = join(self.root, '{}/{}/v_{}.txt')
         self.sltn_template = join(self.root, '{}/{}/s_{}.txt')
+        # binary ones, used if available
+        self.vari_npy_template = join(self.root, '{}/{}/v_{}.npy')
+        self.sltn_npy_template = join(self.root, '{}/{}/s_{}.npy')
 
         # method pareto front template
         self.method_front_template = join(self.root, '{}/{}/.front')
         # project pareto front template
         self.project_front_template = join(self.root, '{}/.front')
+        # indicator scores cache template, see IndicatorCache
+        self.method_scores_template = \
+            join(self.root, '{}/{}/.front.scores.json')
 
         # project names
         self.projects: List[str] = \
@@ -58,8 +70,10 @@ class Result:
                 self.iterations[(p, m)] = iteration
                 for i in range(iteration):
                     assert isfile(self.info_template.format(p, m, i))
-                    assert isfile(self.vari_template.format(p, m, i))
-                    assert isfile(self.sltn_template.format(p, m, i))
+                    assert isfile(self.vari_template.format(p, m, i)) or \
+                        isfile(self.vari_npy_template.format(p, m, i))
+                    assert isfile(self.sltn_template.format(p, m, i)) or \
+                        isfile(self.sltn_npy_template.format(p, m, i))
         # end nested for
 
         # infomation
@@ -70,9 +84,9 @@ class Result:
         self.non_dominated_count: Dict[Tuple[str, str], int] = {}
 
         # prepare pareto fronts
-        self.project_fronts: Dict[str, NonDominatedSolutionsArchive] = {}
+        self.project_fronts: Dict[str, NonDominatedArchive] = {}
         self.method_fronts: Dict[Tuple[str, str],
-                                 NonDominatedSolutionsArchive] = {}
+                                 NonDominatedArchive] = {}
         for project in self.projects:
             for method in self.methods[project]:
                 print(project, method)
@@ -116,16 +130,19 @@ class Result:
             method (str): [description]
         """
         # use .front if possible
-        if isfile(self.mf(project, method)) and self.use_cached_front:
+        if self.has_archive(self.mf(project, method)) \
+                and self.use_cached_front:
             self.method_fronts[(project, method)] = \
                 self.load_archive(self.mf(project, method))
             return
         # build pareto
         solution_files = []
         for i in range(self.iterations[(project, method)]):
+            info = Result.load_json(self.i(project, method, i))
             solution_files.append((
                 self.s(project, method, i),
-                self.v(project, method, i)
+                self.v(project, method, i),
+                info.get('variables num')
             ))
         self.method_fronts[(project, method)] = \
             self.build_pareto_front(solution_files)
@@ -141,7 +158,7 @@ class Result:
             project (str): [description]
         """
         # use .front if possible
-        if isfile(self.pf(project)) and self.use_cached_front:
+        if self.has_archive(self.pf(project)) and self.use_cached_front:
             self.project_fronts[(project)] = \
                 self.load_archive(self.pf(project))
             # load non dominated count
@@ -152,22 +169,21 @@ class Result:
                 self.non_dominated_count[key] = int(v)
             return
         # use method fronts to build project front
-        archive = NonDominatedSolutionsArchive()
+        archive = NonDominatedArchive()
         for method in self.methods[project]:
             key = (project, method)
             assert key in self.method_fronts
-            for solution in self.method_fronts[key].solution_list:
-                archive.add(solution)
+            archive.extend(self.method_fronts[key].solution_list)
+        # objectives on the project front
+        front = set([tuple(solution.objectives)
+                     for solution in archive.solution_list])
         this_count: Dict[Tuple[str, str], int] = {}
         for method in self.methods[project]:
             key = (project, method)
             this_count[key] = 0
             for solution in self.method_fronts[key].solution_list:
-                s_obj = solution.objectives
-                for pareto_solution in archive.solution_list:
-                    if s_obj == pareto_solution.objectives:
-                        this_count[key] += 1
-                        break
+                if tuple(solution.objectives) in front:
+                    this_count[key] += 1
         self.project_fronts[project] = archive
         self.non_dominated_count.update(this_count)
         # write into .front and .front.count
@@ -179,25 +195,24 @@ class Result:
             fout.close()
 
     @staticmethod
-    def build_pareto_front(solution_files: List[Tuple[str, str]]
-                           ) -> NonDominatedSolutionsArchive:
+    def build_pareto_front(solution_files: List[Tuple[Any, ...]]
+                           ) -> NonDominatedArchive:
         """build_pareto_front [summary] build pareto front for
         give solution files.
-        Note that, solution_files are [(s_file, v_file)]
+        Note that, solution_files are [(s_file, v_file)], or
+        [(s_file, v_file, variables_num)], see load_solutions
 
         Args:
-            solution_files (List[Tuple[str, str]]): [description]
+            solution_files (List[Tuple[Any, ...]]): [description]
             zip of solution files and variables files
 
         Returns:
-            NonDominatedSolutionsArchive: [description]
+            NonDominatedArchive: [description]
         """
-        archive = NonDominatedSolutionsArchive()
+        archive = NonDominatedArchive()
         for solution_file in solution_files:
-            solutions = \
-                Result.load_solutions(solution_file[0], solution_file[1])
-            for solution in solutions:
-                archive.add(solution)
+            solutions = Result.load_solutions(*solution_file)
+            archive.extend(solutions)
         return archive
 
     @staticmethod
@@ -314,19 +329,25 @@ class Result:
         return project, method, iteration
 
     def s(self, project: str, method: str, iteration: int) -> str:
-        """ solution file(objectives)
+        """ solution file(objectives), .npy if available
         """
         # check arguments
         project, method, iteration = \
             self.check_arguments(project, method, iteration)
+        npy_file = self.sltn_npy_template.format(project, method, iteration)
+        if isfile(npy_file):
+            return npy_file
         return self.sltn_template.format(project, method, iteration)
 
     def v(self, project: str, method: str, iteration: int) -> str:
-        """ variables file
+        """ variables file, .npy if available
         """
         # check arguments
         project, method, iteration = \
             self.check_arguments(project, method, iteration)
+        npy_file = self.vari_npy_template.format(project, method, iteration)
+        if isfile(npy_file):
+            return npy_file
         return self.vari_template.format(project, method, iteration)
 
     def i(self, project: str, method: str, iteration: int) -> str:
@@ -347,6 +368,11 @@ class Result:
         """
         return self.project_front_template.format(project)
 
+    def sf(self, project: str, method: str) -> str:
+        """ method indicator scores cache file
+        """
+        return self.method_scores_template.format(project, method)
+
     @staticmethod
     def tuple_parse(tuple_str: str, element_type: type) -> Tuple[Any, ...]:
         """tuple_parse [summary] parse tuple from string
@@ -386,6 +412,41 @@ class Result:
         # return tuple
         return tuple(tuple_list)
 
+    @staticmethod
+    def load_matrix(file_name: str, element_type: type) -> numpy.ndarray:
+        """load_matrix [summary] load tuples of int/float/bool from file,
+        the same as tuple_parse on each line, but parsed at once
+
+        Args:
+            file_name (str): [description]
+            element_type (type): [description]
+
+        Returns:
+            numpy.ndarray: [description] tuples in rows
+        """
+        # read from files
+        with open(file_name, 'r') as fin:
+            lines = [line for line in fin.read().splitlines() if line.strip()]
+            fin.close()
+        if not lines:
+            return numpy.zeros((0, 0), dtype=element_type)
+        # drop ignored characters, anything after ')', and the trailing
+        # comma of one element tuples
+        ignore = str.maketrans('', '', ' \t\b\r(')
+        rows = [line.translate(ignore).split(')')[0].rstrip(',')
+                for line in lines]
+        text = ','.join(rows)
+        if element_type == bool:
+            # each element is one '0' or '1' character
+            digits = numpy.frombuffer(
+                text.replace(',', '').encode('latin1'), dtype=numpy.uint8)
+            assert len(digits) == text.count(',') + 1
+            matrix = digits == ord('1')
+            assert (matrix | (digits == ord('0'))).all()
+        else:
+            matrix = numpy.array(text.split(','), dtype=element_type)
+        return matrix.reshape(len(rows), -1)
+
     @staticmethod
     def load_tuples(file_name: str, element_type: type
                     ) -> List[Tuple[Any, ...]]:
@@ -397,112 +458,161 @@ class Result:
         Returns:
             List[Tuple[Any, ...]]: [description] tuples
         """
-        # read from files
-        lines = None
-        with open(file_name, 'r') as fin:
-            # read lines
-            lines = fin.readlines()
-            fin.close()
-        # parse each line into tuple
-        tuples: List[Tuple[Any, ...]] = []
-        for line in lines:
-            if line.strip():
-                tuples.append(Result.tuple_parse(line, element_type))
-        # end for
-        return tuples
+        matrix = Result.load_matrix(file_name, element_type)
+        return [tuple(row) for row in matrix.tolist()]
 
     @staticmethod
     def load_solutions(objectives_file: str,
-                       variables_file: str
-                       ) -> List[BinarySolution]:
-        # load objectives and variables
-        objectives = Result.load_tuples(objectives_file, float)
-        variables = Result.load_tuples(variables_file, bool)
-        assert len(objectives) == len(variables)
-        # prepare
-        objectives_len = len(objectives[0])
-        variables_len = len(variables[0])
-        solutions_num = len(objectives)
-        solutions: List[BinarySolution] = []
-        # make BinarySolution s
-        for i in range(solutions_num):
-            solution = BinarySolution(
-                variables_len,
-                objectives_len)
-            solution.variables = [list(variables[i])]
-            solution.objectives = list(objectives[i])
-            solutions.append(solution)
+                       variables_file: str,
+                       variables_num: Union[int, None] = None
+                       ) -> List[PackedSolution]:
+        """load_solutions [summary] load solutions from a solutions file
+        and a variables file, both .npy or both text, .npy files are
+        memory mapped and read by chunks
+
+        Args:
+            objectives_file (str): [description] s_*.npy or s_*.txt
+            variables_file (str): [description] v_*.npy or v_*.txt
+            variables_num (Union[int, None]): [description] variables
+            number, for .npy only, 'variables num' in info file, all
+            packed bits are taken if None
+
+        Returns:
+            List[PackedSolution]: [description] solutions
+        """
+        # load objectives and packed variables
+        if objectives_file.endswith('.npy'):
+            objectives = numpy.load(objectives_file, mmap_mode='r')
+            packed = numpy.load(variables_file, mmap_mode='r')
+            if variables_num is None:
+                variables_num = packed.shape[1] * 8
+        else:
+            objectives = Result.load_matrix(objectives_file, float)
+            variables = Result.load_matrix(variables_file, bool)
+            variables_num = variables.shape[1]
+            packed = numpy.packbits(variables, axis=1)
+        assert len(objectives) == len(packed)
+        # make packed solutions, only a chunk of rows is read at a time
+        solutions: List[PackedSolution] = []
+        for start in range(0, len(objectives), Result.chunk):
+            end = start + Result.chunk
+            rows = objectives[start:end].tolist()
+            bits_rows = numpy.ascontiguousarray(packed[start:end])
+            for row, bits in zip(rows, bits_rows):
+                solutions.append(PackedSolution(row, bits.tobytes(),
+                                                variables_num))
         # end for
         return solutions
 
+    @staticmethod
+    def has_archive(file_name: str) -> bool:
+        """has_archive [summary] check if an archive is dumped
+
+        Args:
+            file_name (str): [description] archive file name
+
+        Returns:
+            bool: [description] True if .npz or text one exists
+        """
+        return isfile(file_name + '.npz') or isfile(file_name)
+
     @staticmethod
     def dump_archive(file_name: str,
-                     archive: NonDominatedSolutionsArchive) -> None:
-        """dump_archive [summary] dump an archive
+                     archive: NonDominatedArchive) -> None:
+        """dump_archive [summary] dump an archive, into file_name.npz
+        in npy result format, into text otherwise
 
         Args:
             file_name (str): [description]
-            archive (NonDominatedSolutionsArchive): [description]
+            archive (NonDominatedArchive): [description]
         """
+        solutions = archive.solution_list
+        if Config().result_format == 'npy':
+            first = solutions[0] if solutions else PackedSolution([], b'', 0)
+            numpy.savez(
+                file_name + '.npz',
+                version=Result.format_version,
+                size=first.size,
+                objectives=numpy.array(
+                    [solution.objectives for solution in solutions],
+                    dtype=float).reshape(len(solutions),
+                                         len(first.objectives)),
+                variables=numpy.frombuffer(
+                    b''.join([solution.bits for solution in solutions]),
+                    dtype=numpy.uint8).reshape(len(solutions),
+                                               len(first.bits)),
+                constraints=numpy.array(
+                    [solution.constraints for solution in solutions],
+                    dtype=float).reshape(len(solutions),
+                                         len(first.constraints))
+            )
+            return
         with open(file_name, 'w+') as archive_file:
-            for solution in archive.solution_list:
+            for solution in solutions:
                 solution_str = Result.solution_string(solution)
                 archive_file.write(solution_str + '\n')
             archive_file.close()
 
     @staticmethod
-    def load_archive(file_name: str) -> NonDominatedSolutionsArchive:
-        """load_archive [summary] load an archive from file
+    def load_archive(file_name: str) -> NonDominatedArchive:
+        """load_archive [summary] load an archive from file_name.npz
+        if exists, from text file_name otherwise
 
         Args:
             file_name (str): [description]
 
         Returns:
-            NonDominatedSolutionsArchive: [description]
+            NonDominatedArchive: [description]
         """
-        archive = NonDominatedSolutionsArchive()
+        archive = NonDominatedArchive()
+        if isfile(file_name + '.npz'):
+            with numpy.load(file_name + '.npz') as data:
+                assert int(data['version']) <= Result.format_version
+                size = int(data['size'])
+                archive.extend([
+                    PackedSolution(objectives, bits.tobytes(), size,
+                                   constraints)
+                    for objectives, bits, constraints in
+                    zip(data['objectives'].tolist(), data['variables'],
+                        data['constraints'].tolist())
+                ])
+            return archive
         with open(file_name, 'r') as archive_file:
-            for solution_str in archive_file:
-                solution = Result.parse_solution(solution_str)
-                archive.add(solution)
+            archive.extend([Result.parse_solution(solution_str)
+                            for solution_str in archive_file])
             archive_file.close()
         return archive
 
     @staticmethod
-    def solution_string(solution: BinarySolution) -> str:
+    def solution_string(solution: PackedSolution) -> str:
         """solution_string [summary] convert solution into
         a json string
 
         Args:
-            solution (BinarySolution): [description]
+            solution (PackedSolution): [description]
 
         Returns:
             str: [description] json string
         """
         solution_dict: Dict[str, Any] = {}
-        solution_dict['variables'] = [int(x) for x in solution.variables[0]]
+        solution_dict['variables'] = \
+            solution.values().astype(int).tolist()
         solution_dict['objectives'] = solution.objectives
         solution_dict['constraints'] = solution.constraints
         return json.dumps(solution_dict)
 
     @staticmethod
-    def parse_solution(solution_str: str) -> BinarySolution:
+    def parse_solution(solution_str: str) -> PackedSolution:
         """parse_solution [summary] parse json to solution
 
         Args:
             solution_str (str): [description]
 
         Returns:
-            BinarySolution: [description]
+            PackedSolution: [description]
         """
         solution_dict = json.loads(solution_str)
-        variables = [[bool(x) for x in solution_dict['variables']]]
-        objectives = solution_dict['objectives']
-        constraints = solution_dict['constraints']
-        solution = BinarySolution(
-            len(variables), len(objectives), len(constraints)
-        )
-        solution.variables = variables
-        solution.objectives = objectives
-        solution.constraints = constraints
+        solution = PackedSolution.pack(solution_dict['variables'],
+                                       solution_dict['objectives'])
+        solution.constraints = solution_dict['constraints']
         return solution
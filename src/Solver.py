@@ -1,21 +1,28 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # Solver.py, created: 2020.11.02
-# last modified: 2021.01.20
+# last modified: 2021.03.22
 #
 
 from typing import Dict, Any, List, Union
 from src.NRP import NRPProblem
 from src.Config import Config
+from src.Presolver import Presolver
+from src.Solvers.BaseSolver import BaseSolver
 from src.Solvers.EConstraint import EConstraint
 from src.Solvers.ImprovedEC import ImprovedEC
+from src.Solvers.ParallelEConstraint import ParallelEConstraint
+from src.Solvers.Augmecon import Augmecon
+from src.Solvers.ParetoDP import ParetoDP
+from src.Solvers.NumpyMOEA import NSGAII, IBEA
 # from src.Solvers.CWMOIP import CWMOIP
 from src.Solvers.BinCWMOIP import CWMOIP
 from src.Solvers.NormalConstraint import NormalConstraint
 from src.Solvers.JarSolver import JarSolver
 
 # type
-SolverType = Union[EConstraint, CWMOIP, NormalConstraint, JarSolver]
+SolverType = Union[EConstraint, ParallelEConstraint, CWMOIP,
+                   NormalConstraint, ParetoDP, NSGAII, IBEA, JarSolver]
 
 
 class Solver:
@@ -37,8 +44,18 @@ class Solver:
         # get config
         config = Config()
         assert method in config.method
+        # presolve, solvers see the reduced problem only
+        self.presolver: Union[Presolver, None] = None
+        if config.presolve and isinstance(problem, NRPProblem):
+            self.presolver = Presolver(problem)
+            problem = self.presolver.presolve()
         self.solver: SolverType
         getattr(self, 'employ_{}'.format(method))(problem, method_option)
+        # mip start could be switched per method, see BaseSolver
+        if method_option and 'mip_start' in method_option:
+            base_solver = getattr(self.solver, 'solver', None)
+            if isinstance(base_solver, BaseSolver):
+                base_solver.mip_start = bool(method_option['mip_start'])
 
     def prepare(self):
         self.solver.prepare()
@@ -50,6 +67,9 @@ class Solver:
         return self.solver.solutions()
 
     def variables(self) -> List[Any]:
+        if self.presolver:
+            return [self.presolver.postsolve(values)
+                    for values in self.solver.variables()]
         return self.solver.variables()
 
     def employ_epsilon(self,
@@ -58,6 +78,36 @@ class Solver:
                        ) -> None:
         self.solver = EConstraint(problem)
 
+    def employ_pepsilon(self,
+                        problem: NRPProblem,
+                        option: Dict[str, Any] = None
+                        ) -> None:
+        self.solver = ParallelEConstraint(problem, option)
+
+    def employ_augmecon(self,
+                        problem: NRPProblem,
+                        option: Dict[str, Any] = None
+                        ) -> None:
+        self.solver = Augmecon(problem, option)
+
+    def employ_dp(self,
+                  problem: NRPProblem,
+                  option: Dict[str, Any] = None
+                  ) -> None:
+        self.solver = ParetoDP(problem, option)
+
+    def employ_npnsgaii(self,
+                        problem: NRPProblem,
+                        option: Dict[str, Any] = None
+                        ) -> None:
+        self.solver = NSGAII(problem, option)
+
+    def employ_npibea(self,
+                      problem: NRPProblem,
+                      option: Dict[str, Any] = None
+                      ) -> None:
+        self.solver = IBEA(problem, option)
+
     def employ_imprec(self,
                       problem: NRPProblem,
                       option: Dict[str, Any] = None
@@ -0,0 +1,92 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# Augmecon.py, created: 2021.03.20
+# last modified: 2021.03.22
+#
+
+import math
+from typing import Dict, List, Any
+from src.NRP import NRPProblem
+from src.PackedSolution import PackedSolution
+from src.Solvers.EConstraint import EConstraint
+
+
+class Augmecon(EConstraint):
+    def __init__(self, problem: NRPProblem,
+                 option: Dict[str, Any] = None) -> None:
+        """__init__ [summary] augmented epsilon-constraint (AUGMECON2)
+
+        The method is mentioned in
+        Effective implementation of the epsilon-constraint method in
+        Multi-Objective Mathematical Programming problems, G.Mavrotas
+        https://doi.org/10.1016/j.amc.2009.03.037
+        and the bypass in
+        An improved version of the augmented epsilon-constraint method
+        (AUGMECON2) for finding the exact pareto set in Multi-Objective
+        Integer Programming problems, G.Mavrotas, K.Florios
+        https://doi.org/10.1016/j.amc.2013.03.002
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+            option (Dict[str, Any]): [description] 'eps', weight of slacks
+        """
+        EConstraint.__init__(self, problem)
+        if option is None:
+            option = {}
+        # weight of slacks in objective, small enough to keep optimum
+        self.eps: float = option.get('eps', 1e-3)
+
+    def prepare(self) -> None:
+        """prepare [summary] set objective and additional constraints,
+        then add slack of each objective constraint, f_i + s_i <= e_i,
+        and reward them in objective, min f_0 - eps * sum(s_i / r_i)
+        """
+        EConstraint.prepare(self)
+        cplex = self.solver.solver
+        for i in range(1, len(self.problem.objectives)):
+            # range of this objective
+            obj_range = max(1.0, self.up[i] - self.low[i])
+            # lexicographic weights, as in AUGMECON2
+            weight = self.eps * (10.0 ** (1 - i)) / obj_range
+            slack_name = 's' + str(i)
+            cplex.variables.add(obj=[-weight], lb=[0.0], ub=[obj_range],
+                                types=['C'], names=[slack_name])
+            cplex.linear_constraints.set_coefficients(
+                'obj' + str(i), slack_name, 1.0)
+
+    def recuse(self, level: int,
+               low: List[Any], up: List[Any]) -> Dict[str, PackedSolution]:
+        """recuse [summary] recusively execute, the innermost loop
+        bypasses as many rhs as the slack of last solution
+
+        Args:
+            level (int): [description] current objective
+            low (List[Any]): [description] lower bound of each objective
+            up (List[Any]): [description] upper bound of each objective
+
+        Returns:
+            List[PackedSolution]: [description] solutions found so far
+        """
+        if level != 1:
+            return EConstraint.recuse(self, level, low, up)
+        # prepare all solutions set
+        all_solutions: Dict[str, PackedSolution] = {}
+        # get the up and low bound
+        rhs = self.floor_rhs(level, math.ceil(up[level]))
+        relaxed_low = math.floor(low[level])
+        while rhs is not None and rhs >= relaxed_low:
+            # update rhs
+            self.set_rhs(level, rhs)
+            solutions = self.recuse(level - 1, low, up)
+            if not solutions:
+                # tighter rhs are infeasible as well
+                break
+            all_solutions = {**all_solutions, **solutions}
+            # slack s_1 = rhs - f_1, as slack is maximized in objective
+            slack = min([rhs - solution.objectives[level]
+                         for solution in solutions.values()])
+            # bypass coefficient, with step 1
+            bypass = math.floor(slack + 1e-6)
+            rhs = self.floor_rhs(level, rhs - bypass - 1)
+        # end while
+        return all_solutions
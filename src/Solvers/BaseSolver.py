@@ -1,16 +1,17 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # BaseSolver.py, created: 2020.11.02
-# last modified: 2021.01.12
+# last modified: 2021.03.22
 #
 
 from math import ceil, floor
 from typing import Dict, Any, List, Union, Tuple
+import numpy
 from cplex import Cplex, SolutionInterface
-from jmetal.util.archive import NonDominatedSolutionsArchive
-from jmetal.core.solution import BinarySolution
+from src.Archive import NonDominatedArchive
 from src.Config import Config
 from src.NRP import NRPProblem
+from src.PackedSolution import PackedSolution
 
 # from time import time
 
@@ -28,11 +29,10 @@ class BaseSolver:
         # the solver
         self.solver = Cplex()
         # Non-Dominated Solutions Archive
-        self.archive: NonDominatedSolutionsArchive = \
-            NonDominatedSolutionsArchive()
+        self.archive: NonDominatedArchive = NonDominatedArchive()
 
         # solution tmp list
-        self.solution_list: List[BinarySolution] = []
+        self.solution_list: List[PackedSolution] = []
 
         # load config
         config = Config()
@@ -49,6 +49,38 @@ class BaseSolver:
         # self.solver.parameters.timelimit.set(1000.0)
         # self.solver.parameters.dettimelimit.set(1000.0)
         self.solver.parameters.workmem.set(config.work_memory)
+        # add variables and constraints
+        if problem.is_compact():
+            self.add_compact_problem(problem)
+        else:
+            self.add_problem(problem)
+
+        # mip start, warm start each solving from a found solution
+        self.mip_start = config.mip_start
+        # column of each variable in solver, see binary_values
+        if problem.is_compact():
+            columns = problem.columns
+        else:
+            columns = problem.variables
+        self.column_index = {var: col for col, var in enumerate(columns)}
+        # added constraints, name -> (coefficients, rhs)
+        self.constraints: Dict[str, Tuple[numpy.ndarray, float]] = {}
+        # objective coefficients and sense
+        self.objective_vector = numpy.zeros(len(columns))
+        self.minimize = True
+        # mip start candidates, the last found solution and non-dominated
+        # ones found so far, 0/1 values by rows with their objectives
+        self.last_found = numpy.zeros(0, dtype=bool)
+        self.found = numpy.zeros((0, len(columns)), dtype=bool)
+        self.found_objectives = numpy.zeros((0, len(problem.objectives)))
+
+    def add_problem(self, problem: NRPProblem) -> None:
+        """add_problem [summary] add variables and constraints
+        from objectives and inequations
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+        """
         # add variables
         vars_num = len(problem.variables)
         types = ['B'] * vars_num
@@ -74,6 +106,27 @@ class BaseSolver:
                                                rhs=[rs],
                                                names=['c' + str(index)])
 
+    def add_compact_problem(self, problem: NRPProblem) -> None:
+        """add_compact_problem [summary] add variables and constraints
+        from compact form, variables are added in column order so that
+        column index is also the variable index in solver
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+        """
+        vars_num = len(problem.columns)
+        variables = ['x' + str(i) for i in problem.columns]
+        self.solver.variables.add(obj=None, lb=None, ub=None,
+                                  types=['B'] * vars_num, names=variables)
+        # add all constraints at once
+        rows_num = len(problem.rhs)
+        self.solver.linear_constraints.add(
+            lin_expr=problem.constraint_rows(),
+            senses='L' * rows_num,
+            rhs=problem.rhs.tolist(),
+            names=['c' + str(index) for index in range(rows_num)]
+        )
+
     def add_constriant(self, name: str,
                        constraint: Dict[int, Any]) -> None:
         """add_constriant [summary] add one constraint
@@ -82,8 +135,11 @@ class BaseSolver:
             name (str): [description]
             constraint (Dict[int, Any]): [description]
         """
-        # get the num of variables
+        # get the num of variables, it's the constant if not a variable,
+        # see NRPProblem.compact
         vars_num = len(self.problem.variables)
+        if vars_num in self.column_index:
+            vars_num = -1
         rows = []
         vari = []
         coef = []
@@ -98,6 +154,9 @@ class BaseSolver:
         rows.append([vari, coef])
         self.solver.linear_constraints.add(lin_expr=rows, senses='L',
                                            rhs=[rs], names=[name])
+        # record it for checking mip starts
+        coefs = self.vectorize(constraint)
+        self.constraints[name] = (coefs, rs)
 
     def delete_constraint(self, name: str) -> None:
         """delete_constraint [summary] remove one constraint
@@ -106,6 +165,8 @@ class BaseSolver:
             name (str): [description]
         """
         self.solver.linear_constraints.delete(name)
+        if name in self.constraints:
+            del self.constraints[name]
 
     def add_constriants(self,
                         constraints: Dict[str, Dict[int, Any]]) -> None:
@@ -166,6 +227,8 @@ class BaseSolver:
             [('x' + str(k), v) for k, v in objective.items()]
         # set objective
         self.solver.objective.set_linear(pairs)
+        self.objective_vector = self.vectorize(objective)
+        self.minimize = minimize
         # set sense
         sense = None
         if minimize:
@@ -182,6 +245,8 @@ class BaseSolver:
             rhs (Any): [description] rhs
         """
         self.solver.linear_constraints.set_rhs(name, rhs)
+        if name in self.constraints:
+            self.constraints[name] = (self.constraints[name][0], rhs)
 
     @staticmethod
     def around(f: float, mid: float) -> bool:
@@ -211,83 +276,209 @@ class BaseSolver:
         else:
             return floor(f)
 
-    def jmetal_solution(self, cplex_soltuion: SolutionInterface
-                        ) -> Union[BinarySolution, None]:
-        # create a new binary solution
-        solution = BinarySolution(
-            len(self.problem.variables),
-            len(self.problem.objectives),
-            len(self.problem.inequations)
-        )
-        # get status, variables from cplex_solution
-        status = cplex_soltuion.get_status_string()
-        if 'optimal' not in status:
-            return None
-        variables: Dict[int, Any] = {}
-        for var_id in self.problem.variables:
-            value = cplex_soltuion.get_values('x'+str(var_id))
-            variables[var_id] = BaseSolver.bool_float(value)
-        # check
-        assert len(variables) == len(self.problem.variables)
-        # set variables
-        solution.variables = variables
+    @staticmethod
+    def binary_values(problem: NRPProblem,
+                      cplex_soltuion: SolutionInterface) -> numpy.ndarray:
+        """binary_values [summary] fetch all variables in one call,
+        they are in the order as added, columns in compact form,
+        problem.variables otherwise
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+            cplex_soltuion (SolutionInterface): [description] solution
+
+        Returns:
+            numpy.ndarray: [description] 0/1 values
+        """
+        values = numpy.array(
+            cplex_soltuion.get_values(0, len(problem.variables) - 1))
+        chosen = values > 0.5
+        # report non-integral values, see bool_float
+        for value in values[numpy.abs(values - chosen) > 1e-6]:
+            print(str(value) + 'converted to' + str(value > 0.5))
+        return chosen.astype(float)
+
+    @staticmethod
+    def positions(problem: NRPProblem) -> Dict[int, int]:
+        """positions [summary] position of each variable in solutions,
+        variable ids are not always 0 .. n-1 (e.g. bireq form)
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+
+        Returns:
+            Dict[int, int]: [description] variable id -> position
+        """
+        return {var: pos for pos, var in enumerate(problem.variables)}
+
+    @staticmethod
+    def make_solution(problem: NRPProblem,
+                      values: numpy.ndarray) -> PackedSolution:
+        """make_solution [summary] make a packed solution from 0/1 values,
+        see binary_values for the order
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+            values (numpy.ndarray): [description] 0/1 values
+
+        Returns:
+            PackedSolution: [description] solution with objectives
+        """
+        # non-compact values are in the order of problem.variables already
+        if not problem.is_compact():
+            chosen = values > 0.5
+            return PackedSolution.pack(
+                chosen, BaseSolver.evaluate(problem, chosen))
+        # variables in the order of problem.variables
+        chosen = numpy.zeros(len(problem.variables), dtype=bool)
+        if problem.columns == problem.variables:
+            chosen[:] = values > 0.5
+        else:
+            positions = BaseSolver.positions(problem)
+            chosen[[positions[var] for var in problem.columns]] = \
+                values > 0.5
         # calculate objectives
-        solution.objectives = [0.0] * len(self.problem.objectives)
-        constant_id = len(self.problem.variables)
-        for index, objective in enumerate(self.problem.objectives):
+        objectives = problem.objective_matrix.dot(values).tolist()
+        return PackedSolution.pack(chosen, objectives)
+
+    @staticmethod
+    def evaluate(problem: NRPProblem, chosen: Any) -> List[float]:
+        """evaluate [summary] objectives of chosen variables
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+            chosen (Any): [description] bools, in the order of
+            problem.variables
+
+        Returns:
+            List[float]: [description] objectives
+        """
+        positions = BaseSolver.positions(problem)
+        objectives = [0.0] * len(problem.objectives)
+        # the constant, if not a variable, see NRPProblem.compact
+        constant_id = len(problem.variables)
+        if constant_id in positions:
+            constant_id = -1
+        for index, objective in enumerate(problem.objectives):
             if constant_id in objective:
                 rhs = float(objective[constant_id])
             else:
                 rhs = 0.0
             for var in objective:
-                if solution.variables[var]:
+                if var != constant_id and chosen[positions[var]]:
                     rhs += objective[var]
-            solution.objectives[index] = rhs
-        return solution
+            objectives[index] = rhs
+        return objectives
+
+    def jmetal_solution(self, cplex_soltuion: SolutionInterface
+                        ) -> Union[PackedSolution, None]:
+        # get status, variables from cplex_solution
+        status = cplex_soltuion.get_status_string()
+        if 'optimal' not in status:
+            return None
+        values = BaseSolver.binary_values(self.problem, cplex_soltuion)
+        return BaseSolver.make_solution(self.problem, values)
 
     def fake_jmetal_solution(self, vars_list):
-        solution = BinarySolution(
-            len(self.problem.variables),
-            len(self.problem.objectives),
-            len(self.problem.inequations)
-        )
-        solution.variables = vars_list
-        # calculate objectives
-        solution.objectives = [0.0] * len(self.problem.objectives)
-        constant_id = len(self.problem.variables)
-        for index, objective in enumerate(self.problem.objectives):
-            if constant_id in objective:
-                rhs = float(objective[constant_id])
-            else:
-                rhs = 0.0
-            for var in objective:
-                if var >= len(solution.variables):
-                    print(objective)
-                    print(var)
-                    input()
-                if solution.variables[var]:
-                    rhs += objective[var]
-            solution.objectives[index] = rhs
-        return solution
+        return PackedSolution.pack(
+            vars_list, BaseSolver.evaluate(self.problem, vars_list))
 
     @staticmethod
-    def objectives_str(solution: BinarySolution) -> str:
+    def objectives_str(solution: PackedSolution) -> str:
         obj_str = str(round(solution.objectives[0], 2))
         for i in range(1, len(solution.objectives)):
             obj_str += '_'
             obj_str += str(round(solution.objectives[i], 2))
         return obj_str
 
-    def solve(self) -> Dict[str, BinarySolution]:
+    def vectorize(self, coefficients: Dict[int, Any]) -> numpy.ndarray:
+        """vectorize [summary] convert objective/constraint map into
+        coefficients vector in solver column order, constant ignored
+
+        Args:
+            coefficients (Dict[int, Any]): [description] map of variables
+
+        Returns:
+            numpy.ndarray: [description] coefficients vector
+        """
+        vector = numpy.zeros(len(self.column_index))
+        for key, value in coefficients.items():
+            if key in self.column_index:
+                vector[self.column_index[key]] = value
+        return vector
+
+    def record_start(self, values: numpy.ndarray,
+                     objectives: List[float]) -> None:
+        """record_start [summary] record a found solution for mip starts,
+        it's kept as the last one, and as a candidate if not dominated by
+        other candidates
+
+        Args:
+            values (numpy.ndarray): [description] 0/1 values
+            objectives (List[float]): [description] its objectives
+        """
+        chosen = values > 0.5
+        if (self.last_found.shape == chosen.shape and
+                (self.last_found == chosen).all()):
+            return
+        self.last_found = chosen
+        point = numpy.array(objectives, dtype=float)
+        # dominated or the same as a candidate
+        kept = self.found_objectives
+        if (kept <= point).all(axis=1).any():
+            return
+        # drop candidates it dominates
+        alive = ~(point <= kept).all(axis=1)
+        self.found = numpy.vstack((self.found[alive], chosen))
+        self.found_objectives = numpy.vstack((kept[alive], point))
+
+    def add_mip_start(self) -> None:
+        """add_mip_start [summary] find the best one of the last found
+        solution and non-dominated ones, which is still feasible under
+        current rhs, and set it as the mip start
+        """
+        if len(self.last_found) == 0:
+            return
+        # found solutions satisfy problem constraints already,
+        # only check added constraints
+        found = numpy.vstack((self.last_found, self.found))
+        feasible = numpy.ones(len(found), dtype=bool)
+        for coefs, rhs in self.constraints.values():
+            feasible &= found.dot(coefs) <= rhs + 1e-6
+        candidates = numpy.flatnonzero(feasible)
+        if len(candidates) == 0:
+            return
+        scores = found[candidates].dot(self.objective_vector)
+        if self.minimize:
+            best = candidates[numpy.argmin(scores)]
+        else:
+            best = candidates[numpy.argmax(scores)]
+        # replace the old one
+        self.solver.MIP_starts.delete()
+        self.solver.MIP_starts.add(
+            [list(range(len(self.column_index))),
+             found[best].astype(float).tolist()],
+            self.solver.MIP_starts.effort_level.auto)
+
+    def solve(self) -> Dict[str, PackedSolution]:
         """solve [summary] solve the problem
         """
+        # warm start from solutions found so far
+        if self.mip_start:
+            self.add_mip_start()
         # solve
         # start = time()
         self.solver.solve()
         # end = time()
         # print('cplex time:', end - start)
         # get solution
-        solution = self.jmetal_solution(self.solver.solution)
+        solution = None
+        if 'optimal' in self.solver.solution.get_status_string():
+            values = BaseSolver.binary_values(self.problem,
+                                              self.solver.solution)
+            solution = BaseSolver.make_solution(self.problem, values)
+            if self.mip_start:
+                self.record_start(values, solution.objectives)
         if solution:
             # add into archive
             # self.archive.add(solution)
@@ -317,8 +508,7 @@ class BaseSolver:
         """
         # from solution list to archive
         if self.archive.size() == 0:
-            for solution in self.solution_list:
-                self.archive.add(solution)
+            self.archive.extend(self.solution_list)
         # convert objectives
         objectives = []
         for solution in self.archive.solution_list:
@@ -333,12 +523,6 @@ class BaseSolver:
         """
         # from solution list to archive
         if self.archive.size() == 0:
-            for solution in self.solution_list:
-                self.archive.add(solution)
-        variables = []
-        for solution in self.archive.solution_list:
-            vars_list: List[bool] = []
-            for var in range(len(solution.variables)):
-                vars_list.append(solution.variables[var])
-            variables.append(tuple(vars_list))
-        return variables
+            self.archive.extend(self.solution_list)
+        values = PackedSolution.unpack(self.archive.solution_list)
+        return [tuple(row) for row in values.tolist()]
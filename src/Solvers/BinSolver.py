@@ -1,7 +1,7 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # BinSolver.py, created: 2020.11.27
-# last modified: 2020.11.27
+# last modified: 2021.03.22
 #
 
 from typing import Dict, Any, List, Union, Tuple
@@ -9,15 +9,18 @@ from cplex import Cplex, SolutionInterface
 from math import ceil, floor
 from copy import deepcopy
 from decimal import Decimal
-from jmetal.util.archive import NonDominatedSolutionsArchive
-from jmetal.core.solution import BinarySolution
+from src.Archive import NonDominatedArchive
 from src.NRP import NRPProblem
+from src.Config import Config
+from src.PackedSolution import PackedSolution
 from src.Solvers.ABCSolver import ABCSolver
 from src.Solvers.BaseSolver import BaseSolver
+from src.Solvers.PayoffTable import PayoffTable
+from src.Solvers.ValueLattice import ValueLattice
 
 
 class BinProblem:
-    def __init__(self, problem: NRPProblem) -> None:
+    def __init__(self, problem: NRPProblem, persistent: bool = None) -> None:
         self.problem = problem
         # prepare variables
         vars_num = len(problem.variables)
@@ -27,8 +30,20 @@ class BinProblem:
         self.objective: Dict[int, Any] = {}
         # prepare inequations
         self.inequations = {}
-        for index, inequ in enumerate(problem.inequations):
-            self.inequations['c' + str(index)] = inequ
+        if problem.is_compact():
+            # variables in column order, constraints as rows
+            self.variables = ['x' + str(i) for i in problem.columns]
+            self.rows = problem.constraint_rows()
+        else:
+            for index, inequ in enumerate(problem.inequations):
+                self.inequations['c' + str(index)] = inequ
+        # persistent mode, build the model once and only update rhs
+        # of 'obj' and the objective for each solving
+        if persistent is None:
+            persistent = Config().persistent_model
+        self.persistent = persistent
+        self.solver: Union[Cplex, None] = None
+        self.objective_changed = True
 
     def set_objective(self, w: float = None):
         self.objective = deepcopy(self.problem.objectives[0])
@@ -38,13 +53,48 @@ class BinProblem:
                     self.objective[k] += w * v
                 else:
                     self.objective[k] = w * v
+        self.objective_changed = True
 
     def set_rhs(self, rhs):
         var_num = len(self.variables)
         self.inequations['obj'] = deepcopy(self.problem.objectives[1])
         self.inequations['obj'][var_num] = rhs
 
-    def solve(self):
+    @staticmethod
+    def add_inequation(solver: Cplex, name: str,
+                       inequation: Dict[int, Any]) -> None:
+        """add_inequation [summary] add one inequation into solver
+
+        Args:
+            solver (Cplex): [description] cplex solver
+            name (str): [description] constraint name
+            inequation (Dict[int, Any]): [description] inequation
+        """
+        vars_num = solver.variables.get_num()
+        rows = []
+        vari = []
+        coef = []
+        if vars_num in inequation:
+            rs = inequation[vars_num]
+        else:
+            rs = 0
+        for key in inequation:
+            if key != vars_num:
+                vari.append('x' + str(key))
+                coef.append(inequation[key])
+        rows.append([vari, coef])
+        solver.linear_constraints.add(lin_expr=rows,
+                                      senses='L',
+                                      rhs=[rs],
+                                      names=[name])
+
+    def build(self) -> Cplex:
+        """build [summary] make a cplex solver with variables,
+        and constraints except 'obj'
+
+        Returns:
+            Cplex: [description] cplex solver
+        """
         solver = Cplex()
         solver.set_results_stream(None)
         solver.set_warning_stream(None)
@@ -53,70 +103,83 @@ class BinProblem:
         solver.parameters.parallel.set(1)
         solver.variables.add(obj=None, lb=None, ub=None,
                              types=self.types, names=self.variables)
-        vars_num = len(self.variables)
+        if self.problem.is_compact():
+            rows_num = len(self.rows)
+            solver.linear_constraints.add(
+                lin_expr=self.rows,
+                senses='L' * rows_num,
+                rhs=self.problem.rhs.tolist(),
+                names=['c' + str(index) for index in range(rows_num)]
+            )
         for name, inequation in self.inequations.items():
-            rows = []
-            vari = []
-            coef = []
-            if vars_num in inequation:
-                rs = inequation[vars_num]
-            else:
-                rs = 0
-            for key in inequation:
-                if key != vars_num:
-                    vari.append('x' + str(key))
-                    coef.append(inequation[key])
-            rows.append([vari, coef])
-            solver.linear_constraints.add(lin_expr=rows,
-                                          senses='L',
-                                          rhs=[rs],
-                                          names=[name])
-        # set objective
-        pairs: List[Tuple[str, Any]] = \
-            [('x' + str(k), v) for k, v in self.objective.items()]
+            if name != 'obj':
+                self.add_inequation(solver, name, inequation)
+        return solver
+
+    def set_solver_objective(self, solver: Cplex) -> None:
+        """set_solver_objective [summary] set objective into solver,
+        variables not in objective are reset to 0
+
+        Args:
+            solver (Cplex): [description] cplex solver
+        """
+        coefs: Dict[str, Any] = {var: 0.0 for var in self.variables}
+        for k, v in self.objective.items():
+            coefs['x' + str(k)] = v
+        pairs: List[Tuple[str, Any]] = list(coefs.items())
         # set objective
         solver.objective.set_linear(pairs)
         # set sense
         solver.objective.set_sense(solver.objective.sense.minimize)
+
+    def solve(self):
+        if self.persistent:
+            return self.solve_persistent()
+        solver = self.build()
+        if 'obj' in self.inequations:
+            self.add_inequation(solver, 'obj', self.inequations['obj'])
+        # set objective
+        self.set_solver_objective(solver)
         # solve
         solver.solve()
         solution = self.jmetal_solution(solver.solution)
         del solver
         return solution
 
+    def solve_persistent(self):
+        """solve_persistent [summary] solve with the model built once,
+        only 'obj' rhs and the objective are updated
+        """
+        if self.solver is None:
+            self.solver = self.build()
+            self.add_inequation(self.solver, 'obj', self.inequations['obj'])
+        else:
+            rhs = self.inequations['obj'][len(self.variables)]
+            self.solver.linear_constraints.set_rhs('obj', rhs)
+        if self.objective_changed:
+            self.set_solver_objective(self.solver)
+            self.objective_changed = False
+        # solve
+        self.solver.solve()
+        return self.jmetal_solution(self.solver.solution)
+
     def jmetal_solution(self, cplex_soltuion: SolutionInterface
-                        ) -> Union[BinarySolution, None]:
-        # create a new binary solution
-        solution = BinarySolution(
-            len(self.problem.variables),
-            len(self.problem.objectives),
-            len(self.problem.inequations)
-        )
+                        ) -> Union[PackedSolution, None]:
         # get status, variables from cplex_solution
         status = cplex_soltuion.get_status_string()
         if 'optimal' not in status:
             return None
-        variables: Dict[int, Any] = {}
-        for var_id in self.problem.variables:
-            value = cplex_soltuion.get_values('x'+str(var_id))
-            variables[var_id] = BaseSolver.bool_float(value)
-        # check
-        assert len(variables) == len(self.problem.variables)
-        # set variables
-        solution.variables = variables
-        # calculate objectives
-        solution.objectives = [0.0] * len(self.problem.objectives)
-        constant_id = len(self.problem.variables)
-        for index, objective in enumerate(self.problem.objectives):
-            if constant_id in objective:
-                rhs = float(objective[constant_id])
-            else:
-                rhs = 0.0
-            for var in objective:
-                if solution.variables[var]:
-                    rhs += objective[var]
-            solution.objectives[index] = rhs
+        values = BaseSolver.binary_values(self.problem, cplex_soltuion)
+        solution = BaseSolver.make_solution(self.problem, values)
         # check constraints
+        if self.problem.is_compact():
+            slack = self.problem.rhs - \
+                self.problem.constraint_matrix.dot(values)
+            if (slack < -1e-6).any():
+                print(slack.min(), solution.objectives)
+            assert (slack >= -1e-6).all()
+            return solution
+        variables = solution.values()
         for cst in self.problem.inequations:
             cst_val = 0
             for var, coef in cst.items():
@@ -136,10 +199,11 @@ class EConstraint(ABCSolver):
         # store the problem
         self.problem = BinProblem(problem)
         # Non-Dominated Solutions Archive
-        self.archive: NonDominatedSolutionsArchive = \
-            NonDominatedSolutionsArchive()
+        self.archive: NonDominatedArchive = NonDominatedArchive()
         # solution tmp list
-        self.solution_list: List[BinarySolution] = []
+        self.solution_list: List[PackedSolution] = []
+        # attainable values of the second objective, see prepare
+        self.lattice: Union[ValueLattice, None] = None
 
     @staticmethod
     def to_int(f: float) -> int:
@@ -161,30 +225,60 @@ class EConstraint(ABCSolver):
                 lb = lb + value
         return lb, ub
 
+    def objective_bounds(self) -> Tuple[Any, Any]:
+        """objective_bounds [summary] range of the second objective,
+        from payoff table if configured, coefficient sums otherwise
+
+        Returns:
+            Tuple[Any, Any]: [description] lower bound, upper bound
+        """
+        if Config().payoff_table:
+            return PayoffTable.of(self.problem.problem).bounds(1)
+        return self.calculte_boundary(self.problem.problem.objectives[1])
+
+    def floor_rhs(self, rhs: Any) -> Union[int, None]:
+        """floor_rhs [summary] max attainable value of the second
+        objective not greater than rhs, see ValueLattice
+
+        Args:
+            rhs (Any): [description] rhs
+
+        Returns:
+            Union[int, None]: [description] next rhs, None if nothing
+            is attainable
+        """
+        if self.lattice:
+            return self.lattice.floor(rhs)
+        return rhs
+
     def prepare(self):
-        pass
+        # attainable values of the second objective
+        if Config().value_lattice:
+            self.lattice = \
+                ValueLattice.build(self.problem.problem.objectives[1])
 
     def execute(self):
         # main loop
-        low, up = self.calculte_boundary(self.problem.problem.objectives[1])
+        low, up = self.objective_bounds()
         low = floor(low)
         up = ceil(up)
         # set objective
         self.problem.set_objective()
-        for rhs in range(up, low - 1, -1):
+        rhs = self.floor_rhs(up)
+        while rhs is not None and rhs >= low:
             # set rhs
             self.problem.set_rhs(rhs)
             solution = self.problem.solve()
             if not solution:
                 break
             self.solution_list.append(solution)
-        # end for
+            rhs = self.floor_rhs(rhs - 1)
+        # end while
 
     def solutions(self) -> List[Tuple[float, ...]]:
         # from solution list to archive
         if self.archive.size() == 0:
-            for solution in self.solution_list:
-                self.archive.add(solution)
+            self.archive.extend(self.solution_list)
         # convert objectives
         objectives = []
         for solution in self.archive.solution_list:
@@ -194,33 +288,27 @@ class EConstraint(ABCSolver):
     def variables(self) -> List[Tuple[bool, ...]]:
         # from solution list to archive
         if self.archive.size() == 0:
-            for solution in self.solution_list:
-                self.archive.add(solution)
-        variables = []
-        for solution in self.archive.solution_list:
-            vars_list: List[bool] = []
-            for var in range(len(solution.variables)):
-                vars_list.append(solution.variables[var])
-            variables.append(tuple(vars_list))
-        return variables
+            self.archive.extend(self.solution_list)
+        values = PackedSolution.unpack(self.archive.solution_list)
+        return [tuple(row) for row in values.tolist()]
 
 
 class CWMOIP(EConstraint):
     def execute(self):
         # main loop
-        low, up = self.calculte_boundary(self.problem.problem.objectives[1])
+        low, up = self.objective_bounds()
         low = floor(low)
         up = ceil(up)
         # set objective
         w = float(Decimal(1.0) / Decimal(up - low + 1))
         self.problem.set_objective(w)
-        rhs = up
-        while True:
+        rhs = self.floor_rhs(up)
+        while rhs is not None:
             # set rhs
             self.problem.set_rhs(rhs)
             solution = self.problem.solve()
             if not solution:
                 break
             self.solution_list.append(solution)
-            rhs = self.to_int(solution.objectives[1]) - 1
+            rhs = self.floor_rhs(self.to_int(solution.objectives[1]) - 1)
         # end for
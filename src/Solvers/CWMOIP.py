@@ -1,13 +1,15 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # CWMOIP.py, created: 2020.11.04
-# last modified: 2020.12.28
+# last modified: 2021.03.22
 #
 
 from decimal import Decimal
-from typing import List, Any, Tuple, Dict
-from jmetal.core.solution import BinarySolution
+from typing import List, Any, Tuple, Dict, Union
+from src.Config import Config
 from src.NRP import NRPProblem
+from src.PackedSolution import PackedSolution
+from src.Solvers.PayoffTable import PayoffTable
 from src.Solvers.BaseSolver import BaseSolver
 # from src.Solvers.LazyBaseSolver import LazyBaseSolver as BaseSolver
 from src.Solvers.ABCSolver import ABCSolver
@@ -31,6 +33,8 @@ class CWMOIP(ABCSolver):
         self.problem: NRPProblem = problem
         # solver
         self.solver: BaseSolver = BaseSolver(problem)
+        # payoff table, see prepare
+        self.payoff: Union[PayoffTable, None] = None
 
     def calculte_boundary(self, obj: Dict[int, Any]) -> Tuple[Any, Any]:
         """calculte_boundary [summary] calculate
@@ -54,12 +58,12 @@ class CWMOIP(ABCSolver):
         return low, up
 
     def next_rhs(self, objective_index: int,
-                 solutions: List[BinarySolution]) -> int:
+                 solutions: List[PackedSolution]) -> int:
         """next_rhs [summary] calculate max value on this objective
 
         Args:
             objective_index (int): [description] current objective
-            solutions (List[BinarySolution]): [description] solutions we found
+            solutions (List[PackedSolution]): [description] solutions we found
 
         Returns:
             int: [description] next rhs
@@ -69,7 +73,7 @@ class CWMOIP(ABCSolver):
 
     def recuse(self, only_objective: Dict[int, Any],
                w: Decimal, objectives: List[Dict[int, Any]],
-               level: int) -> Dict[str, BinarySolution]:
+               level: int) -> Dict[str, PackedSolution]:
         """recuse [summary] recusively execute
 
         Args:
@@ -79,7 +83,7 @@ class CWMOIP(ABCSolver):
             level (int): [description] current objective
 
         Returns:
-            List[BinarySolution]: [description] solutions found so far
+            List[PackedSolution]: [description] solutions found so far
         """
         if level == 0:
             # solve
@@ -87,9 +91,12 @@ class CWMOIP(ABCSolver):
             return self.solver.solve()
         else:
             # prepare all solutions set
-            all_solutions: Dict[str, BinarySolution] = {}
-            # solve boundaries
-            low_f, up_f = self.calculte_boundary(objectives[level])
+            all_solutions: Dict[str, PackedSolution] = {}
+            # solve boundaries, or take them from payoff table
+            if self.payoff:
+                low_f, up_f = self.payoff.bounds(level)
+            else:
+                low_f, up_f = self.calculte_boundary(objectives[level])
             if low_f is None or up_f is None:
                 return all_solutions
             low = BaseSolver.to_int(low_f)
@@ -120,7 +127,10 @@ class CWMOIP(ABCSolver):
             return all_solutions
 
     def prepare(self) -> None:
-        pass
+        """prepare [summary] get payoff table if configured
+        """
+        if Config().payoff_table:
+            self.payoff = PayoffTable.of(self.problem)
 
     def execute(self):
         """execute [summary] execute the algorithm
@@ -1,13 +1,16 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # EConstraint.py, created: 2020.11.02
-# last modified: 2020.11.29
+# last modified: 2021.03.22
 #
 
 import math
-from typing import Dict, List, Any, Tuple
-from jmetal.core.solution import BinarySolution
+from typing import Dict, List, Any, Tuple, Union
+from src.Config import Config
 from src.NRP import NRPProblem
+from src.PackedSolution import PackedSolution
+from src.Solvers.PayoffTable import PayoffTable
+from src.Solvers.ValueLattice import ValueLattice
 from src.Solvers.BaseSolver import BaseSolver
 # from src.Solvers.LazyBaseSolver import LazyBaseSolver as BaseSolver
 from src.Solvers.ABCSolver import ABCSolver
@@ -35,6 +38,16 @@ class EConstraint(ABCSolver):
         self.low: List[Any] = []
         self.up: List[Any] = []
 
+        # prune infeasible and repeated rhs in sweep
+        self.pruning: bool = Config().sweep_pruning
+        # current rhs of each objective constraint
+        self.rhs: List[int] = []
+        # level 1 rhs -> (rhs vector, solutions) solved last time
+        self.cache: Dict[int, Tuple[Tuple[int, ...],
+                                    Dict[str, PackedSolution]]] = {}
+        # attainable values of each objective, see prepare
+        self.lattices: List[Union[ValueLattice, None]] = []
+
     def calculte_boundary(self, obj: Dict[int, Any]) -> Tuple[Any, Any]:
         """calculte_boundary [summary] calculate
         the boundary of the objective
@@ -54,9 +67,89 @@ class EConstraint(ABCSolver):
                 lb = lb + value
         return lb, ub
 
+    def next_rhs(self, objective_index: int,
+                 solutions: List[PackedSolution]) -> int:
+        """next_rhs [summary] calculate max value on this objective
+
+        Args:
+            objective_index (int): [description] current objective
+            solutions (List[PackedSolution]): [description] solutions we found
+
+        Returns:
+            int: [description] next rhs
+        """
+        # the max integer below the found value, a non-integer one
+        # (e.g. 3.4) is not rounded down to skip an rhs (3)
+        return math.ceil(max([solution.objectives[objective_index]
+                              for solution in solutions]) - 1e-6) - 1
+
+    def floor_rhs(self, level: int, rhs: Any) -> Union[int, None]:
+        """floor_rhs [summary] max attainable value of an objective
+        not greater than rhs, rhs in between cannot change the answer
+
+        Args:
+            level (int): [description] objective
+            rhs (Any): [description] rhs
+
+        Returns:
+            Union[int, None]: [description] next rhs, None if nothing
+            is attainable
+        """
+        if self.lattices and self.lattices[level]:
+            return self.lattices[level].floor(rhs)
+        return rhs
+
+    def set_rhs(self, level: int, rhs: int) -> None:
+        """set_rhs [summary] set rhs of an objective constraint
+
+        Args:
+            level (int): [description] objective
+            rhs (int): [description] rhs
+        """
+        self.rhs[level] = rhs
+        self.solver.set_rhs('obj' + str(level), rhs)
+
+    def satisfied(self, rhs: Tuple[int, ...],
+                  solutions: Dict[str, PackedSolution]) -> bool:
+        """satisfied [summary] if solutions satisfy all the rhs
+
+        Args:
+            rhs (Tuple[int, ...]): [description] rhs from objective 1
+            solutions (Dict[str, PackedSolution]): [description] solutions
+
+        Returns:
+            bool: [description] True if all satisfy
+        """
+        for solution in solutions.values():
+            for value, bound in zip(solution.objectives[1:], rhs):
+                if value > bound + 1e-6:
+                    return False
+        return True
+
+    def solve(self) -> Dict[str, PackedSolution]:
+        """solve [summary] solve with current rhs, a previous result on
+        a relaxed rhs vector is reused if it satisfies current rhs, the
+        optimum (or infeasibility) stays the same on a smaller region
+
+        Returns:
+            Dict[str, PackedSolution]: [description] solutions found
+        """
+        rhs = tuple(self.rhs[1:])
+        if not self.pruning or len(rhs) == 0:
+            return self.solver.solve()
+        if rhs[0] in self.cache:
+            cached_rhs, solutions = self.cache[rhs[0]]
+            relaxed = all([c >= r for c, r in zip(cached_rhs, rhs)])
+            if relaxed and self.satisfied(rhs, solutions):
+                return solutions
+        solutions = self.solver.solve()
+        self.cache[rhs[0]] = (rhs, solutions)
+        return solutions
+
     def recuse(self, level: int,
-               low: List[Any], up: List[Any]) -> Dict[str, BinarySolution]:
-        """recuse [summary] recusively execute
+               low: List[Any], up: List[Any]) -> Dict[str, PackedSolution]:
+        """recuse [summary] recusively execute, with pruning, sweep stops
+        on infeasibility and jumps to the max value found minus one
 
         Args:
             level (int): [description] current objective
@@ -64,24 +157,34 @@ class EConstraint(ABCSolver):
             up (List[Any]): [description] upper bound of each objective
 
         Returns:
-            List[BinarySolution]: [description] solutions found so far
+            List[PackedSolution]: [description] solutions found so far
         """
         if level == 0:
             # solve
-            return self.solver.solve()
+            return self.solve()
         else:
             # prepare all solutions set
-            all_solutions: Dict[str, BinarySolution] = {}
+            all_solutions: Dict[str, PackedSolution] = {}
             # get the up and low bound
             relaxed_up = math.ceil(up[level])
             relaxed_low = math.floor(low[level])
-            constraint_name = 'obj' + str(level)
-            for rhs in range(relaxed_up, relaxed_low - 1, -1):
+            rhs = self.floor_rhs(level, relaxed_up)
+            while rhs is not None and rhs >= relaxed_low:
                 # update rhs
-                self.solver.set_rhs(constraint_name, rhs)
+                self.set_rhs(level, rhs)
                 solutions = self.recuse(level - 1, low, up)
                 all_solutions = {**all_solutions, **solutions}
-            # end for
+                if not self.pruning:
+                    rhs = self.floor_rhs(level, rhs - 1)
+                elif not solutions:
+                    # tighter rhs are infeasible as well
+                    break
+                else:
+                    # rhs down to the max value found give the same
+                    rhs = self.floor_rhs(level, min(
+                        rhs - 1,
+                        self.next_rhs(level, list(solutions.values()))))
+            # end while
             return all_solutions
 
     def prepare(self) -> None:
@@ -94,8 +197,19 @@ class EConstraint(ABCSolver):
         # calculate other boundraies
         self.low = [.0] * k
         self.up = [.0] * k
-        for i in range(1, k):
-            self.low[i], self.up[i] = self.calculte_boundary(objectives[i])
+        self.rhs = [0] * k
+        if Config().payoff_table:
+            table = PayoffTable.of(self.problem)
+            for i in range(1, k):
+                self.low[i], self.up[i] = table.bounds(i)
+        else:
+            for i in range(1, k):
+                self.low[i], self.up[i] = \
+                    self.calculte_boundary(objectives[i])
+        # attainable values, rhs steps over the others
+        if Config().value_lattice:
+            self.lattices = [None] + \
+                [ValueLattice.build(objectives[i]) for i in range(1, k)]
         # prepare the objective
         self.solver.set_objective(objectives[0], True)
         # prepare other objective's constraint
@@ -1,13 +1,13 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # ImprovedEC.py, created: 2020.12.10
-# last modified: 2020.12.10
+# last modified: 2021.03.22
 #
 
 from typing import Dict, Any, List
 import math
+from src.PackedSolution import PackedSolution
 from src.Solvers.EConstraint import EConstraint
-from jmetal.core.solution import BinarySolution
 
 
 class ImprovedEC(EConstraint):
@@ -17,22 +17,8 @@ class ImprovedEC(EConstraint):
     objective with EConstraint, in case of reducing the time as it's solved
     in practice.
     """
-    def next_rhs(self, objective_index: int,
-                 solutions: List[BinarySolution]) -> int:
-        """next_rhs [summary] calculate max value on this objective
-
-        Args:
-            objective_index (int): [description] current objective
-            solutions (List[BinarySolution]): [description] solutions we found
-
-        Returns:
-            int: [description] next rhs
-        """
-        return math.floor(max([solution.objectives[objective_index]
-                               for solution in solutions]) + 0.5) - 1
-
     def recuse(self, level: int,
-               low: List[Any], up: List[Any]) -> Dict[str, BinarySolution]:
+               low: List[Any], up: List[Any]) -> Dict[str, PackedSolution]:
         """recuse [summary] recusively execute
 
         Args:
@@ -41,24 +27,24 @@ class ImprovedEC(EConstraint):
             up (List[Any]): [description] upper bound of each objective
 
         Returns:
-            List[BinarySolution]: [description] solutions found so far
+            List[PackedSolution]: [description] solutions found so far
         """
         if level == 0:
             # solve
-            return self.solver.solve()
+            return self.solve()
         else:
             # prepare all solutions set
-            all_solutions: Dict[str, BinarySolution] = {}
+            all_solutions: Dict[str, PackedSolution] = {}
             # get the upper bound
-            rhs = math.ceil(up[level])
-            constraint_name = 'obj' + str(level)
-            while True:
+            rhs = self.floor_rhs(level, math.ceil(up[level]))
+            while rhs is not None:
                 # update rhs
-                self.solver.set_rhs(constraint_name, rhs)
+                self.set_rhs(level, rhs)
                 solutions = self.recuse(level - 1, low, up)
                 if not solutions:
                     break
-                rhs = self.next_rhs(level, list(solutions.values()))
+                rhs = self.floor_rhs(
+                    level, self.next_rhs(level, list(solutions.values())))
                 all_solutions = {**all_solutions, **solutions}
             # end for
             return all_solutions
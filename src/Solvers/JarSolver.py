@@ -1,17 +1,154 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # JarSolver.py, created: 2020.11.05
-# last modified: 2020.12.28
+# last modified: 2021.03.22
 #
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple, Union
+import os
 import json
-from os.path import join, abspath
+from os.path import join, abspath, isfile
 import subprocess
 from src.Config import Config
 
 
+class JarWorker:
+    # workers by command, reused across tasks of one process
+    workers: Dict[Tuple[str, ...], 'JarWorker'] = {}
+
+    def __init__(self, command: List[str], shared: bool = False) -> None:
+        """__init__ [summary] a long-lived solver process, see Worker.java,
+        it takes one json job per line from stdin and replies one json
+        line on stdout, its stderr is inherited
+
+        Args:
+            command (List[str]): [description] command to start it
+            shared (bool): [description] lent to forked task processes,
+            see lend, only the starting process closes it
+        """
+        self.command = command
+        self.shared = shared
+        # the process starting it, it owns the worker
+        self.pid = os.getpid()
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE,
+                                        universal_newlines=True)
+
+    @staticmethod
+    def of(command: List[str]) -> 'JarWorker':
+        """of [summary] get the running or lent worker of command,
+        or start one
+
+        Args:
+            command (List[str]): [description] command to start it
+
+        Returns:
+            JarWorker: [description] worker
+        """
+        key = tuple(command)
+        worker = JarWorker.workers.get(key)
+        if worker is None or not worker.alive():
+            worker = JarWorker(command)
+            JarWorker.workers[key] = worker
+        return worker
+
+    @staticmethod
+    def pool(command: List[str], size: int) -> List['JarWorker']:
+        """pool [summary] start shared workers for a batch of tasks,
+        each one is lent to one task process at a time
+
+        Args:
+            command (List[str]): [description] command to start them
+            size (int): [description] number of workers
+
+        Returns:
+            List[JarWorker]: [description] workers
+        """
+        return [JarWorker(command, True) for _ in range(size)]
+
+    @staticmethod
+    def lend(worker: Union['JarWorker', None]) -> None:
+        """lend [summary] make worker the one of its command for the next
+        forked task process, which must be the only one using it
+
+        Args:
+            worker (Union[JarWorker, None]): [description] shared worker,
+            None for no worker
+        """
+        JarWorker.workers = {}
+        if worker is not None:
+            JarWorker.workers[tuple(worker.command)] = worker
+
+    def owned(self) -> bool:
+        """owned [summary] if it's started by this process
+
+        Returns:
+            bool: [description] True if owned
+        """
+        return self.pid == os.getpid()
+
+    def alive(self) -> bool:
+        """alive [summary] if the worker can take jobs in this process,
+        a lent one is taken as alive, it's not a child to poll
+
+        Returns:
+            bool: [description] True if it can take jobs
+        """
+        if not self.owned():
+            return self.shared
+        return self.process.poll() is None
+
+    def request(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """request [summary] run a job and wait for its reply
+
+        Args:
+            job (Dict[str, Any]): [description] 'solver' and 'config'
+
+        Returns:
+            Dict[str, Any]: [description] reply, with 'status' 'ok'
+        """
+        try:
+            self.process.stdin.write(json.dumps(job) + '\n')
+            self.process.stdin.flush()
+            line = self.process.stdout.readline()
+        except BrokenPipeError:
+            line = ''
+        if not line:
+            raise RuntimeError('jar worker {} exited'
+                               .format(self.process.pid))
+        reply = json.loads(line)
+        if reply.get('status') != 'ok':
+            raise RuntimeError('jar worker failed: {}'
+                               .format(reply.get('message')))
+        return reply
+
+    def close(self) -> None:
+        """close [summary] end of stdin stops the worker, lent ones are
+        left to their owner
+        """
+        if self.owned() and self.process.poll() is None:
+            self.process.stdin.close()
+            self.process.wait()
+
+    @staticmethod
+    def shutdown() -> None:
+        """shutdown [summary] stop all workers started by this process
+        """
+        for worker in JarWorker.workers.values():
+            worker.close()
+        JarWorker.workers = {}
+
+
 class JarSolver:
+    # java options of all jar algorithms
+    java_options = \
+        '-Djava.library.path=/home/osinovsky/cplex/cplex/bin/x86-64_linux'
+    # jar of the long-lived worker, see JarWorker, built by
+    # mvn package in src/Solvers/MOEA/moea
+    worker_jar = 'src/Solvers/Worker.jar'
+    # if it's told that Worker.jar is missing
+    worker_missing_told = False
+
     def __init__(self, method: str,
                  method_option: Dict[str, Any]) -> None:
         """__init__ [summary] JarSolver is an interface for
@@ -26,11 +163,50 @@ class JarSolver:
         self.option = method_option
         # command line order
         # self.cmd = '{} -jar {} {}'
-        self.cmd = '{} -Djava.library.path=/home/osinovsky/cplex/cplex/bin/x86-64_linux -jar {} {}'
+        self.cmd = '{} ' + self.java_options + ' -jar {} {}'
+        # jar name of the algorithm, see prepare
+        self.solver_name = ''
+        # results of each iteration from the jar worker, see execute
+        self.results: List[Dict[str, Any]] = []
+
+    @staticmethod
+    def worker_command() -> List[str]:
+        """worker_command [summary] command of the jar worker, from config
+        or with Worker.jar, empty if the worker is not available
+
+        Returns:
+            List[str]: [description] command
+        """
+        config = Config()
+        if not config.jar_worker:
+            return []
+        if config.jar_worker_command:
+            return config.jar_worker_command
+        if not isfile(JarSolver.worker_jar):
+            if not JarSolver.worker_missing_told:
+                print('{} not found, jar algorithms run in new java processes,'
+                      ' build it by mvn package in src/Solvers/MOEA/moea'
+                      .format(JarSolver.worker_jar))
+                JarSolver.worker_missing_told = True
+            return []
+        return [config.java_exe, JarSolver.java_options,
+                '-cp', abspath(JarSolver.worker_jar), 'org.osinovsky.Worker']
 
     def prepare(self):
         """prepare [summary] prepare for running
         """
+        # prepare command
+        if 'xuan' in self.option:
+            # solver_name = 'NoSolver'
+            solver_name = '{}XuanSolver'.format(self.method.upper())
+        # if 'xuan_binary' in self.option and self.option['xuan_binary']:
+        #     solver_name = '{}BinarySolver'.format(self.method.upper())
+        else:
+            solver_name = '{}Solver'.format(self.method.upper())
+        self.solver_name = solver_name
+        # the option is sent to worker in-band
+        if self.worker_command():
+            return
         # find the problem path in problem
         dump_path = self.option['dump_path']
         problem_name = self.option['problem_name']
@@ -40,14 +216,6 @@ class JarSolver:
             json_object = json.dumps(self.option, indent=4)
             file_out.write(json_object)
             file_out.close()
-        # prepare command
-        if 'xuan' in self.option:
-            # solver_name = 'NoSolver'
-            solver_name = '{}XuanSolver'.format(self.method.upper())
-        # if 'xuan_binary' in self.option and self.option['xuan_binary']:
-        #     solver_name = '{}BinarySolver'.format(self.method.upper())
-        else:
-            solver_name = '{}Solver'.format(self.method.upper())
         jar_file = join('src/Solvers/', '{}.jar'.format(solver_name))
         config = Config()
         self.cmd = self.cmd.format(config.java_exe,
@@ -55,8 +223,20 @@ class JarSolver:
                                    abspath(config_file))
 
     def execute(self):
-        """execute [summary] run the jar algorithm
+        """execute [summary] run the jar algorithm, in the jar worker
+        if available, otherwise in a new java process which dumps results
+        by itself
         """
+        command = self.worker_command()
+        if command:
+            # results are replied in-band and dumped by Controller
+            option = dict(self.option)
+            option['in_band'] = True
+            worker = JarWorker.of(command)
+            reply = worker.request({'solver': self.solver_name,
+                                    'config': option})
+            self.results = reply['results']
+            return
         # call the algorithm
         print('exec> ' + self.cmd)
         subprocess.run(self.cmd, shell=True)
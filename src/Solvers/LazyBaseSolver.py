@@ -1,14 +1,14 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # LazyBaseSolver.py, created: 2020.11.26
-# last modified: 2020.11.26
+# last modified: 2021.03.22
 #
 
 from typing import Dict, Any, List, Union, Tuple
 from cplex import SolutionInterface
-from jmetal.util.archive import NonDominatedSolutionsArchive
-from jmetal.core.solution import BinarySolution
+from src.Archive import NonDominatedArchive
 from src.NRP import NRPProblem
+from src.PackedSolution import PackedSolution
 from src.Solvers.BaseSolver import BaseSolver
 
 
@@ -26,8 +26,7 @@ class LazyBaseSolver:
         # store the problem
         self.problem = problem
         # Non-Dominated Solutions Archive
-        self.archive: NonDominatedSolutionsArchive = \
-            NonDominatedSolutionsArchive()
+        self.archive: NonDominatedArchive = NonDominatedArchive()
         # constraints
         self.new_constraints: Dict[str, Dict[int, Any]] = {}
         # objective
@@ -36,7 +35,7 @@ class LazyBaseSolver:
         # rhs set list
         self.rhs_dict: Dict[str, Any] = {}
         # solution tmp list
-        self.solution_list: List[BinarySolution] = []
+        self.solution_list: List[PackedSolution] = []
 
     def add_constriants(self,
                         constraints: Dict[str, Dict[int, Any]]) -> None:
@@ -98,73 +97,27 @@ class LazyBaseSolver:
             assert False
 
     def jmetal_solution(self, cplex_soltuion: SolutionInterface
-                        ) -> Union[BinarySolution, None]:
-        # create a new binary solution
-        solution = BinarySolution(
-            len(self.problem.variables),
-            len(self.problem.objectives),
-            len(self.problem.inequations)
-        )
+                        ) -> Union[PackedSolution, None]:
         # get status, variables from cplex_solution
         status = cplex_soltuion.get_status_string()
         if 'optimal' not in status:
             return None
-        variables: Dict[int, Any] = {}
-        for var_id in self.problem.variables:
-            value = cplex_soltuion.get_values('x'+str(var_id))
-            variables[var_id] = BaseSolver.bool_float(value)
-        # check
-        assert len(variables) == len(self.problem.variables)
-        # set variables
-        solution.variables = variables
-        # calculate objectives
-        solution.objectives = [0.0] * len(self.problem.objectives)
-        constant_id = len(self.problem.variables)
-        for index, objective in enumerate(self.problem.objectives):
-            if constant_id in objective:
-                rhs = float(objective[constant_id])
-            else:
-                rhs = 0.0
-            for var in objective:
-                if solution.variables[var]:
-                    rhs += objective[var]
-            solution.objectives[index] = rhs
-        return solution
+        values = BaseSolver.binary_values(self.problem, cplex_soltuion)
+        return BaseSolver.make_solution(self.problem, values)
 
     def fake_jmetal_solution(self, vars_list):
-        solution = BinarySolution(
-            len(self.problem.variables),
-            len(self.problem.objectives),
-            len(self.problem.inequations)
-        )
-        solution.variables = vars_list
-        # calculate objectives
-        solution.objectives = [0.0] * len(self.problem.objectives)
-        constant_id = len(self.problem.variables)
-        for index, objective in enumerate(self.problem.objectives):
-            if constant_id in objective:
-                rhs = float(objective[constant_id])
-            else:
-                rhs = 0.0
-            for var in objective:
-                if var >= len(solution.variables):
-                    print(objective)
-                    print(var)
-                    input()
-                if solution.variables[var]:
-                    rhs += objective[var]
-            solution.objectives[index] = rhs
-        return solution
+        return PackedSolution.pack(
+            vars_list, BaseSolver.evaluate(self.problem, vars_list))
 
     @staticmethod
-    def objectives_str(solution: BinarySolution) -> str:
+    def objectives_str(solution: PackedSolution) -> str:
         obj_str = str(round(solution.objectives[0], 2))
         for i in range(1, len(solution.objectives)):
             obj_str += '_'
             obj_str += str(round(solution.objectives[i], 2))
         return obj_str
 
-    def solve(self) -> Dict[str, BinarySolution]:
+    def solve(self) -> Dict[str, PackedSolution]:
         """solve [summary] solve the problem
         """
         # solve
@@ -192,8 +145,7 @@ class LazyBaseSolver:
     def get_objectives(self) -> List[Tuple[float, ...]]:
         # from solution list to archive
         if self.archive.size() == 0:
-            for solution in self.solution_list:
-                self.archive.add(solution)
+            self.archive.extend(self.solution_list)
         # convert objectives
         objectives = []
         for solution in self.archive.solution_list:
@@ -203,12 +155,6 @@ class LazyBaseSolver:
     def get_variables(self) -> List[Tuple[bool, ...]]:
         # from solution list to archive
         if self.archive.size() == 0:
-            for solution in self.solution_list:
-                self.archive.add(solution)
-        variables = []
-        for solution in self.archive.solution_list:
-            vars_list: List[bool] = []
-            for var in range(len(solution.variables)):
-                vars_list.append(solution.variables[var])
-            variables.append(tuple(vars_list))
-        return variables
+            self.archive.extend(self.solution_list)
+        values = PackedSolution.unpack(self.archive.solution_list)
+        return [tuple(row) for row in values.tolist()]
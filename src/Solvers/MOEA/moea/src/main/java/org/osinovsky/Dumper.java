@@ -6,6 +6,7 @@ import org.uma.jmetal.util.binarySet.BinarySet;
 import com.fasterxml.jackson.databind.ObjectMapper;
 
 import java.io.File;
+import java.util.ArrayList;
 import java.util.List;
 import java.util.Map;
 import java.util.HashMap;
@@ -98,4 +99,25 @@ public class Dumper {
             e.printStackTrace();
         }
     }
+
+    // the same result as a map, returned in-band by Worker instead of files
+    public static Map<String, Object> result(List<BinarySolution> population, long computingTime) {
+        Map<String, Object> result = new HashMap<>();
+        result.put("elapsed time", computingTime/1000.0);
+        result.put("solutions found", population.size());
+        List<double[]> objectives = new ArrayList<>();
+        List<boolean[]> variables = new ArrayList<>();
+        for (BinarySolution solution : population) {
+            objectives.add(solution.getObjectives());
+            List<BinarySet> vars = solution.getVariables();
+            boolean[] values = new boolean[vars.size()];
+            for (int i = 0; i < vars.size(); ++ i) {
+                values[i] = vars.get(i).get(0);
+            }
+            variables.add(values);
+        }
+        result.put("solutions", objectives);
+        result.put("variables", variables);
+        return result;
+    }
 }
@@ -0,0 +1,69 @@
+package org.osinovsky;
+
+import com.fasterxml.jackson.databind.ObjectMapper;
+
+import java.io.BufferedReader;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+// long-lived solver process, so JVM startup, JIT warm-up and cplex
+// native libraries are paid once for a batch of tasks.
+// Protocol, one json object per line:
+//   stdin:  {"solver": "NSGAIISolver", "config": {...}}
+//   stdout: {"status": "ok", "elapsed": ms, "pid": pid, "results": [...]}
+//        or {"status": "error", "message": "...", "pid": pid}
+// With "in_band": true in config, results of each iteration are replied
+// (see Dumper.result), otherwise they are dumped into result_path by Dumper.
+// The worker exits on an empty line or end of stdin.
+public class Worker {
+    @SuppressWarnings("unchecked")
+    public static void main(String[] args) throws Exception {
+        ObjectMapper mapper = new ObjectMapper();
+        // keep stdout for replies, prints of solvers go to stderr
+        PrintStream replies = System.out;
+        System.setOut(System.err);
+        BufferedReader jobs = new BufferedReader(new InputStreamReader(System.in));
+        long pid = ProcessHandle.current().pid();
+        String line;
+        while ((line = jobs.readLine()) != null && !line.isEmpty()) {
+            Map<String, Object> reply = new HashMap<>();
+            reply.put("pid", pid);
+            try {
+                Map<String, Object> job = mapper.readValue(line, HashMap.class);
+                String solver = (String)job.get("solver");
+                Map<String, Object> config = (Map<String, Object>)job.get("config");
+                long startTime = System.nanoTime();
+                List<Map<String, Object>> results = run(solver, config);
+                long endTime = System.nanoTime();
+                reply.put("status", "ok");
+                reply.put("results", results);
+                reply.put("elapsed", (endTime - startTime) / 1000_000);
+            } catch (Exception e) {
+                e.printStackTrace();
+                reply.put("status", "error");
+                reply.put("message", e.toString());
+            }
+            replies.println(mapper.writeValueAsString(reply));
+            replies.flush();
+        }
+    }
+
+    // run one job, solver is the name of its jar
+    static List<Map<String, Object>> run(String solver, Map<String, Object> config) {
+        switch (solver) {
+            case "NSGAIISolver":
+                return CMONSGAII.run(config);
+            case "IBEASolver":
+                return CMOIBEA.run(config);
+            case "NSGAIIXuanSolver":
+                return XuanNSGAII.run(config);
+            case "IBEAXuanSolver":
+                return XuanIBEA.run(config);
+            default:
+                throw new IllegalArgumentException("unknown solver " + solver);
+        }
+    }
+}
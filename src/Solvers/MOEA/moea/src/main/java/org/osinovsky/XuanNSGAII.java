@@ -31,11 +31,17 @@ public class XuanNSGAII extends AbstractAlgorithmRunner {
         String configFile = args[0];
         // load the config file
         ConfigLoader configLoader = new ConfigLoader(configFile);
-        Map<String, Object> config = configLoader.getConfig();
+        run(configLoader.getConfig());
+    }
 
+    // run with a loaded config, also called by Worker for each job
+    public static List<Map<String, Object>> run(Map<String, Object> config) {
         // load each config entry
         int iterationTimes = (int)config.get("iteration");
         String resultPath = (String)config.get("result_path");
+        // return results to Worker in-band instead of dumping them
+        boolean inBand = Boolean.TRUE.equals(config.get("in_band"));
+        List<Map<String, Object>> results = new ArrayList<>();
         int populationSize = (int)config.get("population");
         int maxEvaluations = (int)config.get("max_evaluations");
         int patient = (int)config.get("patient");
@@ -140,7 +146,12 @@ public class XuanNSGAII extends AbstractAlgorithmRunner {
             System.out.println("solutions found: " + population.size());
 
             // dump result
-            new Dumper(resultPath, itr, population, computingTime);
+            if (inBand) {
+                results.add(Dumper.result(population, computingTime));
+            } else {
+                new Dumper(resultPath, itr, population, computingTime);
+            }
         }
+        return results;
     }
 }
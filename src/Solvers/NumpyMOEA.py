@@ -0,0 +1,513 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# NumpyMOEA.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+from time import perf_counter
+from typing import Dict, List, Any, Tuple, Set
+import numpy
+from scipy.sparse import csr_matrix
+from src.NRP import NRPProblem
+from src.Solvers.ABCSolver import ABCSolver
+
+
+class BinaryMOEA(ABCSolver):
+    # options, others given by Controller, unknown ones are rejected
+    options = ['population', 'max_evaluations', 'patient', 'tournament',
+               'crossover', 'mutation', 'time_limit', 'iteration', 'seed']
+
+    def __init__(self, problem: NRPProblem,
+                 option: Dict[str, Any] = None) -> None:
+        """__init__ [summary] in-process evolutionary algorithm for binary
+        nrp forms, the population is a bit matrix, one row for each
+        individual, objectives and constraints are evaluated as matrix
+        products for the whole population. Options are the same as those
+        of the jar algorithms, see JarSolver. Randomness is from
+        numpy.random, seeded for each iteration by Controller
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+            option (Dict[str, Any]): [description] 'population',
+            'max_evaluations', 'patient', 'tournament', 'crossover',
+            'mutation' and 'time_limit' (seconds of the whole run, there
+            is no cplex repair here)
+        """
+        if option is None:
+            option = {}
+        unknown = [key for key in option if key not in BinaryMOEA.options]
+        if unknown:
+            raise ValueError('unsupported options {}, should be in {}'
+                             .format(unknown, BinaryMOEA.options))
+        # store the problem
+        self.problem: NRPProblem = problem
+        # variables in the order of population columns
+        if problem.is_compact():
+            self.columns: List[int] = problem.columns
+        else:
+            self.columns = problem.variables
+        vars_num = len(self.columns)
+        # options
+        self.population_size: int = option.get('population', 100)
+        self.max_evaluations: int = option.get('max_evaluations', 25000)
+        # stop if feasible population stays for these generations, 0 off
+        self.patient: int = option.get('patient', 0)
+        self.tournament: int = option.get('tournament', 2)
+        self.crossover: float = option.get('crossover', 0.8)
+        self.mutation: float = \
+            option.get('mutation', 1.0 / max(1, vars_num))
+        # stop after time_limit seconds from the start of execute, if given
+        self.time_limit: float = option.get('time_limit')
+        self.start_time = 0.0
+        # objectives, coefficients of each column and constants
+        self.coefs = numpy.zeros((len(problem.objectives), vars_num))
+        self.constants = numpy.zeros(len(problem.objectives))
+        # constraints, lhs <= rhs
+        self.matrix = csr_matrix((0, vars_num))
+        self.rhs = numpy.zeros(0)
+        # dependencies as x_suf <= x_pre, in columns
+        self.pre = numpy.zeros(0, dtype=int)
+        self.suf = numpy.zeros(0, dtype=int)
+        # population, with objectives and constraint violations
+        self.population = numpy.zeros((0, vars_num), dtype=bool)
+        self.objective_values = numpy.zeros((0, len(problem.objectives)))
+        self.violations = numpy.zeros(0)
+        self.evaluations = 0
+        # feasible individuals of last generation, see stagnant
+        self.elders: Set[bytes] = set()
+        self.same_old = 0
+        # solutions found, objectives and values (by columns) in rows
+        self.front_objectives = numpy.zeros((0, len(problem.objectives)))
+        self.front_values = numpy.zeros((0, vars_num), dtype=bool)
+
+    def prepare(self) -> None:
+        """prepare [summary] collect objectives and constraints as
+        matrices, and find dependencies among constraints
+        """
+        problem = self.problem
+        if problem.is_compact():
+            self.coefs = problem.objective_matrix
+            self.matrix = problem.constraint_matrix
+            self.rhs = problem.rhs
+        else:
+            index = {var: col for col, var in enumerate(self.columns)}
+            constant_id = len(problem.variables)
+            for row, objective in enumerate(problem.objectives):
+                for key, value in objective.items():
+                    if key in index:
+                        self.coefs[row, index[key]] = value
+                    elif key == constant_id:
+                        self.constants[row] = value
+            # constraints from a compact copy, the problem is kept
+            constraints = NRPProblem()
+            constraints.variables = problem.variables
+            constraints.inequations = problem.inequations
+            constraints.compact()
+            self.matrix = constraints.constraint_matrix
+            self.rhs = constraints.rhs
+        # dependencies, rows as x_suf - x_pre <= 0
+        matrix = self.matrix
+        lengths = numpy.diff(matrix.indptr)
+        rows = numpy.flatnonzero((lengths == 2) & (self.rhs == 0))
+        if len(rows):
+            starts = matrix.indptr[rows]
+            pairs = numpy.stack((starts, starts + 1), axis=1)
+            data = matrix.data[pairs]
+            indices = matrix.indices[pairs]
+            dependency = (data.min(axis=1) == -1) & (data.max(axis=1) == 1)
+            suf_at = numpy.argmax(data, axis=1)
+            chosen = numpy.arange(len(rows))
+            self.suf = indices[chosen, suf_at][dependency]
+            self.pre = indices[chosen, 1 - suf_at][dependency]
+
+    def repair(self, values: numpy.ndarray) -> numpy.ndarray:
+        """repair [summary] drop requirements whose precursors are not
+        chosen, until all dependencies hold, as ConstrainedMONRP.repair
+        does, for the whole population at once
+
+        Args:
+            values (numpy.ndarray): [description] population, changed
+            in place
+
+        Returns:
+            numpy.ndarray: [description] repaired population
+        """
+        if not len(self.suf):
+            return values
+        while True:
+            broken = values[:, self.suf] & ~values[:, self.pre]
+            if not broken.any():
+                break
+            rows, pairs = numpy.nonzero(broken)
+            values[rows, self.suf[pairs]] = False
+        return values
+
+    def evaluate(self, values: numpy.ndarray
+                 ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """evaluate [summary] objectives and overall constraint
+        violations of a population
+
+        Args:
+            values (numpy.ndarray): [description] population
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: [description] objectives
+            in rows, and violations, 0 for feasible ones
+        """
+        self.evaluations += len(values)
+        floats = values.astype(float)
+        objectives = floats.dot(self.coefs.T) + self.constants
+        if self.matrix.shape[0] == 0:
+            return objectives, numpy.zeros(len(values))
+        lhs = numpy.asarray(self.matrix.dot(floats.T)).T
+        violations = numpy.maximum(lhs - self.rhs, 0.0).sum(axis=1)
+        violations[violations <= 1e-6] = 0.0
+        return objectives, violations
+
+    def random_population(self, size: int) -> numpy.ndarray:
+        """random_population [summary] random bits, repaired
+
+        Args:
+            size (int): [description] population size
+
+        Returns:
+            numpy.ndarray: [description] population
+        """
+        values = numpy.random.random_sample((size, len(self.columns))) < 0.5
+        return self.repair(values)
+
+    def variation(self, parents: numpy.ndarray) -> numpy.ndarray:
+        """variation [summary] single point crossover on pairs of parents,
+        then bit flip mutation and repair
+
+        Args:
+            parents (numpy.ndarray): [description] mating pool, pairs in
+            consecutive rows
+
+        Returns:
+            numpy.ndarray: [description] offspring
+        """
+        size, vars_num = parents.shape
+        first, second = parents[0::2], parents[1::2]
+        pairs = len(second)
+        # crossover point of each pair, vars_num for no crossover
+        points = numpy.full(pairs, vars_num)
+        crossed = numpy.random.random_sample(pairs) < self.crossover
+        if vars_num > 1:
+            points[crossed] = \
+                numpy.random.randint(1, vars_num, size=crossed.sum())
+        head = numpy.arange(vars_num)[None, :] < points[:, None]
+        offspring = numpy.empty_like(parents)
+        offspring[0:2 * pairs:2] = numpy.where(head, first[:pairs], second)
+        offspring[1:2 * pairs:2] = numpy.where(head, second, first[:pairs])
+        if size % 2:
+            offspring[-1] = parents[-1]
+        # bit flip mutation
+        offspring ^= numpy.random.random_sample(offspring.shape) < \
+            self.mutation
+        return self.repair(offspring)
+
+    @staticmethod
+    def tournament_select(position: numpy.ndarray, size: int,
+                          tournament: int) -> numpy.ndarray:
+        """tournament_select [summary] n-ary tournaments, the one with
+        the least position wins
+
+        Args:
+            position (numpy.ndarray): [description] position of each
+            individual in the order of preference
+            size (int): [description] number of winners
+            tournament (int): [description] tournament size
+
+        Returns:
+            numpy.ndarray: [description] indices of winners
+        """
+        candidates = numpy.random.randint(0, len(position),
+                                          size=(size, tournament))
+        best = numpy.argmin(position[candidates], axis=1)
+        return candidates[numpy.arange(size), best]
+
+    @staticmethod
+    def dominance(objectives: numpy.ndarray,
+                  violations: numpy.ndarray) -> numpy.ndarray:
+        """dominance [summary] constrained dominance, less violation wins,
+        and pareto dominance on equal violations, all minimized
+
+        Args:
+            objectives (numpy.ndarray): [description] objectives in rows
+            violations (numpy.ndarray): [description] violations
+
+        Returns:
+            numpy.ndarray: [description] matrix, [i, j] for i dominates j
+        """
+        left, right = objectives[:, None], objectives[None, :]
+        pareto = (left <= right).all(axis=2) & (left < right).any(axis=2)
+        less = violations[:, None] < violations[None, :]
+        equal = violations[:, None] == violations[None, :]
+        return less | (equal & pareto)
+
+    @staticmethod
+    def non_dominated_sort(dominance: numpy.ndarray) -> numpy.ndarray:
+        """non_dominated_sort [summary] fast non-dominated sorting, front
+        by front for all members of a front at once
+
+        Args:
+            dominance (numpy.ndarray): [description] see dominance
+
+        Returns:
+            numpy.ndarray: [description] rank of each, 0 for the first
+        """
+        num = len(dominance)
+        ranks = numpy.full(num, -1)
+        # dominated counts among the remaining
+        counts = dominance.sum(axis=0)
+        remaining = numpy.ones(num, dtype=bool)
+        rank = 0
+        while remaining.any():
+            front = remaining & (counts == 0)
+            ranks[front] = rank
+            remaining &= ~front
+            counts = counts - dominance[front].sum(axis=0)
+            rank += 1
+        return ranks
+
+    @staticmethod
+    def crowding_distance(objectives: numpy.ndarray,
+                          ranks: numpy.ndarray) -> numpy.ndarray:
+        """crowding_distance [summary] crowding distance within each front,
+        boundaries are infinite
+
+        Args:
+            objectives (numpy.ndarray): [description] objectives in rows
+            ranks (numpy.ndarray): [description] ranks
+
+        Returns:
+            numpy.ndarray: [description] crowding distance of each
+        """
+        distance = numpy.zeros(len(ranks))
+        for dim in range(objectives.shape[1]):
+            order = numpy.lexsort((objectives[:, dim], ranks))
+            sorted_ranks = ranks[order]
+            values = objectives[order, dim]
+            change = sorted_ranks[1:] != sorted_ranks[:-1]
+            first = numpy.concatenate(([True], change))
+            last = numpy.concatenate((change, [True]))
+            starts = numpy.flatnonzero(first)
+            spans = numpy.maximum.reduceat(values, starts) - \
+                numpy.minimum.reduceat(values, starts)
+            span = spans[numpy.cumsum(first) - 1]
+            gap = numpy.zeros(len(values))
+            gap[1:-1] = values[2:] - values[:-2]
+            part = numpy.where(span > 0, gap / numpy.where(span > 0, span, 1),
+                               0.0)
+            part[first | last] = numpy.inf
+            distance[order] += part
+        return distance
+
+    def stagnant(self) -> bool:
+        """stagnant [summary] count generations without new feasible
+        individuals, as IPNSGAII does
+
+        Returns:
+            bool: [description] True if patient is lost
+        """
+        if self.patient <= 0:
+            return False
+        feasible = self.population[self.violations == 0]
+        if len(feasible) == 0:
+            return False
+        keys = set([row.tobytes()
+                    for row in numpy.packbits(feasible, axis=1)])
+        if keys <= self.elders:
+            self.same_old += 1
+        else:
+            self.elders = keys
+            self.same_old = 0
+        return self.same_old >= self.patient
+
+    def stopped(self) -> bool:
+        """stopped [summary] stopping condition
+
+        Returns:
+            bool: [description] True if it should stop
+        """
+        if self.stagnant():
+            return True
+        if self.time_limit is not None and \
+                perf_counter() - self.start_time >= self.time_limit:
+            return True
+        return self.evaluations >= self.max_evaluations
+
+    def keep_front(self, values: numpy.ndarray, objectives: numpy.ndarray,
+                   violations: numpy.ndarray) -> None:
+        """keep_front [summary] keep distinct non-dominated feasible
+        individuals as solutions
+
+        Args:
+            values (numpy.ndarray): [description] population
+            objectives (numpy.ndarray): [description] objectives
+            violations (numpy.ndarray): [description] violations
+        """
+        feasible = violations == 0
+        values, objectives = values[feasible], objectives[feasible]
+        values, index = numpy.unique(values, axis=0, return_index=True)
+        objectives = objectives[index]
+        ranks = self.non_dominated_sort(
+            self.dominance(objectives, numpy.zeros(len(objectives))))
+        self.front_values = values[ranks == 0]
+        self.front_objectives = objectives[ranks == 0]
+
+    def solutions(self) -> List[Tuple[float, ...]]:
+        """solutions [summary] get solutions, see
+        BaseSolver.get_objectives
+
+        Returns:
+            List[Tuple[float, ...]]: [description] solutions
+        """
+        return [tuple(row) for row in self.front_objectives.tolist()]
+
+    def variables(self) -> List[Tuple[bool, ...]]:
+        """variables [summary] get variables, see
+        BaseSolver.get_variables
+
+        Returns:
+            List[Tuple[bool, ...]]: [description] variables, in the order
+            of variable index
+        """
+        order = numpy.argsort(self.columns, kind='stable')
+        return [tuple(row) for row in self.front_values[:, order].tolist()]
+
+
+class NSGAII(BinaryMOEA):
+    def execute(self) -> None:
+        """execute [summary] NSGA-II with constrained dominance
+
+        The method is mentioned in
+        A fast and elitist multiobjective genetic algorithm: NSGA-II,
+        K.Deb, A.Pratap, S.Agarwal, T.Meyarivan
+        https://doi.org/10.1109/4235.996017
+        """
+        self.start_time = perf_counter()
+        size = self.population_size
+        self.population = self.random_population(size)
+        self.objective_values, self.violations = \
+            self.evaluate(self.population)
+        ranks = self.non_dominated_sort(
+            self.dominance(self.objective_values, self.violations))
+        crowding = self.crowding_distance(self.objective_values, ranks)
+        while not self.stopped():
+            # mating by rank, then crowding distance
+            position = numpy.empty(size, dtype=int)
+            position[numpy.lexsort((-crowding, ranks))] = numpy.arange(size)
+            parents = self.population[
+                self.tournament_select(position, size, self.tournament)]
+            offspring = self.variation(parents)
+            objectives, violations = self.evaluate(offspring)
+            # environmental selection on the union
+            values = numpy.concatenate((self.population, offspring))
+            objectives = numpy.concatenate((self.objective_values,
+                                            objectives))
+            violations = numpy.concatenate((self.violations, violations))
+            ranks = self.non_dominated_sort(
+                self.dominance(objectives, violations))
+            crowding = self.crowding_distance(objectives, ranks)
+            kept = numpy.lexsort((-crowding, ranks))[:size]
+            self.population = values[kept]
+            self.objective_values = objectives[kept]
+            self.violations = violations[kept]
+            ranks, crowding = ranks[kept], crowding[kept]
+        # end while
+        self.keep_front(self.population, self.objective_values,
+                        self.violations)
+
+
+class IBEA(BinaryMOEA):
+    # scaling factor of fitness
+    kappa = 0.05
+
+    @staticmethod
+    def indicator_matrix(objectives: numpy.ndarray) -> numpy.ndarray:
+        """indicator_matrix [summary] additive epsilon indicator between
+        each pair, on normalized objectives
+
+        Args:
+            objectives (numpy.ndarray): [description] objectives in rows
+
+        Returns:
+            numpy.ndarray: [description] matrix, [i, j] = I(i, j)
+        """
+        low = objectives.min(axis=0)
+        span = objectives.max(axis=0) - low
+        span[span <= 0] = 1.0
+        normalized = (objectives - low) / span
+        return (normalized[:, None] - normalized[None, :]).max(axis=2)
+
+    def environmental_selection(self, objectives: numpy.ndarray,
+                                violations: numpy.ndarray,
+                                size: int
+                                ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """environmental_selection [summary] remove the worst one until
+        size ones left, the most violated first, and the least fitness
+        among them, fitness is updated after each removal
+
+        Args:
+            objectives (numpy.ndarray): [description] objectives in rows
+            violations (numpy.ndarray): [description] violations
+            size (int): [description] individuals to keep
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: [description] indices of
+            kept ones, and their fitness
+        """
+        indicator = self.indicator_matrix(objectives)
+        scale = max(numpy.abs(indicator).max(), 1e-12) * self.kappa
+        weights = numpy.exp(-indicator / scale)
+        numpy.fill_diagonal(weights, 0.0)
+        fitness = -weights.sum(axis=0)
+        alive = numpy.ones(len(objectives), dtype=bool)
+        for _ in range(len(objectives) - size):
+            worst_violation = violations[alive].max()
+            candidates = alive & (violations == worst_violation)
+            worst = numpy.flatnonzero(candidates)[
+                numpy.argmin(fitness[candidates])]
+            alive[worst] = False
+            fitness += weights[worst]
+        kept = numpy.flatnonzero(alive)
+        return kept, fitness[kept]
+
+    def execute(self) -> None:
+        """execute [summary] IBEA with the additive epsilon indicator
+
+        The method is mentioned in
+        Indicator-Based Selection in Multiobjective Search,
+        E.Zitzler, S.Kunzli
+        https://doi.org/10.1007/978-3-540-30217-9_84
+        """
+        self.start_time = perf_counter()
+        size = self.population_size
+        offspring = self.random_population(size)
+        objectives, violations = self.evaluate(offspring)
+        while True:
+            # archive of the union, as jmetal IBEA does
+            values = numpy.concatenate((self.population, offspring))
+            objectives = numpy.concatenate((self.objective_values,
+                                            objectives))
+            violations = numpy.concatenate((self.violations, violations))
+            kept, fitness = \
+                self.environmental_selection(objectives, violations, size)
+            self.population = values[kept]
+            self.objective_values = objectives[kept]
+            self.violations = violations[kept]
+            if self.stopped():
+                break
+            # mating by violation, then fitness
+            position = numpy.empty(len(kept), dtype=int)
+            position[numpy.lexsort((-fitness, self.violations))] = \
+                numpy.arange(len(kept))
+            parents = self.population[
+                self.tournament_select(position, size, self.tournament)]
+            offspring = self.variation(parents)
+            objectives, violations = self.evaluate(offspring)
+        # end while
+        self.keep_front(self.population, self.objective_values,
+                        self.violations)
@@ -0,0 +1,125 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ParallelEConstraint.py, created: 2021.03.19
+# last modified: 2021.03.22
+#
+
+import math
+from multiprocessing import Pool, cpu_count
+from typing import Dict, List, Any
+from src.Config import Config
+from src.NRP import NRPProblem
+from src.PackedSolution import PackedSolution
+from src.Solvers.EConstraint import EConstraint
+
+# the solver in each worker process, built once by init_worker
+worker_solver: EConstraint
+
+
+def init_worker(problem: NRPProblem, mip_start: bool) -> None:
+    """init_worker [summary] build a persistent EConstraint in worker
+
+    Args:
+        problem (NRPProblem): [description] nrp (p)roblem
+        mip_start (bool): [description] if warm start solving
+    """
+    global worker_solver
+    worker_solver = EConstraint(problem)
+    worker_solver.solver.mip_start = mip_start
+    worker_solver.prepare()
+
+
+def solve_chunk(rhs_list: List[int]) -> List[PackedSolution]:
+    """solve_chunk [summary] solve a chunk of rhs on the outermost objective
+
+    Args:
+        rhs_list (List[int]): [description] rhs, from up to low
+
+    Returns:
+        List[PackedSolution]: [description] solutions found
+    """
+    level = len(worker_solver.problem.objectives) - 1
+    all_solutions: Dict[str, PackedSolution] = {}
+    next_rhs = rhs_list[0]
+    for rhs in rhs_list:
+        # skip rhs giving the same solutions
+        if rhs > next_rhs:
+            continue
+        worker_solver.set_rhs(level, rhs)
+        solutions = worker_solver.recuse(level - 1, worker_solver.low,
+                                         worker_solver.up)
+        all_solutions = {**all_solutions, **solutions}
+        if not worker_solver.pruning:
+            next_rhs = rhs - 1
+        elif not solutions:
+            # tighter rhs are infeasible as well
+            break
+        else:
+            next_rhs = min(rhs - 1, worker_solver.next_rhs(
+                level, list(solutions.values())))
+    return list(all_solutions.values())
+
+
+class ParallelEConstraint(EConstraint):
+    # time.clock misses cpu time of pool workers, see Controller
+    wall_clock = True
+
+    def __init__(self, problem: NRPProblem,
+                 option: Dict[str, Any] = None) -> None:
+        """__init__ [summary] epsilon-constraint with rhs of the outermost
+        objective split into chunks, and chunks solved in a process pool,
+        each worker keeps its own solver
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+            option (Dict[str, Any]): [description] 'workers' and 'chunks'
+        """
+        EConstraint.__init__(self, problem)
+        if option is None:
+            option = {}
+        config = Config()
+        # each cplex uses config.threads threads
+        default_workers = max(1, cpu_count() // max(1, config.threads))
+        self.workers: int = option.get('workers', default_workers)
+        # chunks for each worker, more chunks balance better
+        self.chunks: int = option.get('chunks', 4)
+
+    def split(self, rhs_list: List[int]) -> List[List[int]]:
+        """split [summary] split rhs into contiguous chunks, so that
+        neighbour rhs are solved by the same solver
+
+        Args:
+            rhs_list (List[int]): [description] rhs
+
+        Returns:
+            List[List[int]]: [description] chunks
+        """
+        chunks_num = min(len(rhs_list), self.workers * self.chunks)
+        size = math.ceil(len(rhs_list) / max(1, chunks_num))
+        return [rhs_list[i:i + size] for i in range(0, len(rhs_list), size)]
+
+    def execute(self) -> None:
+        """execute [summary] execute the algorithm
+        """
+        k = len(self.problem.objectives)
+        if k == 1 or self.workers <= 1:
+            EConstraint.execute(self)
+            return
+        # rhs of the outermost objective
+        relaxed_up = math.ceil(self.up[k - 1])
+        relaxed_low = math.floor(self.low[k - 1])
+        rhs_list: List[int] = []
+        rhs = self.floor_rhs(k - 1, relaxed_up)
+        while rhs is not None and rhs >= relaxed_low:
+            rhs_list.append(rhs)
+            rhs = self.floor_rhs(k - 1, rhs - 1)
+        if not rhs_list:
+            return
+        chunks = self.split(rhs_list)
+        # solve chunks, and merge them into solver
+        with Pool(min(self.workers, len(chunks)), initializer=init_worker,
+                  initargs=(self.problem, self.solver.mip_start)) as pool:
+            for solutions in pool.imap(solve_chunk, chunks):
+                self.solver.solution_list += solutions
+            pool.close()
+            pool.join()
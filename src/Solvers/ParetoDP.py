@@ -0,0 +1,139 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ParetoDP.py, created: 2021.03.20
+# last modified: 2021.03.20
+#
+
+from typing import Dict, List, Any, Tuple
+import numpy
+from src.NRP import NRPProblem
+from src.Solvers.ABCSolver import ABCSolver
+
+
+class ParetoDP(ABCSolver):
+    def __init__(self, problem: NRPProblem,
+                 option: Dict[str, Any] = None) -> None:
+        """__init__ [summary] exact bi-objective solver for binary
+        problems without constraints (e.g. bireq form), no MIP calls
+
+        The method is the Nemhauser-Ullmann algorithm, mentioned in
+        Discrete dynamic programming and capital allocation,
+        G.L.Nemhauser, Z.Ullmann
+        https://doi.org/10.1287/mnsc.15.9.494
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+            option (Dict[str, Any]): [description] not used
+        """
+        assert len(problem.objectives) == 2
+        assert not problem.inequations
+        # store the problem
+        self.problem: NRPProblem = problem
+        # variables in the order of solution values, see binary_values
+        if problem.is_compact():
+            self.columns: List[int] = problem.columns
+        else:
+            self.columns = problem.variables
+        # coefficients of each column on each objective, and constants
+        self.coefs = numpy.zeros((2, len(self.columns)))
+        self.constants = numpy.zeros(2)
+        # solutions found, objectives and values (by columns) in rows
+        self.objective_values = numpy.zeros((0, 2))
+        self.values = numpy.zeros((0, len(self.columns)), dtype=bool)
+
+    def prepare(self) -> None:
+        """prepare [summary] collect objective coefficients
+        """
+        index = {var: col for col, var in enumerate(self.columns)}
+        constant_id = len(self.problem.variables)
+        for row, objective in enumerate(self.problem.objectives):
+            for key, value in objective.items():
+                if key in index:
+                    self.coefs[row, index[key]] = value
+                elif key == constant_id:
+                    self.constants[row] = value
+
+    @staticmethod
+    def add_item(states: numpy.ndarray,
+                 item: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """add_item [summary] merge states and states with item added,
+        keep the non-dominated ones, both objectives are minimized
+
+        Args:
+            states (numpy.ndarray): [description] non-dominated points,
+            one row for each
+            item (numpy.ndarray): [description] point of the item
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: [description] indices of
+            kept points in merged states, and the merged states
+        """
+        merged = numpy.concatenate((states, states + item))
+        # by first objective, then the second one, stable on ties
+        order = numpy.lexsort((merged[:, 1], merged[:, 0]))
+        second = merged[order, 1]
+        # keep strictly less on second objective than all before
+        best_before = numpy.minimum.accumulate(second)
+        keep = numpy.ones(len(order), dtype=bool)
+        keep[1:] = second[1:] < best_before[:-1]
+        return order[keep], merged
+
+    def execute(self) -> None:
+        """execute [summary] execute the algorithm
+        """
+        first, second = self.coefs
+        # default values, improving both -> selected, otherwise not
+        values = ((first <= 0) & (second <= 0) &
+                  ((first < 0) | (second < 0))).astype(float)
+        # trade-off items, flip those worsen the first objective, so that
+        # adding any item improves the first one and worsens the second
+        flip = (first > 0) & (second < 0)
+        trade = numpy.flatnonzero(((first < 0) & (second > 0)) | flip)
+        values[flip] = 1.0
+        signs = numpy.where(flip[trade], -1.0, 1.0)
+        items = self.coefs[:, trade].T * signs[:, None]
+        # items with better ratio first, keeps states small
+        order = numpy.argsort(items[:, 1] / -items[:, 0], kind='stable')
+        trade, items = trade[order], items[order]
+        # Nemhauser-Ullmann, states are non-dominated points
+        states = numpy.zeros((1, 2))
+        sizes: List[int] = []
+        parents: List[numpy.ndarray] = []
+        for item in items:
+            sizes.append(len(states))
+            kept, merged = ParetoDP.add_item(states, item)
+            states = merged[kept]
+            parents.append(kept)
+        # back track the chosen items of each state, in merged states
+        # the first half is without the item, the second half is with it
+        chosen = numpy.zeros((len(states), len(trade)), dtype=bool)
+        index = numpy.arange(len(states))
+        for step in range(len(parents) - 1, -1, -1):
+            merged_index = parents[step][index]
+            chosen[:, step] = merged_index >= sizes[step]
+            index = merged_index % sizes[step]
+        # make solutions
+        self.values = numpy.tile(values > 0.5, (len(states), 1))
+        self.values[:, trade] = numpy.logical_xor(chosen, flip[trade])
+        self.objective_values = \
+            self.values.dot(self.coefs.T) + self.constants
+
+    def solutions(self) -> List[Tuple[float, ...]]:
+        """solutions [summary] get solutions, see
+        BaseSolver.get_objectives
+
+        Returns:
+            List[Tuple[float, ...]]: [description] solutions
+        """
+        return [tuple(row) for row in self.objective_values.tolist()]
+
+    def variables(self) -> List[Tuple[bool, ...]]:
+        """variables [summary] get variables, see
+        BaseSolver.get_variables
+
+        Returns:
+            List[Tuple[bool, ...]]: [description] variables, in the order
+            of variable index
+        """
+        order = numpy.argsort(self.columns, kind='stable')
+        return [tuple(row) for row in self.values[:, order].tolist()]
@@ -0,0 +1,175 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# PayoffTable.py, created: 2021.03.20
+# last modified: 2021.03.20
+#
+
+import os
+import hashlib
+from os.path import join, isfile, isdir
+from typing import Dict, Tuple, Any
+import numpy
+from src.Config import Config
+from src.NRP import NRPProblem
+from src.ModelCache import ModelCache
+from src.Solvers.BaseSolver import BaseSolver
+
+
+class PayoffTable:
+    # tables computed in this process, digest -> table
+    tables: Dict[str, 'PayoffTable'] = {}
+
+    def __init__(self, problem: NRPProblem) -> None:
+        """__init__ [summary] payoff table of a problem, all objectives
+        are minimized. Row i is the anchor, lexicographic optimum with
+        objective i first and then the others in order
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+        """
+        self.problem = problem
+        k = len(problem.objectives)
+        # anchors, objectives values in rows
+        self.anchors = numpy.zeros((k, k))
+        # anchor solutions, values in the order of binary_values
+        self.optima = numpy.zeros((k, len(problem.variables)))
+        # ideal point, and nadir estimated from anchors
+        self.ideal = numpy.zeros(k)
+        self.nadir = numpy.zeros(k)
+        # max of each objective in feasible region
+        self.worst = numpy.zeros(k)
+
+    @staticmethod
+    def key(problem: NRPProblem) -> str:
+        """key [summary] content hash of the problem
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+
+        Returns:
+            str: [description] hex digest
+        """
+        sha = hashlib.sha256()
+        sha.update(numpy.array(problem.variables, dtype=numpy.int64))
+        for maps in [problem.objectives, problem.inequations]:
+            for array in ModelCache.flatten(maps):
+                sha.update(numpy.ascontiguousarray(array, dtype=float))
+        return sha.hexdigest()
+
+    @staticmethod
+    def file_name(digest: str) -> str:
+        """file_name [summary] table file, next to the model cache
+
+        Args:
+            digest (str): [description] key of the problem
+
+        Returns:
+            str: [description] *.npz file name
+        """
+        return join(Config().cache_path,
+                    'payoff-{}.npz'.format(digest[:24]))
+
+    def compute(self) -> None:
+        """compute [summary] solve anchors and worst values,
+        k * k + k MIPs for k objectives
+        """
+        objectives = self.problem.objectives
+        k = len(objectives)
+        solver = BaseSolver(self.problem)
+        solver.mip_start = False
+        for index in range(k):
+            # lexicographic, fix each optimum before next objective
+            order = [index] + [i for i in range(k) if i != index]
+            solution = None
+            for level, obj in enumerate(order):
+                solver.set_objective(objectives[obj], True)
+                solutions = solver.solve()
+                assert solutions
+                solution = list(solutions.values())[0]
+                if level < k - 1:
+                    solver.add_constriant('lex' + str(level), objectives[obj])
+                    solver.set_rhs('lex' + str(level),
+                                   solution.objectives[obj] + 1e-6)
+            self.anchors[index] = solution.objectives
+            self.optima[index] = \
+                BaseSolver.binary_values(self.problem, solver.solver.solution)
+            for level in range(k - 1):
+                solver.delete_constraint('lex' + str(level))
+        self.ideal = self.anchors.diagonal().copy()
+        self.nadir = self.anchors.max(axis=0)
+        # max of each objective
+        for index in range(k):
+            solver.set_objective(objectives[index], False)
+            solver.solve()
+            self.worst[index] = solver.get_objective_value()
+
+    def bounds(self, index: int) -> Tuple[Any, Any]:
+        """bounds [summary] range of an objective on pareto front, nadir
+        from anchors is exact for two objectives only, worst otherwise
+
+        Args:
+            index (int): [description] objective index
+
+        Returns:
+            Tuple[Any, Any]: [description] lower bound, upper bound
+        """
+        if len(self.problem.objectives) == 2:
+            return self.ideal[index], self.nadir[index]
+        return self.ideal[index], self.worst[index]
+
+    def save(self, file_name: str) -> None:
+        """save [summary] dump the table
+
+        Args:
+            file_name (str): [description] *.npz file name
+        """
+        cache_path = os.path.dirname(file_name)
+        if not isdir(cache_path):
+            os.makedirs(cache_path, exist_ok=True)
+        # write into a temp file first, other tasks may read it
+        tmp_file = '{}.{}.tmp'.format(file_name, os.getpid())
+        with open(tmp_file, 'wb') as fout:
+            numpy.savez(fout, anchors=self.anchors, optima=self.optima,
+                        ideal=self.ideal, nadir=self.nadir,
+                        worst=self.worst)
+            fout.close()
+        os.replace(tmp_file, file_name)
+
+    def load(self, file_name: str) -> None:
+        """load [summary] load the table
+
+        Args:
+            file_name (str): [description] *.npz file name
+        """
+        with numpy.load(file_name) as data:
+            self.anchors = data['anchors']
+            self.optima = data['optima']
+            self.ideal = data['ideal']
+            self.nadir = data['nadir']
+            self.worst = data['worst']
+
+    @staticmethod
+    def of(problem: NRPProblem) -> 'PayoffTable':
+        """of [summary] get the table of a problem, computed once,
+        and stored with the model cache if it's in use
+
+        Args:
+            problem (NRPProblem): [description] nrp (p)roblem
+
+        Returns:
+            PayoffTable: [description] payoff table
+        """
+        digest = PayoffTable.key(problem)
+        if digest in PayoffTable.tables:
+            return PayoffTable.tables[digest]
+        table = PayoffTable(problem)
+        config = Config()
+        file_name = PayoffTable.file_name(digest)
+        if config.use_model_cache and isfile(file_name):
+            table.load(file_name)
+        else:
+            table.compute()
+            if config.use_model_cache:
+                table.save(file_name)
+        PayoffTable.tables[digest] = table
+        return table
@@ -0,0 +1,79 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ValueLattice.py, created: 2021.03.21
+# last modified: 2021.03.22
+#
+
+import math
+from typing import Dict, Any, Union
+import numpy
+
+
+class ValueLattice:
+    # at most these many values, or no lattice is built,
+    # every pepsilon worker keeps its own 4 bytes per value
+    max_range = 1 << 20
+
+    def __init__(self, low: int, bits: int, size: int) -> None:
+        """__init__ [summary] attainable values of an integer objective,
+        low + subset sums of absolute coefficients, see build
+
+        Args:
+            low (int): [description] min value, sum of negative coefficients
+            bits (int): [description] bitset, bit i for value low + i
+            size (int): [description] max value - min value + 1
+        """
+        self.low = low
+        # previous[i], max attainable offset <= i, -1 for none
+        byte_num = (size + 7) // 8
+        flags = numpy.unpackbits(
+            numpy.frombuffer(bits.to_bytes(byte_num, 'little'),
+                             dtype=numpy.uint8), bitorder='little')[:size]
+        attainable = numpy.flatnonzero(flags).astype(numpy.int32)
+        self.previous = numpy.full(size, -1, dtype=numpy.int32)
+        self.previous[attainable] = attainable
+        numpy.maximum.accumulate(self.previous, out=self.previous)
+
+    @staticmethod
+    def build(objective: Dict[int, Any]) -> Union['ValueLattice', None]:
+        """build [summary] bitset subset-sum over objective coefficients,
+        variables fixed by presolve are not in objective any more
+
+        Args:
+            objective (Dict[int, Any]): [description] objective
+
+        Returns:
+            Union[ValueLattice, None]: [description] lattice, None if
+            coefficients are not integers or the range is too large
+        """
+        coefs = [v for v in objective.values() if v != 0]
+        if any([abs(v - round(v)) > 1e-9 for v in coefs]):
+            return None
+        coefs = [int(round(v)) for v in coefs]
+        size = sum([abs(v) for v in coefs]) + 1
+        if size > ValueLattice.max_range:
+            return None
+        # a negative coefficient counts when it's not chosen
+        bits = 1
+        for coef in coefs:
+            bits |= bits << abs(coef)
+        return ValueLattice(sum([v for v in coefs if v < 0]), bits, size)
+
+    def floor(self, value: Any) -> Union[int, None]:
+        """floor [summary] max attainable value not greater than value
+
+        Args:
+            value (Any): [description] value
+
+        Returns:
+            Union[int, None]: [description] attainable value,
+            None if value is less than all attainable values
+        """
+        offset = math.floor(value + 1e-6) - self.low
+        if offset < 0:
+            return None
+        offset = min(offset, len(self.previous) - 1)
+        previous = int(self.previous[offset])
+        if previous < 0:
+            return None
+        return self.low + previous
@@ -1,11 +1,19 @@
 from src.Solvers.ABCSolver import ABCSolver
+from src.Solvers.Augmecon import Augmecon
 from src.Solvers.BaseSolver import BaseSolver
 from src.Solvers.CWMOIP import CWMOIP
 from src.Solvers.EConstraint import EConstraint
 from src.Solvers.ImprovedEC import ImprovedEC
 from src.Solvers.NormalConstraint import NormalConstraint
+from src.Solvers.NumpyMOEA import BinaryMOEA, NSGAII, IBEA
+from src.Solvers.ParallelEConstraint import ParallelEConstraint
+from src.Solvers.ParetoDP import ParetoDP
+from src.Solvers.PayoffTable import PayoffTable
+from src.Solvers.ValueLattice import ValueLattice
 from src.Solvers.JarSolver import JarSolver
 
 
-__all__ = ['ABCSolver', 'ImprovedEC', 'BaseSolver', 'CWMOIP', 'EConstraint',
-           'NormalConstraint', 'JarSolver']
+__all__ = ['ABCSolver', 'Augmecon', 'ImprovedEC', 'BaseSolver', 'CWMOIP',
+           'EConstraint', 'NormalConstraint', 'ParallelEConstraint',
+           'ParetoDP', 'PayoffTable', 'ValueLattice', 'JarSolver',
+           'BinaryMOEA', 'NSGAII', 'IBEA']
@@ -1,13 +1,17 @@
 from src.Analyzer import Analyzer
+from src.Archive import NonDominatedArchive
 from src.Config import Config
 from src.Controller import Controller
 from src.Indicator import Indicator
+from src.IndicatorCache import IndicatorCache
 from src.Loader import Loader
+from src.ModelCache import ModelCache
 from src.NRP import NextReleaseProblem
 from src.Result import Result
 from src.Solver import Solver
 from src import Solvers
 
-__all__ = ['Analyzer', 'Config', 'Controller', 'Indicator'
-           'Loader', 'NextReleaseProblem', 'Result'
+__all__ = ['Analyzer', 'NonDominatedArchive', 'Config', 'Controller',
+           'Indicator', 'IndicatorCache',
+           'Loader', 'ModelCache', 'NextReleaseProblem', 'Result',
            'Solver', 'Solvers']
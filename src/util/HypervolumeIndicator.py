@@ -0,0 +1,113 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# HypervolumeIndicator.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+from bisect import bisect_left
+from typing import List, Any
+import numpy as np
+from jmetal.core.quality_indicator import QualityIndicator, HyperVolume
+
+
+class HypervolumeIndicator(QualityIndicator):
+    def __init__(self, reference_point: List[Any]) -> None:
+        """__init__ [summary] exact hypervolume, the same as jmetal
+        HyperVolume, with sweep algorithms for up to 3 objectives and
+        jmetal HyperVolume for more
+
+        Args:
+            reference_point (List[Any]): [description] reference point,
+            only points weakly dominating it are counted
+        """
+        super().__init__(is_minimization=False)
+        self.reference_point = reference_point
+
+    def compute(self, solutions: np.array) -> float:
+        reference_point = np.array(self.reference_point, dtype=float)
+        if len(reference_point) > 3:
+            return HyperVolume(self.reference_point).compute(solutions)
+        points = np.array(solutions, dtype=float) \
+            .reshape(-1, len(reference_point))
+        # relevant points, shifted so that the reference point is 0
+        points = points[(points <= reference_point).all(axis=1)] - \
+            reference_point
+        if len(points) == 0:
+            return 0.0
+        if points.shape[1] == 1:
+            return float(-points.min())
+        if points.shape[1] == 2:
+            return self.sweep_2d(points)
+        return self.sweep_3d(points)
+
+    @staticmethod
+    def sweep_2d(points: np.ndarray) -> float:
+        """sweep_2d [summary] area dominated by points, reference point
+        is 0 and all points are not greater than it
+
+        Args:
+            points (np.ndarray): [description] points in rows
+
+        Returns:
+            float: [description] area
+        """
+        order = np.lexsort((points[:, 1], points[:, 0]))
+        x, y = points[order, 0], points[order, 1]
+        # the front, strictly less on y than all before
+        keep = np.ones(len(x), dtype=bool)
+        keep[1:] = y[1:] < np.minimum.accumulate(y)[:-1]
+        x, y = x[keep], y[keep]
+        widths = np.append(x[1:], 0.0) - x
+        return float(np.dot(widths, -y))
+
+    @staticmethod
+    def sweep_3d(points: np.ndarray) -> float:
+        """sweep_3d [summary] volume dominated by points, by sweeping on
+        the third objective and keeping the area of the 2d front so far,
+        reference point is 0 and all points are not greater than it
+
+        Args:
+            points (np.ndarray): [description] points in rows
+
+        Returns:
+            float: [description] volume
+        """
+        order = np.lexsort((points[:, 1], points[:, 0], points[:, 2]))
+        points = points[order].tolist()
+        # 2d front, x ascending and y descending, and its area
+        xs: List[float] = []
+        ys: List[float] = []
+        area = 0.0
+        volume = 0.0
+        for index, (x, y, z) in enumerate(points):
+            # ones with less x, and the first one with the same x or more,
+            # it's dominated if any of them is less or equal on y
+            start = bisect_left(xs, x)
+            left = start - 1
+            dominated = left >= 0 and ys[left] <= y
+            if start < len(xs) and xs[start] == x and ys[start] <= y:
+                dominated = True
+            if not dominated:
+                # dominated ones on the right are in a run
+                upper = ys[left] if left >= 0 else 0.0
+                end = start
+                while end < len(xs) and ys[end] >= y:
+                    end += 1
+                # exclusive area, slab by slab
+                right_x = xs[end] if end < len(xs) else 0.0
+                slab_x = x
+                for i in range(start, end):
+                    area += (xs[i] - slab_x) * (upper - y)
+                    upper, slab_x = ys[i], xs[i]
+                area += (right_x - slab_x) * (upper - y)
+                xs[start:end] = [x]
+                ys[start:end] = [y]
+            next_z = points[index + 1][2] if index + 1 < len(points) else 0.0
+            volume += area * (next_z - z)
+        return volume
+
+    def get_name(self) -> str:
+        return 'Hypervolume (HV)'
+
+    def get_short_name(self) -> str:
+        return 'HV'
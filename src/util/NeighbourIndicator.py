@@ -0,0 +1,66 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# NeighbourIndicator.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import numpy as np
+from scipy.spatial import cKDTree
+from jmetal.core.quality_indicator import QualityIndicator
+
+
+class NeighbourEvenness(QualityIndicator):
+    def __init__(self) -> None:
+        """__init__ [summary] evenness (spacing) with nearest neighbours
+        from a kd-tree, the same as EvennessIndicator in evenness_indicator
+
+        see the paper: Schott JR (1995) Fault tolerant design using single
+        and multicriteria genetic algorithm optimization. Master's thesis,
+        Massachusetts Institute of Technology
+        """
+        super().__init__(is_minimization=True)
+
+    def compute(self, solutions: np.array) -> float:
+        size = len(solutions)
+        if size <= 1:
+            return -1.0
+        points = np.asarray(solutions, dtype=float).reshape(size, -1)
+        # the nearest one except itself, the second of 2 nearest ones,
+        # duplicates of a point are at distance 0 either way
+        distances, _ = cKDTree(points).query(points, k=2)
+        neighbour = distances[:, 1]
+        deviation = neighbour - neighbour.mean()
+        return float(np.sqrt(np.dot(deviation, deviation) / (size - 1)))
+
+    def get_short_name(self) -> str:
+        return 'E'
+
+    def get_name(self) -> str:
+        return 'Evenness'
+
+
+class NeighbourIGD(QualityIndicator):
+    def __init__(self, reference_front: np.array) -> None:
+        """__init__ [summary] inverted generational distance with nearest
+        neighbours from a kd-tree, the same as jmetal
+        InvertedGenerationalDistance without the distance matrix
+
+        Args:
+            reference_front (np.array): [description] the pareto front
+        """
+        super().__init__(is_minimization=True)
+        self.reference_front = reference_front
+
+    def compute(self, solutions: np.array) -> float:
+        points = np.asarray(solutions, dtype=float)
+        reference_front = np.asarray(self.reference_front, dtype=float) \
+            .reshape(-1, points.shape[1])
+        # distance from each point of the front to the nearest solution
+        distances, _ = cKDTree(points).query(reference_front, k=1)
+        return float(np.mean(distances))
+
+    def get_short_name(self) -> str:
+        return 'IGD'
+
+    def get_name(self) -> str:
+        return 'Inverted Generational Distance'
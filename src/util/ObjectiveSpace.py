@@ -1,7 +1,7 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # ObjectiveSpace.py, created: 2020.12.24
-# last modified: 2021.01.28
+# last modified: 2021.03.20
 #
 
 from typing import List, Any, Dict, Tuple
@@ -36,15 +36,18 @@ class ObjectiveSpace3D:
             ['o' + str(o) for o in range(len(problem.objectives))]
         # convert objectives into vectors
         self.objectives: List[array] = []
-        for objective in problem.objectives:
-            obj: List[Any] = []
-            for var in problem.variables:
-                if var in objective:
-                    obj.append(objective[var])
-                else:
-                    obj.append(0.0)
-            self.objectives.append(array(obj))
-        # end for
+        if problem.is_compact():
+            self.objectives = list(problem.objective_matrix)
+        else:
+            for objective in problem.objectives:
+                obj: List[Any] = []
+                for var in problem.variables:
+                    if var in objective:
+                        obj.append(objective[var])
+                    else:
+                        obj.append(0.0)
+                self.objectives.append(array(obj))
+        # end if
         # prepare the solver
         self.solver = Cplex()
         # set solver with config
@@ -77,23 +80,33 @@ class ObjectiveSpace3D:
         #                                    names=names)
         # for Baan
         vars_num = len(self.binary_variables)
-        for index, inequation in enumerate(problem.inequations):
-            rows = []
-            vari = []
-            coef = []
-            if vars_num in inequation:
-                rs = inequation[vars_num]
-            else:
-                rs = 0
-            for key in inequation:
-                if key != vars_num:
-                    vari.append('x' + str(key))
-                    coef.append(inequation[key])
-            rows.append([vari, coef])
-            self.solver.linear_constraints.add(lin_expr=rows,
-                                               senses='L',
-                                               rhs=[rs],
-                                               names=['c' + str(index)])
+        if problem.is_compact():
+            # columns are sorted variables, the same as binary variables
+            rows_num = len(problem.rhs)
+            self.solver.linear_constraints.add(
+                lin_expr=problem.constraint_rows(),
+                senses='L' * rows_num,
+                rhs=problem.rhs.tolist(),
+                names=['c' + str(index) for index in range(rows_num)]
+            )
+        else:
+            for index, inequation in enumerate(problem.inequations):
+                rows = []
+                vari = []
+                coef = []
+                if vars_num in inequation:
+                    rs = inequation[vars_num]
+                else:
+                    rs = 0
+                for key in inequation:
+                    if key != vars_num:
+                        vari.append('x' + str(key))
+                        coef.append(inequation[key])
+                rows.append([vari, coef])
+                self.solver.linear_constraints.add(lin_expr=rows,
+                                                   senses='L',
+                                                   rhs=[rs],
+                                                   names=['c' + str(index)])
         # add objective as constraints
         pairs = []
         for ind, obj in enumerate(self.objectives):
@@ -105,8 +118,14 @@ class ObjectiveSpace3D:
                                            senses='E'*len(pairs),
                                            rhs=[0.0]*len(pairs),
                                            names=names)
-        # calculate anchors
+        # calculate anchors, or take them from payoff table
         self.anchors: List[array] = []
+        if config.payoff_table:
+            # imported here, src.Solvers imports this module
+            from src.Solvers.PayoffTable import PayoffTable
+            table = PayoffTable.of(problem)
+            self.anchors = [array(anchor) for anchor in table.anchors]
+            return
         for obj_name in self.object_variables:
             self.solver.objective.set_linear([(obj_name, 1)])
             self.solver.solve()
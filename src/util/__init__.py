@@ -4,8 +4,11 @@ from src.util.mooUtility import MOOUtility
 from src.util.ObjectiveSpace import ObjectiveSpace3D
 from src.util.ComprehensivenessIndicator import MeanIndicator, MedianIndicator
 from src.util.evenness_indicator import EvennessIndicator
+from src.util.HypervolumeIndicator import HypervolumeIndicator
+from src.util.NeighbourIndicator import NeighbourEvenness, NeighbourIGD
 
 
 __all__ = ['MOIPProblem', 'CplexSolResult', 'MOOUtility',
            'ObjectiveSpace3D',
-           'MeanIndicator', 'MedianIndicator', 'EvennessIndicator']
+           'MeanIndicator', 'MedianIndicator', 'EvennessIndicator',
+           'HypervolumeIndicator', 'NeighbourEvenness', 'NeighbourIGD']
@@ -6,13 +6,66 @@ Created on Wed Jun 20 00:48:48 2018
 """
 
 import math
+import numpy as np
 
 class MOOUtility():
+    #rows compared at once in the k-D filter, bounds the broadcast size
+    CullChunkSize = 1 << 22
+
+    @classmethod
+    def simple_cull(cls, inputPoints, dominates=None): #类方法
+        #returns the set of pareto points and the set of dominated points (a point
+        #repeated in input is also in dominated points), input is not modified
+        if dominates is not None and dominates is not cls.dominates:
+            return cls.loop_cull(list(inputPoints), dominates)
+        if len(inputPoints) == 0:
+            return set(), set()
+        points = np.array(inputPoints, dtype=float)
+        #distinct points in lexicographic order, only points before could dominate
+        uniquePoints, firstIndex, counts = np.unique(points, axis=0, return_index=True, return_counts=True)
+        dominatedMask = cls.dominated_mask(uniquePoints)
+        paretoPoints = set()
+        dominatedPoints = set()
+        for i in range(len(uniquePoints)):
+            row = tuple(inputPoints[firstIndex[i]])
+            if dominatedMask[i] or counts[i] > 1:
+                dominatedPoints.add(row)
+            if not dominatedMask[i]:
+                paretoPoints.add(row)
+        return paretoPoints, dominatedPoints
+
+    @classmethod
+    def dominated_mask(cls, uniquePoints):
+        #uniquePoints are distinct and sorted lexicographically,
+        #mask[i] is True if some other point is no worse on all objectives
+        num, dimension = uniquePoints.shape
+        mask = np.zeros(num, dtype=bool)
+        if num <= 1:
+            return mask
+        if dimension == 1:
+            mask[1:] = True
+            return mask
+        if dimension == 2:
+            #sort and sweep: dominated if not better than all before on the second objective
+            second = uniquePoints[:, 1]
+            mask[1:] = second[1:] >= np.minimum.accumulate(second)[:-1]
+            return mask
+        #chunked broadcast against all points before the chunk end, itself included
+        chunk = max(1, cls.CullChunkSize // (num * dimension))
+        for start in range(0, num, chunk):
+            stop = min(num, start + chunk)
+            noWorse = (uniquePoints[None, :stop, :] <= uniquePoints[start:stop, None, :]).all(axis=2)
+            mask[start:stop] = noWorse.sum(axis=1) > 1
+        return mask
+
     @classmethod
-    def simple_cull(cls, inputPoints, dominates): #类方法
+    def loop_cull(cls, inputPoints, dominates):
+        #the original filter, for a user defined dominates, it modifies inputPoints
         paretoPoints = set()
         candidateRowNr = 0
         dominatedPoints = set()
+        if len(inputPoints) == 0:
+            return paretoPoints, dominatedPoints
         while True:
             candidateRow = inputPoints[candidateRowNr]
             inputPoints.remove(candidateRow)
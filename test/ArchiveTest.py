@@ -0,0 +1,61 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ArchiveTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+from random import randint, seed
+from typing import List
+from jmetal.core.solution import FloatSolution
+from jmetal.util.archive import NonDominatedSolutionsArchive
+from src.Archive import NonDominatedArchive
+
+
+class ArchiveTest(unittest.TestCase):
+    @staticmethod
+    def random_solutions(objectives_num: int,
+                         solutions_num: int) -> List[FloatSolution]:
+        solutions = []
+        for _ in range(solutions_num):
+            solution = FloatSolution([], [], objectives_num)
+            solution.objectives = \
+                [randint(0, 6) for _ in range(objectives_num)]
+            solutions.append(solution)
+        return solutions
+
+    def test_add(self):
+        seed(4)
+        for _ in range(300):
+            solutions = self.random_solutions(randint(1, 4), randint(0, 60))
+            expected = NonDominatedSolutionsArchive()
+            archive = NonDominatedArchive()
+            for solution in solutions:
+                assert archive.add(solution) == expected.add(solution)
+            assert archive.size() == expected.size()
+            assert archive.solution_list == expected.solution_list
+
+    def test_extend(self):
+        seed(5)
+        for _ in range(300):
+            solutions = self.random_solutions(randint(1, 4), randint(0, 60))
+            expected = NonDominatedSolutionsArchive()
+            for solution in solutions:
+                expected.add(solution)
+            # bulk, one by one, then bulk again
+            archive = NonDominatedArchive()
+            cut = randint(0, len(solutions))
+            archive.extend(solutions[:cut])
+            for solution in solutions[cut:cut + 3]:
+                archive.add(solution)
+            archive.extend(solutions[cut + 3:])
+            assert archive.solution_list == expected.solution_list
+            # adapters
+            jmetal_archive = archive.to_jmetal()
+            assert jmetal_archive.solution_list == expected.solution_list
+            assert NonDominatedArchive.from_jmetal(expected).solution_list \
+                == expected.solution_list
+
+
+if __name__ == '__main__':
+    unittest.main()
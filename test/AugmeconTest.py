@@ -0,0 +1,59 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# AugmeconTest.py, created: 2021.03.20
+# last modified: 2021.03.20
+#
+
+import unittest
+from random import randint, seed
+from src.NRP import NRPProblem, NextReleaseProblem
+from src.Solvers.EConstraint import EConstraint
+from src.Solvers.Augmecon import Augmecon
+
+
+class AugmeconTest(unittest.TestCase):
+    @staticmethod
+    def random_problem(vars_num: int, objectives_num: int) -> NRPProblem:
+        nrp = NRPProblem()
+        nrp.variables = list(range(vars_num))
+        nrp.objectives = [{x: randint(-5, 5) for x in nrp.variables}
+                          for _ in range(objectives_num)]
+        for _ in range(vars_num // 2):
+            left, right = randint(0, vars_num - 1), randint(0, vars_num - 1)
+            if left != right:
+                nrp.inequations.append({left: 1, right: -1, vars_num: 0})
+        return nrp
+
+    def test_front(self):
+        seed(11)
+        for objectives_num in [2, 3, 3]:
+            nrp = self.random_problem(9, objectives_num)
+            econstraint = EConstraint(nrp)
+            econstraint.pruning = False
+            augmecon = Augmecon(nrp)
+            results = []
+            for solver in [econstraint, augmecon]:
+                solver.prepare()
+                solver.execute()
+                results.append(sorted(solver.solutions()))
+            assert results[0]
+            assert results[0] == results[1]
+            # no more solves than full grid
+            assert len(augmecon.solver.solution_list) <= \
+                len(econstraint.solver.solution_list)
+
+    def test_bincst(self):
+        nrp_problem = NextReleaseProblem('ReleasePlanner')
+        nrp_problem.premodel({})
+        nrp = nrp_problem.model('bincst', {'bound': 0.3})
+        results = []
+        for solver in [EConstraint(nrp), Augmecon(nrp)]:
+            solver.prepare()
+            solver.execute()
+            results.append(sorted(solver.solutions()))
+        assert results[0]
+        assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    unittest.main()
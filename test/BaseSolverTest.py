@@ -1,11 +1,18 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # BaseSolverTest.py, created: 2020.11.24
-# last modified: 2020.11.24
+# last modified: 2021.03.22
 #
 
 import unittest
-from random import randint
+from copy import deepcopy
+from itertools import product
+from random import randint, seed
+from unittest import mock
+import numpy
+from src.Config import Config
+from src.NRP import NRPProblem, NextReleaseProblem
+from src.Solver import Solver
 from src.Solvers.BaseSolver import BaseSolver
 
 
@@ -39,6 +46,78 @@ class BaseSolverTest(unittest.TestCase):
                     o2v = 0.0
                 assert o1v + o2v <= v + 1e-6 and o1v + o2v >= v - 1e-6
 
+    def test_make_solution(self):
+        for _ in range(20):
+            nrp = NRPProblem()
+            nrp.variables = list(range(100))
+            nrp.objectives = [self.random_objective(100, 50)
+                              for _ in range(3)]
+            compact = deepcopy(nrp)
+            compact.compact()
+            values = numpy.array([float(randint(0, 1)) for _ in range(100)])
+            s1 = BaseSolver.make_solution(nrp, values)
+            s2 = BaseSolver.make_solution(compact, values)
+            assert s1.key == s2.key
+            for o1, o2 in zip(s1.objectives, s2.objectives):
+                assert abs(o1 - o2) < 1e-6
+
+    def test_variable_ids(self):
+        # ids are not 0 .. n-1, as in bireq form, and len(variables)
+        # is a variable but not the constant
+        seed(3)
+        config_init = Config.__init__
+
+        def init(config):
+            config_init(config)
+            config.presolve = False
+        for index in range(6):
+            vars_num = randint(3, 8)
+            nrp = NRPProblem()
+            nrp.variables = list(range(2, vars_num + 2))
+            nrp.objectives = [{x: randint(-9, 0) for x in nrp.variables},
+                              {x: randint(1, 9) for x in nrp.variables}]
+            if index % 2:
+                nrp.compact()
+            front = set()
+            for values in product([0, 1], repeat=vars_num):
+                front.add(tuple([float(sum([c * v for c, v in zip(
+                    obj.values(), values)])) for obj in nrp.objectives]))
+            front = set([p for p in front if not any(
+                [q != p and q[0] <= p[0] and q[1] <= p[1] for q in front])])
+            with mock.patch.object(Config, '__init__', init):
+                solver = Solver('epsilon', {}, nrp)
+                solver.prepare()
+                solver.execute()
+            solutions = solver.solutions()
+            assert set(solutions) == front
+            # variables are in the order of nrp.variables
+            for objectives, values in zip(solutions, solver.variables()):
+                assert BaseSolver.evaluate(nrp, values) == list(objectives)
+
+    def test_mip_start(self):
+        nrp_problem = NextReleaseProblem('ReleasePlanner')
+        nrp_problem.premodel({})
+        nrp = nrp_problem.model('binary', {})
+        solver = BaseSolver(nrp)
+        solver.mip_start = True
+        solver.set_objective(nrp.objectives[0], True)
+        solver.add_constriant('obj1', nrp.objectives[1])
+        low, up = 0, int(sum(nrp.objectives[1].values()))
+        for rhs in range(up, low, -max(1, (up - low) // 10)):
+            solver.set_rhs('obj1', rhs)
+            solver.solve()
+        assert len(solver.last_found) > 0
+        # only non-dominated ones are kept as candidates
+        kept = solver.found_objectives
+        for point in kept:
+            assert not ((kept <= point).all(axis=1) &
+                        (kept < point).any(axis=1)).any()
+        assert solver.solver.MIP_starts.get_num() == 1
+        # the start satisfies current rhs
+        start, _ = solver.solver.MIP_starts.get_starts(0)
+        coefs, rhs = solver.constraints['obj1']
+        assert numpy.array(start.val).dot(coefs) <= rhs + 1e-6
+
 
 if __name__ == "__main__":
     unittest.main()
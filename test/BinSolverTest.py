@@ -0,0 +1,28 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# BinSolverTest.py, created: 2021.03.18
+# last modified: 2021.03.18
+#
+
+import unittest
+from src.NRP import NextReleaseProblem
+from src.Solvers.BinSolver import BinProblem, CWMOIP
+
+
+class BinSolverTest(unittest.TestCase):
+    def test_persistent(self):
+        nrp_problem = NextReleaseProblem('ReleasePlanner')
+        nrp_problem.premodel({})
+        nrp = nrp_problem.model('binary', {})
+        results = []
+        for persistent in [False, True]:
+            solver = CWMOIP(nrp)
+            solver.problem = BinProblem(nrp, persistent)
+            solver.execute()
+            results.append(sorted(solver.solutions()))
+        assert results[0]
+        assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    unittest.main()
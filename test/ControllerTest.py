@@ -1,13 +1,22 @@
 #
 # DONG Shi, dongshi@mail.ustc.edu.cn
 # ControllerTest.py, created: 2020.11.04
-# last modified: 2020.11.04
+# last modified: 2021.03.22
 #
 
 import unittest
+import sys
+import json
+import tempfile
+from os import listdir, makedirs
+from os.path import join, isfile, dirname, abspath
+from unittest import mock
+from multiprocessing import Process
 from string import ascii_letters, digits
 from random import choice, randint
+from src.Config import Config
 from src.Controller import Controller
+from src.Solvers.JarSolver import JarWorker
 
 
 class ControllerTest(unittest.TestCase):
@@ -48,6 +57,181 @@ class ControllerTest(unittest.TestCase):
             after = Controller.parse_method(method)
             assert raw == after
 
+    def test_run_workers(self):
+        with tempfile.TemporaryDirectory() as root:
+            makedirs(join(root, 'tasks'))
+            # dp does not accept constraints, so it fails
+            tasks = {'name': 'workers', 'dataset': 'ReleasePlanner',
+                     'modelling': {'name': 'binary'},
+                     'method': [{'name': 'epsilon'}, {'name': 'dp'}]}
+            with open(join(root, 'tasks', 'workers.json'), 'w') as fout:
+                json.dump(tasks, fout)
+            config_init = Config.__init__
+
+            def init(config):
+                config_init(config)
+                config.result_root_path = join(root, 'results')
+                config.task_path = join(root, 'tasks')
+            module = sys.modules[Controller.__module__]
+            with mock.patch.object(Config, '__init__', init), \
+                    mock.patch.object(module, 'cpu_count', lambda: 2):
+                assert Controller.workers_budget(8) == 2
+                failed = Controller.run('workers.json', workers=2)
+            assert [task.method[0] for task in failed] == ['dp']
+            # the other one is done, and each has its log
+            method_folder = join(root, 'results', 'workers',
+                                 'ReleasePlanner-binary', 'epsilon')
+            assert isfile(join(method_folder, 'i_0.json'))
+            logs = listdir(join(root, 'results', 'workers', '.logs'))
+            assert len(logs) == 2
+
+    def test_run_logged_shutdown(self):
+        with tempfile.TemporaryDirectory() as root:
+            for index, error in enumerate([None, RuntimeError]):
+                marker = join(root, 'shutdown' + str(index))
+
+                def shutdown():
+                    open(marker, 'w').close()
+                # run in a process, as Controller.run does
+                with mock.patch.object(Controller, 'run_task',
+                                       side_effect=error), \
+                        mock.patch.object(JarWorker, 'shutdown', shutdown):
+                    process = Process(
+                        target=Controller.run_logged,
+                        args=('task', join(root, '.logs', str(index))))
+                    process.start()
+                    process.join()
+                assert process.exitcode == (1 if error else 0)
+                # jar worker is stopped, failed or not
+                assert isfile(marker)
+
+    def test_jar_worker_pool(self):
+        stub = [sys.executable,
+                join(dirname(abspath(__file__)), 'JarWorkerStub.py')]
+        with tempfile.TemporaryDirectory() as root:
+            makedirs(join(root, 'tasks'))
+            tasks = {'name': 'jar', 'dataset': 'ReleasePlanner',
+                     'modelling': {'name': 'binary'},
+                     'method': [{'name': 'NSGAII', 'iteration': 2},
+                                {'name': 'IBEA'},
+                                {'name': 'NSGAII', 'population': 10}]}
+            with open(join(root, 'tasks', 'jar.json'), 'w') as fout:
+                json.dump(tasks, fout)
+            config_init = Config.__init__
+
+            def init(config):
+                config_init(config)
+                config.result_root_path = join(root, 'results')
+                config.task_path = join(root, 'tasks')
+                config.dump_path = join(root, 'dump')
+                config.jar_worker_command = stub
+            pid_log = join(root, 'pids')
+            module = sys.modules[Controller.__module__]
+            with mock.patch.object(Config, '__init__', init), \
+                    mock.patch.object(module, 'cpu_count', lambda: 2), \
+                    mock.patch.dict('os.environ',
+                                    {'JAR_WORKER_STUB_LOG': pid_log}):
+                failed = Controller.run('jar.json', workers=2)
+            assert not failed
+            # two workers for the batch, shared by three tasks
+            with open(pid_log) as fin:
+                assert len(fin.read().split()) == 2
+            # results replied in-band are dumped by Controller
+            project_folder = join(root, 'results', 'jar',
+                                  'ReleasePlanner-binary')
+            assert len(listdir(project_folder)) == 3
+            # problems are dumped for each task, and removed after it
+            assert not listdir(join(root, 'dump'))
+            for method_name in listdir(project_folder):
+                method_folder = join(project_folder, method_name)
+                assert isfile(join(method_folder, 'i_0.json'))
+                assert any([name.startswith('s_0.')
+                            for name in listdir(method_folder)])
+
+    def test_workers_budget(self):
+        config_init = Config.__init__
+
+        def init(config):
+            config_init(config)
+            config.threads = 2
+        module = sys.modules[Controller.__module__]
+        with mock.patch.object(Config, '__init__', init), \
+                mock.patch.object(module, 'cpu_count', lambda: 16):
+            assert Controller.workers_budget(32) == 8
+            # iteration workers of 4 running tasks share the cores
+            assert Controller.workers_budget(32, 4) == 2
+            assert Controller.workers_budget(32, 16) == 1
+
+    def test_iteration_workers(self):
+        with tempfile.TemporaryDirectory() as root:
+            makedirs(join(root, 'tasks'))
+            tasks = {'name': 'iterations', 'dataset': 'ReleasePlanner',
+                     'modelling': {'name': 'binary'},
+                     'method': {'name': 'epsilon', 'iteration': 3,
+                                'seed': 7}}
+            with open(join(root, 'tasks', 'iterations.json'), 'w') as fout:
+                json.dump(tasks, fout)
+            config_init = Config.__init__
+            folders = []
+            for workers in [1, 2]:
+                results = join(root, 'results' + str(workers))
+
+                def init(config):
+                    config_init(config)
+                    config.result_root_path = results
+                    config.task_path = join(root, 'tasks')
+                    config.iteration_workers = workers
+                    config.result_format = 'npy'
+                module = sys.modules[Controller.__module__]
+                with mock.patch.object(Config, '__init__', init), \
+                        mock.patch.object(module, 'cpu_count', lambda: 2):
+                    Controller.run('iterations.json')
+                project_folder = join(results, 'iterations',
+                                      'ReleasePlanner-binary')
+                method_folder = join(project_folder,
+                                     listdir(project_folder)[0])
+                folders.append(method_folder)
+            # the same seed and solutions in each iteration
+            for itr in range(3):
+                infos = []
+                for method_folder in folders:
+                    with open(join(method_folder,
+                                   'i_{}.json'.format(itr))) as fin:
+                        infos.append(json.load(fin))
+                assert infos[0]['seed'] == infos[1]['seed'] == 7 + itr
+                assert infos[0]['solutions found'] == \
+                    infos[1]['solutions found']
+                files = [join(method_folder, 's_{}.npy'.format(itr))
+                         for method_folder in folders]
+                with open(files[0], 'rb') as f0, open(files[1], 'rb') as f1:
+                    assert f0.read() == f1.read()
+
+    def test_wall_clock(self):
+        with tempfile.TemporaryDirectory() as root:
+            makedirs(join(root, 'tasks'))
+            tasks = {'name': 'clock', 'dataset': 'ReleasePlanner',
+                     'modelling': {'name': 'binary'},
+                     'method': {'name': 'pepsilon', 'workers': 2}}
+            with open(join(root, 'tasks', 'clock.json'), 'w') as fout:
+                json.dump(tasks, fout)
+            config_init = Config.__init__
+
+            def init(config):
+                config_init(config)
+                config.result_root_path = join(root, 'results')
+                config.task_path = join(root, 'tasks')
+            module = sys.modules[Controller.__module__]
+            # process time of parent only misses the pool workers
+            with mock.patch.object(Config, '__init__', init), \
+                    mock.patch.object(module, 'clock',
+                                      side_effect=AssertionError):
+                Controller.run('clock.json')
+            project_folder = join(root, 'results', 'clock',
+                                  'ReleasePlanner-binary')
+            method_folder = join(project_folder, listdir(project_folder)[0])
+            with open(join(method_folder, 'i_0.json')) as fin:
+                assert json.load(fin)['elapsed time'] >= 0
+
 
 if __name__ == "__main__":
     unittest.main()
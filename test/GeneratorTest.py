@@ -0,0 +1,112 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# GeneratorTest.py, created: 2021.03.17
+# last modified: 2021.03.22
+#
+
+import unittest
+import tempfile
+from unittest import mock
+from os.path import join, isfile
+from src.Config import Config
+from src.Loader import Loader
+from src.Generator import Generator
+
+
+class GeneratorTest(unittest.TestCase):
+    def test_xuan(self):
+        with tempfile.TemporaryDirectory() as path:
+            generator = Generator(1, path, path)
+            file_name = generator.xuan('classic_syn', 500, 300, 3, 1.5)
+            problem = Loader.load_xuan(file_name)
+            assert sum([len(level) for level in problem.cost]) == 500
+            assert len(problem.cost) == 3
+            assert len(problem.customers) == 300
+            assert problem.dependencies
+            # dependencies go from lower levels to higher levels
+            level = {}
+            for index, line in enumerate(problem.cost):
+                for req, _ in line:
+                    level[req] = index
+            for pre, post in problem.dependencies:
+                assert level[pre] < level[post]
+            # same seed, same instance
+            with open(file_name, 'r') as fin:
+                content = fin.read()
+            Generator(1, path, path).xuan('classic_syn', 500, 300, 3, 1.5)
+            with open(file_name, 'r') as fin:
+                assert fin.read() == content
+            # realistic ones have no dependencies
+            file_name = generator.xuan('realistic_syn', 200, 100, 1)
+            assert not Loader.load_xuan(file_name).dependencies
+
+    def test_realistic(self):
+        with tempfile.TemporaryDirectory() as path:
+            generator = Generator(5, path)
+            # no dependencies by default
+            file_name = generator.xuan('realistic_syn', 50, 20)
+            assert not Loader.load_xuan(file_name).dependencies
+            # urgency is kept with synthetic instances
+            assert isfile(join(path, 'urgency', 'realistic_syn.json'))
+            with self.assertRaises(ValueError):
+                generator.xuan('realistic_dep', 50, 20, 3, 0.5)
+
+    def test_check_name(self):
+        with tempfile.TemporaryDirectory() as path:
+            generator = Generator(6, path)
+            with self.assertRaises(ValueError):
+                generator.xuan('unknown_syn', 50, 20)
+            with self.assertRaises(ValueError):
+                generator.baan('classic_syn', 50, 4)
+            # indexed instances could not be overwritten
+            with self.assertRaises(ValueError):
+                generator.xuan('classic_1', 50, 20)
+            # synthetic ones could be regenerated
+            config = Config()
+            config.synthetic_path = path
+            config.make_synthetic_index()
+            with mock.patch('src.Generator.Config', return_value=config):
+                generator.xuan('classic_syn', 50, 20)
+                config.make_synthetic_index()
+                assert config.is_synthetic('classic_syn')
+                generator.xuan('classic_syn', 60, 20)
+            urgency_file = config.urgency_file('classic_syn')
+            assert urgency_file.startswith(join(path, 'urgency'))
+            assert isfile(urgency_file)
+
+    def test_rp(self):
+        with tempfile.TemporaryDirectory() as path:
+            generator = Generator(2, path)
+            folder = generator.rp('MSWord_syn', 300, 5, 4, 1.0, 20)
+            problem = Loader.load_rp(folder)
+            assert len(problem.cost) == 300
+            assert len(problem.weight) == 5
+            assert len(problem.couplings) == 20
+            assert len(problem.profit) == 300 * 5
+            assert len(problem.urgency) == 300 * 5
+            assert problem.precedes
+
+    def test_baan(self):
+        with tempfile.TemporaryDirectory() as path:
+            generator = Generator(3, path)
+            file_name = generator.baan('Baan_syn', 400, 9)
+            problem = Loader.load_Baan(file_name)
+            assert len(problem.cost) == 400
+            assert len(problem.team) == 9
+
+    def test_index(self):
+        with tempfile.TemporaryDirectory() as path:
+            generator = Generator(4, path, path)
+            generator.xuan('classic_syn', 50, 30)
+            generator.rp('ReleasePlanner_syn', 30, 3)
+            generator.baan('Baan_syn', 30, 4)
+            config = Config()
+            config.synthetic_path = path
+            config.make_synthetic_index()
+            for name in ['classic_syn', 'ReleasePlanner_syn', 'Baan_syn']:
+                assert name in config.dataset
+                assert config.dataset[name].startswith(join(path, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
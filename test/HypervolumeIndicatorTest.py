@@ -0,0 +1,45 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# HypervolumeIndicatorTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+import numpy
+from jmetal.core.quality_indicator import HyperVolume
+from src.util.HypervolumeIndicator import HypervolumeIndicator
+
+
+class HypervolumeIndicatorTest(unittest.TestCase):
+    def test_jmetal(self):
+        random = numpy.random.RandomState(0)
+        for dimension in range(1, 5):
+            for _ in range(100):
+                # small integers for ties, some points beyond reference
+                points = random.randint(0, 6, size=(random.randint(1, 30),
+                                                    dimension)).astype(float)
+                reference_point = \
+                    random.randint(2, 7, size=dimension).astype(float).tolist()
+                expected = HyperVolume(reference_point).compute(points.copy())
+                score = HypervolumeIndicator(reference_point).compute(points)
+                assert abs(score - expected) < 1e-9
+
+    def test_empty(self):
+        assert HypervolumeIndicator([1.0, 1.0]).compute(numpy.array([])) == 0
+        points = numpy.array([[2.0, 0.0, 0.0], [0.0, 0.0, 1.5]])
+        assert HypervolumeIndicator([1.0] * 3).compute(points) == 0.0
+
+    def test_front(self):
+        random = numpy.random.RandomState(1)
+        for dimension in [2, 3]:
+            # points on a sphere, all non-dominated
+            points = random.random_sample((300, dimension))
+            points /= numpy.linalg.norm(points, axis=1)[:, None]
+            reference_point = [1.0] * dimension
+            expected = HyperVolume(reference_point).compute(points.copy())
+            score = HypervolumeIndicator(reference_point).compute(points)
+            assert abs(score - expected) < 1e-9
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# IndicatorCacheTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+import tempfile
+from os.path import join
+from unittest import mock
+import numpy
+from src.Archive import NonDominatedArchive
+from src.Indicator import Indicator
+from src.IndicatorCache import IndicatorCache
+from src.PackedSolution import PackedSolution
+
+
+class IndicatorCacheTest(unittest.TestCase):
+    @staticmethod
+    def archive(points):
+        archive = NonDominatedArchive()
+        archive.extend([PackedSolution.pack([], list(point))
+                        for point in points])
+        return archive
+
+    def test_key(self):
+        front = numpy.array([[0.0, 3.0], [1.0, 2.0], [3.0, 0.0]])
+        true_front = numpy.array([[0.0, 2.0], [2.0, 0.0]])
+        key = IndicatorCache.key(front, true_front, None)
+        # order of points does not matter
+        assert IndicatorCache.key(front[::-1], true_front, None) == key
+        assert IndicatorCache.key(front, true_front, [4, 4]) != key
+        assert IndicatorCache.key(front[:2], true_front, None) != key
+        assert IndicatorCache.key(front, front, None) != key
+
+    def test_compute(self):
+        indicators = ['igd', 'hv', 'evenness']
+        front = self.archive([[0.0, 3.0], [1.0, 2.0], [3.0, 0.0]])
+        true_front = self.archive([[0.0, 2.0], [1.0, 1.0], [2.0, 0.0]])
+        expected = Indicator.compute(indicators, front, true_front)
+        with tempfile.TemporaryDirectory() as root:
+            file_name = join(root, '.front.scores.json')
+            scores = Indicator.compute(indicators, front, true_front,
+                                       cache=IndicatorCache(file_name))
+            assert scores == expected
+            # cached ones are not computed again
+            with mock.patch.object(Indicator, 'compute_hv',
+                                   side_effect=AssertionError):
+                scores = Indicator.compute(indicators, front, true_front,
+                                           cache=IndicatorCache(file_name))
+            assert scores == expected
+            # a changed front is scored again
+            changed = self.archive([[0.0, 2.0], [3.0, 0.0]])
+            with mock.patch.object(Indicator, 'compute_hv',
+                                   return_value=1.0) as compute_hv:
+                scores = Indicator.compute(indicators, changed, true_front,
+                                           cache=IndicatorCache(file_name))
+                assert compute_hv.call_count == 1
+            assert scores['hv'] == 1.0
+
+    def test_no_true_front(self):
+        indicators = ['hv', 'evenness']
+        front = self.archive([[0.0, 3.0], [1.0, 2.0], [3.0, 0.0]])
+        expected = Indicator.compute(indicators, front, None, [4, 4])
+        with tempfile.TemporaryDirectory() as root:
+            file_name = join(root, '.front.scores.json')
+            scores = Indicator.compute(indicators, front, None, [4, 4],
+                                       cache=IndicatorCache(file_name))
+            assert scores == expected
+            with mock.patch.object(Indicator, 'compute_hv',
+                                   side_effect=AssertionError):
+                scores = Indicator.compute(indicators, front, None, [4, 4],
+                                           cache=IndicatorCache(file_name))
+            assert scores == expected
+
+
+if __name__ == '__main__':
+    unittest.main()
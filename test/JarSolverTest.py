@@ -0,0 +1,62 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# JarSolverTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+import sys
+import tempfile
+from os.path import join, dirname, abspath, isfile
+from unittest import mock
+from src.Config import Config
+from src.Solvers.JarSolver import JarSolver, JarWorker
+
+STUB = [sys.executable, join(dirname(abspath(__file__)), 'JarWorkerStub.py')]
+
+
+class JarSolverTest(unittest.TestCase):
+    def run_jar(self, method, result_path):
+        option = {'iteration': 2, 'result_path': result_path,
+                  'dump_path': result_path, 'problem_name': 'stub'}
+        solver = JarSolver(method, option)
+        solver.prepare()
+        solver.execute()
+        return solver
+
+    def test_worker(self):
+        config_init = Config.__init__
+
+        def init(config):
+            config_init(config)
+            config.jar_worker_command = STUB
+        with tempfile.TemporaryDirectory() as root, \
+                mock.patch.object(Config, '__init__', init):
+            try:
+                self.run_jar('NSGAII', root)
+                worker = JarWorker.of(STUB)
+                solver = self.run_jar('IBEA', root)
+                # the same worker for both, and no config file dumped
+                assert JarWorker.of(STUB) is worker
+                assert worker.alive()
+                assert not isfile(join(root, 'config-stub.json'))
+                # results are replied in-band, not dumped
+                assert len(solver.results) == 2
+                assert solver.results[0]['solutions'] == [[0.0, 1.0],
+                                                          [1.0, 0.0]]
+                assert not isfile(join(root, 's_0.txt'))
+                # a failed job does not stop the worker
+                with self.assertRaises(RuntimeError):
+                    worker.request({'solver': 'NoSolver', 'config': {}})
+                reply = worker.request(
+                    {'solver': 'IBEASolver',
+                     'config': {'iteration': 1, 'result_path': root}})
+                assert reply['pid'] == worker.process.pid
+            finally:
+                JarWorker.shutdown()
+            assert not worker.alive()
+            assert not JarWorker.workers
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# JarWorkerStub.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+# a stub of Worker.java for tests, same protocol without java, it replies
+# (or dumps as Dumper does) a fixed front for each iteration, and logs its
+# pid into JAR_WORKER_STUB_LOG if set
+
+import os
+import sys
+import json
+from os.path import join
+
+SOLVERS = ['NSGAIISolver', 'IBEASolver', 'NSGAIIXuanSolver', 'IBEAXuanSolver']
+
+
+def run(solver, config):
+    assert solver in SOLVERS, 'unknown solver ' + solver
+    if config.get('in_band'):
+        return [{'elapsed time': 0.0, 'solutions found': 2,
+                 'solutions': [[0.0, 1.0], [1.0, 0.0]],
+                 'variables': [[True, False], [False, True]]}
+                for _ in range(config['iteration'])]
+    for itr in range(config['iteration']):
+        path = config['result_path']
+        with open(join(path, 'i_{}.json'.format(itr)), 'w') as fout:
+            json.dump({'elapsed time': 0.0, 'solutions found': 2}, fout)
+        with open(join(path, 's_{}.txt'.format(itr)), 'w') as fout:
+            fout.write('(0.0, 1.0)\n(1.0, 0.0)\n')
+        with open(join(path, 'v_{}.txt'.format(itr)), 'w') as fout:
+            fout.write('(1, 0)\n(0, 1)\n')
+    return []
+
+
+def main():
+    if os.environ.get('JAR_WORKER_STUB_LOG'):
+        with open(os.environ['JAR_WORKER_STUB_LOG'], 'a') as fout:
+            fout.write('{}\n'.format(os.getpid()))
+    for line in sys.stdin:
+        if not line.strip():
+            break
+        reply = {'pid': os.getpid()}
+        try:
+            job = json.loads(line)
+            results = run(job['solver'], job['config'])
+            reply.update({'status': 'ok', 'elapsed': 0, 'results': results})
+        except Exception as e:
+            reply.update({'status': 'error', 'message': str(e)})
+        sys.stdout.write(json.dumps(reply) + '\n')
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# MOOUtilityTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+from copy import deepcopy
+from random import randint, seed
+from src.util.mooUtility import MOOUtility
+
+
+class MOOUtilityTest(unittest.TestCase):
+    def test_simple_cull(self):
+        seed(6)
+        for _ in range(300):
+            objectives_num = randint(1, 4)
+            points = [[randint(0, 5) for _ in range(objectives_num)]
+                      for _ in range(randint(1, 50))]
+            copied = deepcopy(points)
+            pareto, dominated = \
+                MOOUtility.simple_cull(points, MOOUtility.dominates)
+            # input is kept
+            assert points == copied
+            # the same as the original loop
+            expected = MOOUtility.loop_cull(copied, MOOUtility.dominates)
+            assert (pareto, dominated) == expected
+
+    def test_chunk(self):
+        seed(7)
+        points = [[randint(0, 9) for _ in range(3)] for _ in range(200)]
+        expected = MOOUtility.simple_cull(points)
+        chunk_size = MOOUtility.CullChunkSize
+        MOOUtility.CullChunkSize = 3 * 200 * 7
+        try:
+            assert MOOUtility.simple_cull(points) == expected
+        finally:
+            MOOUtility.CullChunkSize = chunk_size
+        assert MOOUtility.simple_cull([]) == (set(), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ModelCacheTest.py, created: 2021.03.15
+# last modified: 2021.03.22
+#
+
+import unittest
+import tempfile
+from os import listdir
+from src.Config import Config
+from src.NRP import NextReleaseProblem
+from src.ModelCache import ModelCache
+
+
+class ModelCacheTest(unittest.TestCase):
+    def test_fetch(self):
+        tasks = [('classic_1', 'binary', {}),
+                 ('MSWord', 'binary', {}),
+                 ('ReleasePlanner', 'bincst', {'bound': 0.3}),
+                 ('MSWord', 'triurgency', {})]
+        config = Config()
+        with tempfile.TemporaryDirectory() as cache_path:
+            cache = ModelCache(cache_path)
+            for problem, form, option in tasks:
+                if problem not in config.dataset:
+                    continue
+                nrp_problem = NextReleaseProblem(problem)
+                nrp_problem.premodel(option)
+                nrp = nrp_problem.model(form, option)
+                # first fetch models and stores, second one loads
+                for _ in range(2):
+                    cached = cache.fetch(problem, form, option)
+                    assert cached.variables == nrp.variables
+                    assert cached.objectives == nrp.objectives
+                    assert [type(v) for obj in cached.objectives
+                            for v in obj.values()] == \
+                        [type(v) for obj in nrp.objectives
+                         for v in obj.values()]
+                    assert cached.inequations == nrp.inequations
+                    assert cached.is_compact() == nrp.is_compact()
+                    if nrp.is_compact():
+                        assert cached.attributes() == nrp.attributes()
+                        assert (cached.rhs == nrp.rhs).all()
+            assert len(listdir(cache_path)) == len(tasks)
+
+    def test_flatten(self):
+        maps = [{0: 3, 1: -2.5, 4: 0}, {}, {2: 1.0, 3: 7}]
+        cached = ModelCache.unflatten(*ModelCache.flatten(maps))
+        assert cached == maps
+        # ints stay ints, as a fresh modelling gives
+        for cached_map, one_map in zip(cached, maps):
+            assert [type(v) for v in cached_map.values()] == \
+                [type(v) for v in one_map.values()]
+
+    def test_key(self):
+        key = ModelCache.key('MSWord', 'bincst', {'cost': 0.3, 'x': 1})
+        assert key == ModelCache.key('MSWord', 'bincst', {'x': 1, 'cost': 0.3})
+        assert key != ModelCache.key('MSWord', 'bincst', {'cost': 0.5, 'x': 1})
+        assert key != ModelCache.key('MSWord', 'binary', {'cost': 0.3, 'x': 1})
+        assert key != ModelCache.key('ReleasePlanner', 'bincst',
+                                     {'cost': 0.3, 'x': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
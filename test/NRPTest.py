@@ -125,6 +125,23 @@ class NRPTest(unittest.TestCase):
                 assert key == 'realistic'
                 assert not nrp.nrp.dependencies
 
+    def test_precursors_closure(self):
+        for _ in range(20):
+            # random DAG, edges from smaller to larger requirement
+            dependencies = set()
+            for _ in range(randint(1, 300)):
+                pre = randint(0, 98)
+                dependencies.add((pre, randint(pre + 1, 99)))
+            dependencies = list(dependencies)
+            precursors = NextReleaseProblem.precursors_closure(dependencies)
+            for req, pres in precursors.items():
+                assert len(pres) == len(set(pres))
+                assert set(pres) == self.requester(dependencies, req)
+        # a deep chain
+        chain = [(i, i + 1) for i in range(2000)]
+        precursors = NextReleaseProblem.precursors_closure(chain)
+        assert set(precursors[2000]) == set(range(2000))
+
     @staticmethod
     def random_objectives(num, dim):
         objectives_list = []
@@ -155,6 +172,31 @@ class NRPTest(unittest.TestCase):
                     else:
                         assert attrs[i][key] == objs[i][key]
 
+    def test_compact(self):
+        for _ in range(20):
+            nrp_problem = NRPProblem()
+            nrp_problem.variables = list(range(500))
+            nrp_problem.objectives = \
+                NRPTest.random_objectives(randint(1, 4), 500)
+            nrp_problem.inequations = NRPTest.random_objectives(50, 10)
+            for inequation in nrp_problem.inequations:
+                if randint(0, 1):
+                    inequation[500] = randint(0, 1000)
+            nrp_problem.compact()
+            assert nrp_problem.is_compact()
+            # objectives
+            attrs = nrp_problem.attributes()
+            for i, objective in enumerate(nrp_problem.objectives):
+                for key in range(500):
+                    assert attrs[i][key] == objective.get(key, 0)
+            # inequations and rhs
+            rows = nrp_problem.constraint_rows()
+            assert len(rows) == len(nrp_problem.inequations)
+            for i, inequation in enumerate(nrp_problem.inequations):
+                assert nrp_problem.rhs[i] == inequation.get(500, 0)
+                lhs = {k: v for k, v in inequation.items() if k != 500}
+                assert dict(zip(*rows[i])) == lhs
+
     @staticmethod
     def equal_float(f1, f2):
         return abs(f2 - f1) <= 1e-6
@@ -0,0 +1,39 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# NeighbourIndicatorTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+import numpy
+from jmetal.core.quality_indicator import InvertedGenerationalDistance
+from src.util.evenness_indicator import EvennessIndicator
+from src.util.NeighbourIndicator import NeighbourEvenness, NeighbourIGD
+
+
+class NeighbourIndicatorTest(unittest.TestCase):
+    def test_evenness(self):
+        random = numpy.random.RandomState(0)
+        for dimension in range(1, 4):
+            for size in [1, 2, 3, 10, 50]:
+                # small integers for duplicates and ties
+                points = random.randint(0, 8, size=(size, dimension)) \
+                    .astype(float)
+                expected = EvennessIndicator().compute(points)
+                score = NeighbourEvenness().compute(points)
+                assert abs(score - expected) < 1e-9
+
+    def test_igd(self):
+        random = numpy.random.RandomState(1)
+        for dimension in range(1, 4):
+            for size in [1, 2, 10, 50]:
+                points = random.random_sample((size, dimension))
+                front = random.random_sample((random.randint(1, 60),
+                                              dimension))
+                expected = InvertedGenerationalDistance(front).compute(points)
+                score = NeighbourIGD(front).compute(points)
+                assert abs(score - expected) < 1e-9
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# NumpyMOEATest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+import numpy
+from random import randint, seed
+from itertools import product
+from src.NRP import NRPProblem
+from src.Solvers.NumpyMOEA import BinaryMOEA, NSGAII, IBEA
+
+
+class NumpyMOEATest(unittest.TestCase):
+    @staticmethod
+    def pareto(points):
+        def dominates(a, b):
+            return all([x <= y for x, y in zip(a, b)]) and a != b
+        return set([p for p in points
+                    if not any([dominates(q, p) for q in points])])
+
+    @staticmethod
+    def objectives(nrp: NRPProblem, values):
+        return tuple([sum([v * values[k] for k, v in obj.items()])
+                      for obj in nrp.objectives])
+
+    @staticmethod
+    def feasible(nrp: NRPProblem, values):
+        constant_id = len(nrp.variables)
+        for inequation in nrp.inequations:
+            lhs = sum([v * values[k] for k, v in inequation.items()
+                       if k != constant_id])
+            if lhs > inequation.get(constant_id, 0) + 1e-6:
+                return False
+        return True
+
+    @staticmethod
+    def random_problem(vars_num):
+        nrp = NRPProblem()
+        nrp.variables = list(range(vars_num))
+        nrp.objectives = [{x: randint(-4, 4) for x in nrp.variables
+                           if randint(0, 3)} for _ in range(2)]
+        # dependencies, x_suf <= x_pre
+        for suf in range(1, vars_num):
+            if randint(0, 2) == 0:
+                nrp.inequations.append({suf: 1, randint(0, suf - 1): -1,
+                                        vars_num: 0})
+        # cost bound
+        nrp.inequations.append({x: randint(0, 3) for x in nrp.variables})
+        nrp.inequations[-1][vars_num] = vars_num
+        return nrp
+
+    def test_repair(self):
+        seed(1)
+        numpy.random.seed(1)
+        for _ in range(20):
+            nrp = self.random_problem(randint(2, 30))
+            solver = NSGAII(nrp)
+            solver.prepare()
+            dependencies = len(nrp.inequations) - 1
+            assert len(solver.suf) == len(solver.pre) == dependencies
+            values = solver.random_population(50)
+            for row in values:
+                for inequation in nrp.inequations[:-1]:
+                    suf, pre = [k for k, v in inequation.items() if v]
+                    if inequation[suf] < 0:
+                        suf, pre = pre, suf
+                    assert row[pre] or not row[suf]
+
+    def test_front(self):
+        seed(2)
+        for index in range(20):
+            vars_num = randint(1, 8)
+            nrp = self.random_problem(vars_num)
+            if index % 2:
+                nrp.compact()
+            front = self.pareto([self.objectives(nrp, values) for values
+                                 in product([0, 1], repeat=vars_num)
+                                 if self.feasible(nrp, values)])
+            for method in [NSGAII, IBEA]:
+                numpy.random.seed(index)
+                solver = method(nrp, {'population': 20,
+                                      'max_evaluations': 2000})
+                solver.prepare()
+                solver.execute()
+                solutions = solver.solutions()
+                assert set(solutions) == front
+                for objectives, values in zip(solutions, solver.variables()):
+                    assert self.objectives(nrp, values) == objectives
+                    assert self.feasible(nrp, values)
+
+    def test_option(self):
+        seed(4)
+        nrp = self.random_problem(30)
+        # unsupported options of jar algorithms are rejected
+        with self.assertRaises(ValueError):
+            NSGAII(nrp, {'repair': 0.5})
+        for method in [NSGAII, IBEA]:
+            numpy.random.seed(4)
+            solver = method(nrp, {'population': 20, 'time_limit': 0.0,
+                                  'max_evaluations': 10 ** 9})
+            solver.prepare()
+            solver.execute()
+            # stopped at once, only the first population evaluated
+            assert solver.evaluations == 20
+            assert solver.solutions()
+
+    def test_non_dominated_sort(self):
+        numpy.random.seed(3)
+        objectives = numpy.random.randint(0, 5, size=(60, 3))
+        violations = numpy.zeros(60)
+        violations[:10] = numpy.random.randint(1, 3, size=10)
+        dominance = BinaryMOEA.dominance(objectives, violations)
+        ranks = BinaryMOEA.non_dominated_sort(dominance)
+        for i in range(60):
+            for j in range(60):
+                if dominance[i, j]:
+                    assert ranks[i] < ranks[j]
+            # each one but the first front is dominated by the front before
+            if ranks[i]:
+                assert dominance[ranks == ranks[i] - 1, i].any()
+        # feasible ones come first
+        assert ranks[10:].max() < ranks[:10].min()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# PackedSolutionTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+import pickle
+from random import randint, seed
+from jmetal.util.archive import NonDominatedSolutionsArchive
+from src.PackedSolution import PackedSolution
+
+
+class PackedSolutionTest(unittest.TestCase):
+    def test_pack(self):
+        seed(8)
+        for size in [0, 1, 7, 8, 9, 100]:
+            values = [bool(randint(0, 1)) for _ in range(size)]
+            solution = PackedSolution.pack(values, [1.0, 2.0])
+            assert solution.values().tolist() == values
+            assert len(solution.key) == (size + 7) // 8
+            # the same variables have the same key
+            ints = [int(x) for x in values]
+            assert PackedSolution.pack(ints, [0.0, 0.0]).key == solution.key
+            # jmetal boundary
+            jmetal_solution = solution.to_jmetal()
+            assert jmetal_solution.variables == [values]
+            back = PackedSolution.from_jmetal(jmetal_solution)
+            assert back.key == solution.key
+            assert back.objectives == solution.objectives
+            # pickle, as between processes
+            copied = pickle.loads(pickle.dumps(solution))
+            assert copied.key == solution.key
+            assert copied.objectives == solution.objectives
+
+    def test_unpack(self):
+        seed(9)
+        rows = [[bool(randint(0, 1)) for _ in range(21)] for _ in range(30)]
+        solutions = [PackedSolution.pack(row, [0.0]) for row in rows]
+        assert PackedSolution.unpack(solutions).tolist() == rows
+        assert PackedSolution.unpack([]).shape == (0, 0)
+
+    def test_jmetal_archive(self):
+        archive = NonDominatedSolutionsArchive()
+        for objectives in [[1.0, 3.0], [2.0, 2.0], [2.0, 4.0], [1.0, 3.0]]:
+            archive.add(PackedSolution.pack([True], objectives))
+        assert [solution.objectives for solution in archive.solution_list] \
+            == [[1.0, 3.0], [2.0, 2.0]]
+
+
+if __name__ == '__main__':
+    unittest.main()
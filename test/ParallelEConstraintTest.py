@@ -0,0 +1,72 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ParallelEConstraintTest.py, created: 2021.03.19
+# last modified: 2021.03.22
+#
+
+import unittest
+from random import randint, seed
+from src.NRP import NRPProblem
+from src.PackedSolution import PackedSolution
+from src.Solvers.EConstraint import EConstraint
+from src.Solvers.ParallelEConstraint import ParallelEConstraint
+
+
+class ParallelEConstraintTest(unittest.TestCase):
+    @staticmethod
+    def random_problem(vars_num: int, objectives_num: int) -> NRPProblem:
+        nrp = NRPProblem()
+        nrp.variables = list(range(vars_num))
+        nrp.objectives = [{x: randint(-5, 5) for x in nrp.variables}
+                          for _ in range(objectives_num)]
+        for _ in range(vars_num // 2):
+            left, right = randint(0, vars_num - 1), randint(0, vars_num - 1)
+            if left != right:
+                nrp.inequations.append({left: 1, right: -1, vars_num: 0})
+        return nrp
+
+    def test_split(self):
+        solver = ParallelEConstraint(self.random_problem(4, 2),
+                                     {'workers': 3, 'chunks': 2})
+        rhs_list = list(range(20, -1, -1))
+        chunks = solver.split(rhs_list)
+        assert len(chunks) <= 6
+        assert sum(chunks, []) == rhs_list
+
+    def test_execute(self):
+        seed(19)
+        for objectives_num in [2, 3]:
+            nrp = self.random_problem(8, objectives_num)
+            results = []
+            for solver in [EConstraint(nrp),
+                           ParallelEConstraint(nrp, {'workers': 2})]:
+                solver.prepare()
+                solver.execute()
+                results.append(sorted(solver.solutions()))
+            assert results[0]
+            assert results[0] == results[1]
+
+    def test_next_rhs(self):
+        solver = EConstraint(self.random_problem(4, 2))
+        for value, rhs in [(3.0, 2), (3.4, 3), (3.0000001, 2), (-2.5, -3)]:
+            solutions = [PackedSolution.pack([], [0.0, value]),
+                         PackedSolution.pack([], [0.0, value - 4])]
+            assert solver.next_rhs(1, solutions) == rhs
+
+    def test_pruning(self):
+        seed(23)
+        for objectives_num in [2, 3]:
+            nrp = self.random_problem(8, objectives_num)
+            results = []
+            for pruning in [False, True]:
+                solver = EConstraint(nrp)
+                solver.pruning = pruning
+                solver.prepare()
+                solver.execute()
+                results.append(sorted(solver.solutions()))
+            assert results[0]
+            assert results[0] == results[1]
+
+
+if __name__ == '__main__':
+    unittest.main()
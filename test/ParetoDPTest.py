@@ -0,0 +1,50 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ParetoDPTest.py, created: 2021.03.20
+# last modified: 2021.03.20
+#
+
+import unittest
+from random import randint, seed
+from itertools import product
+from src.NRP import NRPProblem
+from src.Solvers.ParetoDP import ParetoDP
+
+
+class ParetoDPTest(unittest.TestCase):
+    @staticmethod
+    def pareto(points):
+        def dominates(a, b):
+            return all([x <= y for x, y in zip(a, b)]) and a != b
+        return set([p for p in points
+                    if not any([dominates(q, p) for q in points])])
+
+    @staticmethod
+    def objectives(nrp: NRPProblem, values):
+        return tuple([sum([v * values[k] for k, v in obj.items()])
+                      for obj in nrp.objectives])
+
+    def test_front(self):
+        seed(3)
+        for index in range(100):
+            vars_num = randint(1, 10)
+            nrp = NRPProblem()
+            nrp.variables = list(range(vars_num))
+            nrp.objectives = [{x: randint(-4, 4) for x in nrp.variables
+                               if randint(0, 3)} for _ in range(2)]
+            if index % 2:
+                nrp.compact()
+            solver = ParetoDP(nrp)
+            solver.prepare()
+            solver.execute()
+            solutions = solver.solutions()
+            front = self.pareto([self.objectives(nrp, values) for values
+                                 in product([0, 1], repeat=vars_num)])
+            assert len(solutions) == len(front)
+            assert set(solutions) == front
+            for objectives, values in zip(solutions, solver.variables()):
+                assert self.objectives(nrp, values) == objectives
+
+
+if __name__ == '__main__':
+    unittest.main()
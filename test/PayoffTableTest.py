@@ -0,0 +1,85 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# PayoffTableTest.py, created: 2021.03.20
+# last modified: 2021.03.20
+#
+
+import unittest
+import tempfile
+from os.path import join
+from random import randint, seed
+from itertools import product
+from src.NRP import NRPProblem
+from src.Solvers.PayoffTable import PayoffTable
+
+
+class PayoffTableTest(unittest.TestCase):
+    @staticmethod
+    def random_problem(vars_num: int, objectives_num: int) -> NRPProblem:
+        nrp = NRPProblem()
+        nrp.variables = list(range(vars_num))
+        nrp.objectives = [{x: randint(-5, 5) for x in nrp.variables}
+                          for _ in range(objectives_num)]
+        for _ in range(vars_num // 2):
+            left, right = randint(0, vars_num - 1), randint(0, vars_num - 1)
+            if left != right:
+                nrp.inequations.append({left: 1, right: -1, vars_num: 0})
+        return nrp
+
+    @staticmethod
+    def points(nrp: NRPProblem):
+        constant_id = len(nrp.variables)
+        points = []
+        for values in product([0, 1], repeat=len(nrp.variables)):
+            if all([sum([v * values[k] for k, v in inequation.items()
+                         if k != constant_id]) <= inequation[constant_id]
+                    for inequation in nrp.inequations]):
+                points.append(tuple([sum([v * values[k]
+                                          for k, v in obj.items()])
+                                     for obj in nrp.objectives]))
+        return points
+
+    def test_compute(self):
+        seed(13)
+        for objectives_num in [2, 2, 3, 3]:
+            nrp = self.random_problem(8, objectives_num)
+            table = PayoffTable(nrp)
+            table.compute()
+            points = self.points(nrp)
+            front = [p for p in points
+                     if not any([q != p and all([x <= y for x, y
+                                                 in zip(q, p)])
+                                 for q in points])]
+            for index in range(objectives_num):
+                # anchors are lexicographic optima
+                order = [index] + [i for i in range(objectives_num)
+                                   if i != index]
+                best = min(points, key=lambda p: [p[i] for i in order])
+                assert tuple(table.anchors[index]) == best
+                # bounds cover the front
+                low, up = table.bounds(index)
+                assert low == min([p[index] for p in front])
+                assert up >= max([p[index] for p in front])
+                assert table.worst[index] == max([p[index] for p in points])
+            if objectives_num == 2:
+                assert table.nadir[1] == max([p[1] for p in front])
+
+    def test_save(self):
+        seed(17)
+        nrp = self.random_problem(6, 3)
+        table = PayoffTable(nrp)
+        table.compute()
+        with tempfile.TemporaryDirectory() as cache_path:
+            file_name = join(cache_path, 'payoff.npz')
+            table.save(file_name)
+            loaded = PayoffTable(nrp)
+            loaded.load(file_name)
+        assert (loaded.anchors == table.anchors).all()
+        assert (loaded.ideal == table.ideal).all()
+        assert (loaded.worst == table.worst).all()
+        # computed once in a process
+        assert PayoffTable.of(nrp) is PayoffTable.of(nrp)
+
+
+if __name__ == '__main__':
+    unittest.main()
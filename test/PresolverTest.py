@@ -0,0 +1,97 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# PresolverTest.py, created: 2021.03.16
+# last modified: 2021.03.16
+#
+
+import unittest
+from random import randint, random, seed, sample
+from itertools import product
+from src.Config import Config
+from src.NRP import NRPProblem, NextReleaseProblem
+from src.Presolver import Presolver
+
+
+class PresolverTest(unittest.TestCase):
+    @staticmethod
+    def random_problem(vars_num: int) -> NRPProblem:
+        # customers and requirements, like basic binary form
+        nrp = NRPProblem()
+        nrp.variables = list(range(vars_num))
+        customers = sample(nrp.variables, randint(1, vars_num // 2))
+        requirements = [x for x in nrp.variables if x not in customers]
+        nrp.objectives = [{c: -randint(1, 9) for c in customers},
+                          {r: randint(0, 9) for r in requirements}]
+        # requests, dependencies and a budget, with duplicates
+        for cus in customers:
+            for req in sample(requirements, randint(0, len(requirements))):
+                nrp.inequations.append({cus: 1, req: -1, vars_num: 0})
+        for _ in range(randint(0, vars_num)):
+            left, right = sorted(sample(requirements, 2))
+            nrp.inequations.append({left: 1, right: -1, vars_num: 0})
+        budget = {r: randint(0, 9) for r in requirements}
+        budget[vars_num] = random() * sum(budget.values())
+        nrp.inequations.append(budget)
+        return nrp
+
+    @staticmethod
+    def feasible(nrp: NRPProblem, values) -> bool:
+        constant_id = len(nrp.variables)
+        for inequation in nrp.inequations:
+            lhs = sum([v * values[k] for k, v in inequation.items()
+                       if k != constant_id])
+            if lhs > inequation.get(constant_id, 0) + 1e-9:
+                return False
+        return True
+
+    @staticmethod
+    def pareto(points):
+        def dominates(a, b):
+            return all([x <= y for x, y in zip(a, b)]) and a != b
+        return set([p for p in points
+                    if not any([dominates(q, p) for q in points])])
+
+    @staticmethod
+    def objectives(nrp: NRPProblem, values):
+        return tuple([sum([v * values[k] for k, v in obj.items()])
+                      for obj in nrp.objectives])
+
+    def test_front(self):
+        seed(7)
+        for _ in range(40):
+            nrp = self.random_problem(randint(4, 10))
+            presolver = Presolver(nrp)
+            pnrp = presolver.presolve()
+            assert pnrp.variables == list(range(len(pnrp.variables)))
+            # front of original problem
+            front = self.pareto([self.objectives(nrp, values) for values
+                                 in product([0, 1], repeat=len(nrp.variables))
+                                 if self.feasible(nrp, values)])
+            # front of presolved problem, mapped back
+            points = []
+            for values in product([0, 1], repeat=len(pnrp.variables)):
+                if not self.feasible(pnrp, values):
+                    continue
+                full = presolver.postsolve(values)
+                assert len(full) == len(nrp.variables)
+                assert self.feasible(nrp, full)
+                points.append(self.objectives(nrp, full))
+                assert points[-1] == self.objectives(pnrp, values)
+            assert self.pareto(points) == front
+
+    def test_reduce(self):
+        config = Config()
+        for name, form in [('classic_1', 'binary'), ('MSWord', 'binary')]:
+            if name not in config.dataset:
+                continue
+            nrp_problem = NextReleaseProblem(name)
+            nrp_problem.premodel({})
+            nrp = nrp_problem.model(form, {})
+            pnrp = Presolver(nrp).presolve()
+            assert len(pnrp.variables) <= len(nrp.variables)
+            assert len(pnrp.inequations) <= len(nrp.inequations)
+            assert pnrp.is_compact() == nrp.is_compact()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ResultTest.py, created: 2021.03.22
+# last modified: 2021.03.22
+#
+
+import unittest
+import tempfile
+from os.path import join
+from unittest import mock
+from random import randint, random, seed
+from src.Archive import NonDominatedArchive
+from src.Controller import Controller
+from src.PackedSolution import PackedSolution
+from src.Result import Result
+
+
+class ResultTest(unittest.TestCase):
+    @staticmethod
+    def random_front(solutions_num: int, variables_num: int):
+        objectives = [(random(), float(randint(-9, 9)), random() * 100)
+                      for _ in range(solutions_num)]
+        variables = [tuple([bool(randint(0, 1))
+                            for _ in range(variables_num)])
+                     for _ in range(solutions_num)]
+        return objectives, variables
+
+    def test_load_solutions(self):
+        seed(10)
+        # several chunks of memory mapped rows
+        with tempfile.TemporaryDirectory() as folder, \
+                mock.patch.object(Result, 'chunk', 8):
+            for solutions_num, variables_num in [(0, 5), (1, 1), (37, 21)]:
+                objectives, variables = \
+                    self.random_front(solutions_num, variables_num)
+                loaded = {}
+                for extension in ['txt', 'npy']:
+                    s_file = join(folder, 's.' + extension)
+                    v_file = join(folder, 'v.' + extension)
+                    Controller.dump_moip_solutions(s_file, objectives)
+                    Controller.dump_moip_variables(v_file, variables)
+                    solutions = \
+                        Result.load_solutions(s_file, v_file, variables_num)
+                    loaded[extension] = \
+                        [(tuple(solution.objectives),
+                          tuple(solution.values().tolist()))
+                         for solution in solutions]
+                    if extension == 'txt':
+                        # the same as the legacy parser
+                        assert Result.load_tuples(s_file, float) == \
+                            [Result.tuple_parse(str(line), float)
+                             for line in objectives]
+                expected = list(zip(objectives, variables))
+                # text keeps objectives as printed, which are exact here
+                assert loaded['npy'] == expected
+                assert loaded['txt'] == expected
+
+    def test_archive(self):
+        seed(11)
+        objectives, variables = self.random_front(50, 13)
+        archive = NonDominatedArchive()
+        archive.extend([PackedSolution.pack(values, list(objective))
+                        for objective, values in zip(objectives, variables)])
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = join(folder, '.front')
+            assert not Result.has_archive(file_name)
+            Result.dump_archive(file_name, archive)
+            assert Result.has_archive(file_name)
+            loaded = Result.load_archive(file_name)
+        assert [(solution.objectives, solution.key)
+                for solution in loaded.solution_list] == \
+            [(solution.objectives, solution.key)
+             for solution in archive.solution_list]
+
+
+if __name__ == '__main__':
+    unittest.main()
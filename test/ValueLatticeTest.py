@@ -0,0 +1,42 @@
+#
+# DONG Shi, dongshi@mail.ustc.edu.cn
+# ValueLatticeTest.py, created: 2021.03.21
+# last modified: 2021.03.22
+#
+
+import unittest
+import numpy
+from random import randint, seed
+from itertools import product
+from src.Solvers.ValueLattice import ValueLattice
+
+
+class ValueLatticeTest(unittest.TestCase):
+    def test_floor(self):
+        seed(2)
+        for _ in range(200):
+            vars_num = randint(0, 9)
+            objective = {x: randint(-6, 6) for x in range(vars_num)}
+            lattice = ValueLattice.build(objective)
+            values = set([sum([c * v for c, v in zip(objective.values(), x)])
+                          for x in product([0, 1], repeat=vars_num)])
+            for rhs in range(min(values) - 3, max(values) + 3):
+                below = [v for v in values if v <= rhs]
+                expected = max(below) if below else None
+                assert lattice.floor(rhs) == expected
+                assert lattice.floor(rhs + 0.5) == expected
+
+    def test_build(self):
+        assert ValueLattice.build({0: 1.5, 1: 2}) is None
+        assert ValueLattice.build({0: ValueLattice.max_range}) is None
+        lattice = ValueLattice.build({0: 4.0, 1: -6})
+        assert lattice.floor(100) == 4
+        assert lattice.floor(-3) == -6
+        assert lattice.floor(-7) is None
+        # 4 bytes per value
+        assert lattice.previous.dtype == numpy.int32
+        assert len(lattice.previous) == 11
+
+
+if __name__ == '__main__':
+    unittest.main()